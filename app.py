@@ -1,17 +1,17 @@
-from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, session
+from flask import Flask, render_template, request, jsonify, flash, redirect, url_for, session, g
 from flask_sqlalchemy import SQLAlchemy
-from flask_mail import Mail, Message
+from flask_mail import Mail
+import click
 from datetime import datetime
 from werkzeug.security import generate_password_hash
-from google.oauth2.service_account import Credentials
-import google.auth.transport.requests
-import gspread
-import requests
 import json
 import os
 from dotenv import load_dotenv
-from google_auth_oauthlib.flow import Flow
 from models import AuthorPosition
+from sheets_client import SheetsClient, LocalSheetsClient, service_account_credentials
+from booking_ledger import BookingLedger, Replicator
+from sheet_mirror import SheetMirror, MAX_PER_PAGE
+from mail_outbox import MailOutbox, MailSender
 
 
 # --------------------------------------------------------
@@ -26,13 +26,25 @@ app.config['JSON_SORT_KEYS'] = False
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'fallback_secret')
 
 # Database
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
+app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'sqlite:///users.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
 from extensions import db
 db.init_app(app)
 
 
+@app.cli.command("db-upgrade")
+def db_upgrade():
+    """Apply pending schema migrations (schema_migrations.py); run at deploy time."""
+    from schema_migrations import migrate_schema
+    applied = migrate_schema()
+    print("Schema up to date" if not applied else f"Applied schema migrations: {applied}")
+
+# Excel reader: "pandas" (whole workbook as DataFrames) or
+# "streaming" (openpyxl read-only, one row / one sheet at a time)
+app.config['EXCEL_READER'] = os.getenv('EXCEL_READER', 'pandas')
+
+
 # Mail Config
 app.config['MAIL_SERVER'] = os.getenv('MAIL_SERVER', 'smtp.gmail.com')
 app.config['MAIL_PORT'] = int(os.getenv('MAIL_PORT', 587))
@@ -48,16 +60,20 @@ mail = Mail(app)
 SERVICE_ACCOUNT_FILE = os.getenv('SERVICE_ACCOUNT_FILE', 'service_account.json')
 SHEET_ID = os.getenv('SHEET_ID')
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+# "google" (default) or "local" (in-memory worksheet, for offline dev / benchmarks)
+app.config['SHEETS_BACKEND'] = os.getenv('SHEETS_BACKEND', 'google')
+
+if app.config['SHEETS_BACKEND'] == 'local':
+    SHEETS = LocalSheetsClient()
+else:
+    SHEETS = SheetsClient(
+        lambda: service_account_credentials(os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON"), SERVICE_ACCOUNT_FILE),
+        SHEET_ID,
+    )
 
 def get_gsheet():
-    """Connect to Google Sheet securely."""
-    creds_json = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON")
-    if creds_json:
-        creds = Credentials.from_service_account_info(json.loads(creds_json), scopes=SCOPES)
-    else:
-        creds = Credentials.from_service_account_file(SERVICE_ACCOUNT_FILE, scopes=SCOPES)
-    client = gspread.authorize(creds)
-    return client.open_by_key(SHEET_ID).sheet1
+    """Shared worksheet handle; authorized once per process, not per request."""
+    return SHEETS.worksheet()
 
 # --------------------------------------------------------
 # MODELS
@@ -103,12 +119,6 @@ FULL_SERVICES = [
 
 
 
-BLOG_POSTS = [
-    {'id': 1, 'title': 'Common Pitfalls in Academic Publishing and How to Avoid Them', 'excerpt': 'Learn about the most common mistakes researchers make when publishing their work and how to avoid them.', 'image': 'blog1.jpg', 'date': '2024-10-15', 'author': 'Array Research Team'},
-    {'id': 2, 'title': 'Why Choosing the Right Academic Support Can Transform Your Career?', 'excerpt': 'Discover how professional academic support can accelerate your research career and open new opportunities.', 'image': 'blog2.jpg', 'date': '2024-10-10', 'author': 'Dr. Sharma'},
-    {'id': 3, 'title': 'From Manuscript to Publication: Navigating the Journey', 'excerpt': 'A comprehensive guide to taking your research from manuscript stage to successful publication.', 'image': 'blog3.jpg', 'date': '2024-10-05', 'author': 'Array Research Team'}
-]
-
 TESTIMONIALS = [
     {'name': 'Sophia Johnson', 'text': 'Array Research Academy provided exceptional guidance, and their editing services significantly improved my research paper.', 'rating': 5},
     {'name': 'Raj Patel', 'text': 'I highly recommend Array Research Academy for their professional writing services. They exceeded my expectations.', 'rating': 5},
@@ -119,31 +129,226 @@ TESTIMONIALS = [
 # CONTEXT PROCESSOR
 # --------------------------------------------------------
 #from datetime import datetime
+from catalog import CatalogManager
+from image_derivatives import MANIFEST_PATH as IMAGE_MANIFEST_PATH, load_manifest as load_image_manifest
+from image_derivatives import build_derivatives, responsive_img, stats_text
 
 @app.context_processor
 def inject_now():
+    # pages rendered into PAGE_CACHE are served to many requests
+    if g.get('page_cache_render'):
+        return {}
     return {'now': datetime.utcnow()}
 
 
+# resized AVIF/WebP/JPEG copies of static/images, see image_derivatives.py;
+# the manifest is re-read when `flask build-images` rewrites it
+IMAGE_MANIFEST = CatalogManager("images", IMAGE_MANIFEST_PATH, load_image_manifest)
+
+@app.template_global('responsive_img')
+def responsive_img_tag(path, alt="", **kwargs):
+    """{{ responsive_img('images/blog1.jpg', 'Alt text', sizes='(max-width: 600px) 100vw, 33vw') }}"""
+    return responsive_img(IMAGE_MANIFEST.current(), url_for, path, alt, **kwargs)
+
+
+@app.cli.command("build-images")
+def build_images():
+    """Generate the responsive image derivatives (only for changed images)."""
+    print(stats_text(build_derivatives()[1]))
+
+
+# --------------------------------------------------------
+# STATIC ASSETS
+# --------------------------------------------------------
+import mimetypes
+from flask import send_from_directory
+import static_assets
+
+# content-hashed copies of static/ with .br/.gz variants, see static_assets.py;
+# without a build the plain files are served as before
+STATIC_ASSETS = CatalogManager(
+    "assets", static_assets.MANIFEST_PATH,
+    lambda path: static_assets.index_manifest(static_assets.load_manifest(path)),
+)
+
+@app.url_defaults
+def hashed_static_url(endpoint, values):
+    """url_for('static', filename='css/style.css') -> dist/css/style.<hash>.css"""
+    if endpoint == 'static' and 'filename' in values:
+        values['filename'] = STATIC_ASSETS.current()['urls'].get(values['filename'], values['filename'])
+
+
+def serve_static(filename):
+    entry = STATIC_ASSETS.current()['files'].get(filename)
+    if entry is None:
+        if not filename.startswith('derived/'):
+            return app.send_static_file(filename)
+        # derivative names carry the source hash too
+        response = send_from_directory(app.static_folder, filename, max_age=31536000)
+        response.cache_control.public = True
+        response.cache_control.immutable = True
+        return response
+
+    encoding, suffix = static_assets.choose_encoding(entry, request.headers.get('Accept-Encoding'))
+    response = send_from_directory(
+        app.static_folder, filename + suffix,
+        mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        max_age=31536000,
+    )
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    if entry['encodings']:
+        response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+app.view_functions['static'] = serve_static
+
+
+@app.cli.command("build-assets")
+def build_assets():
+    """Build image derivatives, then hash and precompress everything under static/."""
+    print(stats_text(build_derivatives()[1]))
+    print(static_assets.stats_text(static_assets.build_assets()[1]))
+
+
+# --------------------------------------------------------
+# PAGE CACHE
+# --------------------------------------------------------
+from page_cache import PageCache
+
+app.config['PAGE_CACHE'] = os.getenv('PAGE_CACHE', 'True') == 'True'
+
+def asset_versions():
+    # rendered pages embed image/asset URLs; current() also notices new builds
+    IMAGE_MANIFEST.current()
+    STATIC_ASSETS.current()
+    return IMAGE_MANIFEST.version, STATIC_ASSETS.version
+
+PAGE_CACHE = PageCache(version=asset_versions, enabled=app.config['PAGE_CACHE'])
+
+
+# --------------------------------------------------------
+# METRICS
+# --------------------------------------------------------
+import atexit
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from flask import has_request_context
+from metrics import REGISTRY, MetricsStore, COUNT_BUCKETS
+
+# every worker adds its numbers to this file; /admin/metrics reads the totals
+METRICS = MetricsStore(os.getenv("METRICS_DB", os.path.join(app.instance_path, "metrics.db")), REGISTRY)
+atexit.register(METRICS.flush)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def query_started(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def query_finished(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is not None and has_request_context():
+        g.db_queries = g.get("db_queries", 0) + 1
+        g.db_query_seconds = g.get("db_query_seconds", 0.0) + time.perf_counter() - started
+
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop("request_started", None)
+    if started is None:
+        return response
+    endpoint = request.endpoint or "unmatched"
+    REGISTRY.observe("http_request_duration_seconds", time.perf_counter() - started,
+                     endpoint=endpoint, method=request.method)
+    REGISTRY.inc("http_requests_total", endpoint=endpoint, method=request.method, status=response.status_code)
+    queries = g.get("db_queries", 0)
+    REGISTRY.observe("db_queries_per_request", queries, buckets=COUNT_BUCKETS, endpoint=endpoint)
+    if queries:
+        REGISTRY.inc("db_queries_total", queries, endpoint=endpoint)
+        REGISTRY.inc("db_query_seconds_total", g.get("db_query_seconds", 0.0), endpoint=endpoint)
+    METRICS.maybe_flush()
+    return response
+
+
+# --------------------------------------------------------
+# PROFILER
+# --------------------------------------------------------
+import random
+import threading
+from profiler import Sampler, ProfileStore, read_sample_percent
+
+# admins add ?__profile=1 to any URL; a share of all requests can be sampled too
+PROFILES = ProfileStore(os.getenv("PROFILE_DIR", os.path.join(app.instance_path, "profiles")))
+PROFILE_SAMPLING_PATH = os.path.join(PROFILES.directory, "sampling.txt")
+# the percentage set on /admin/profiles, noticed by every worker within a few seconds
+PROFILE_SAMPLING = CatalogManager("profile-sampling", PROFILE_SAMPLING_PATH, read_sample_percent)
+
+
+@app.before_request
+def start_profiler():
+    if "__profile" in request.args and session.get("admin"):
+        trigger = "flag"
+    elif request.endpoint != "static" and random.random() * 100 < PROFILE_SAMPLING.current():
+        trigger = "sampled"
+    else:
+        return
+    g.profiler = Sampler(threading.get_ident()).start()
+    g.profile_trigger = trigger
+
+
+@app.after_request
+def note_profiled_status(response):
+    if "profiler" in g:
+        g.profile_status = response.status_code
+    return response
+
+
+@app.teardown_request
+def save_profile(exc):
+    sampler = g.pop("profiler", None)
+    if sampler is None:
+        return
+    sampler.stop()
+    try:
+        PROFILES.save(
+            sampler,
+            method=request.method,
+            path=request.full_path.rstrip("?"),
+            endpoint=request.endpoint,
+            status=500 if exc is not None else g.get("profile_status"),
+            trigger=g.get("profile_trigger"),
+        )
+    except OSError as e:
+        print("Saving profile failed:", e)
+
+
 # --------------------------------------------------------
 # MAIN ROUTES
 # --------------------------------------------------------
 @app.route('/')
+@PAGE_CACHE.cached(version=lambda: blog_version())
 def index():
-    return render_template('index.html', services=SERVICES[:4], testimonials=TESTIMONIALS, blog_posts=BLOG_POSTS[:3])
+    return render_template('index.html', services=SERVICES[:4], testimonials=TESTIMONIALS, blog_posts=BLOG.current().latest(3))
 
 @app.route('/about')
+@PAGE_CACHE.cached()
 def about():
     return render_template('about.html')
 
 
 
-import pandas as pd
-import os
-
 # ======= JOURNAL DATA LOADING FROM EXCEL =======
 import re
-import pandas as pd
 import os
 from urllib.parse import quote
 
@@ -165,49 +370,172 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
 import re
-
-import re
-import pandas as pd
 import os
 
-# regex helpers
-def load_journals_from_excel():
-    import pandas as pd
-    import os
-    import re
+from journal_snapshot import load_with_snapshot, workbook_key, write_snapshot
+from excel_stream import iter_workbook_sheets
+from journal_index import JournalIndex, DEFAULT_PAGE_SIZE
+from journal_search import JournalSearchIndex
+from prices import price_value
+from author_read_model import AuthorReadModel
+from jobs import JobRunner, JobStore
+
+JOURNALS_EXCEL_PATH = os.path.join(BASE_DIR, "static", "uploads", "journals.xlsx")
+JOURNALS_SNAPSHOT_PATH = os.path.join(BASE_DIR, "instance", "journals_snapshot.pkl")
 
-    excel_path = os.path.join(BASE_DIR, "static", "uploads", "journals.xlsx")
+# regex helpers
+@REGISTRY.timed("excel_load_duration_seconds", loader="journals")
+def load_journals_from_excel(excel_path=None):
+    if excel_path is None:
+        excel_path = JOURNALS_EXCEL_PATH
     if not os.path.exists(excel_path):
         return {}
 
+    if app.config['EXCEL_READER'] == 'streaming':
+        return load_journals_streaming(excel_path)
+
+    # only the pandas reader pays for importing pandas
+    import pandas as pd
     excel_data = pd.read_excel(excel_path, sheet_name=None, header=None, engine='openpyxl')
 
     sheets_output = {}
 
     for sheet, df in excel_data.items():
-        df = df.fillna("")
-        journals = []
-        block = []
+        sheets_output[sheet] = journals_from_frame(df)
 
-        for _, row in df.iterrows():
-            line = " ".join([str(x).strip() for x in row if str(x).strip()])
+    return sheets_output
 
-            if not line:      # empty row → journal complete
-                if block:
-                    journals.append(parse_journal_block(block))
-                    block = []
-                continue
 
-            block.append(line)
+JOURNAL_PRICE_RE = re.compile(r"\d+\s*[kKlL]")
+
+
+def iter_journal_blocks(rows):
+    """Group rows of stripped cell strings into blank-row separated blocks of lines."""
+    block = []
+    for row in rows:
+        line = " ".join([c for c in row if c])
+
+        if not line:      # empty row → journal complete
+            if block:
+                yield block
+                block = []
+            continue
 
-        if block:   # last block
-            journals.append(parse_journal_block(block))
+        block.append(line)
 
-        sheets_output[sheet] = journals
+    if block:   # last block
+        yield block
 
+
+def load_journals_streaming(excel_path):
+    """EXCEL_READER=streaming: rows → blocks → parse_journal_block, one sheet at a time."""
+    sheets_output = {}
+    for sheet, rows in iter_workbook_sheets(excel_path):
+        sheets_output[sheet] = [parse_journal_block(b) for b in iter_journal_blocks(rows)]
     return sheets_output
 
 
+def column_text(series):
+    """
+    str(x).strip() of every cell, "" for blanks, as an object array.
+    Blanks are masked rather than fillna("")'d: NaT survives fillna("") in a
+    datetime column and astype(str) would turn it into a float NaN.
+    """
+    blank = series.isna().to_numpy()
+    out = series.astype(object).astype(str).str.strip().to_numpy(dtype=object)
+    out[blank] = ""
+    return out
+
+
+def blank_cells(df):
+    """The frame with every blank cell (NaN, None, NaT) replaced by ""."""
+    return df.astype(object).where(df.notna(), "")
+
+
+def journals_from_frame(df):
+    """
+    Column-wise version of the row loop in journals_from_frame_iterrows().
+
+    Cells are stringified/stripped per column with pandas, rows are joined
+    column by column, blank rows mark block boundaries and link/price lines
+    are classified in bulk. Output is identical to the row-by-row parser.
+    """
+    import numpy as np
+    import pandas as pd
+
+    nrows, ncols = df.shape
+    if nrows == 0 or ncols == 0:
+        return []
+
+    # str(x).strip() per column; object arrays keep plain Python strings
+    cells = [column_text(df.iloc[:, j]) for j in range(ncols)]
+
+    # " ".join(non-empty cells) for every row at once
+    lines = cells[0]
+    for col in cells[1:]:
+        sep = np.where((lines != "") & (col != ""), " ", "").astype(object)
+        lines = lines + sep + col
+
+    filled = lines != ""
+    if not filled.any():
+        return []
+
+    # every blank row closes a block; block id of each non-empty line
+    block_ids = np.cumsum(~filled)[filled]
+    lines = lines[filled]
+
+    starts = np.flatnonzero(np.r_[True, block_ids[1:] != block_ids[:-1]])
+    ends = np.r_[starts[1:], len(lines)]
+
+    line_series = pd.Series(lines, dtype=object)
+    is_price = (
+        line_series.str.lower().str.contains("price", regex=False)
+        | line_series.str.contains(JOURNAL_PRICE_RE)
+    ).to_numpy(dtype=bool)
+    is_link = line_series.str.startswith("http").to_numpy(dtype=bool)
+
+    # last price-like line of each block: rightmost price index before the block end
+    price_pos = np.flatnonzero(is_price)
+    last = np.searchsorted(price_pos, ends) - 1
+    has_price = last >= 0
+    has_price[has_price] = price_pos[last[has_price]] >= starts[has_price]
+
+    line_list = lines.tolist()
+    journals = []
+    for b, (start, end) in enumerate(zip(starts.tolist(), ends.tolist())):
+        price = line_list[price_pos[last[b]]] if has_price[b] else "N/A"
+        journals.append({
+            "link": line_list[start] if is_link[start] else "#",
+            "details": line_list[start + 1:end],
+            "price": price,
+            "price_value": price_value(price),
+        })
+    return journals
+
+
+def journals_from_frame_iterrows(df):
+    """Reference row-by-row block splitter (kept for benchmarks / parity checks)."""
+    df = blank_cells(df)
+    journals = []
+    block = []
+
+    for _, row in df.iterrows():
+        line = " ".join([str(x).strip() for x in row if str(x).strip()])
+
+        if not line:      # empty row → journal complete
+            if block:
+                journals.append(parse_journal_block(block))
+                block = []
+            continue
+
+        block.append(line)
+
+    if block:   # last block
+        journals.append(parse_journal_block(block))
+
+    return journals
+
+
 def parse_journal_block(block):
     """
     block example:
@@ -224,7 +552,7 @@ def parse_journal_block(block):
     # last price-like line
     price = "N/A"
     for line in reversed(block):
-        if "price" in line.lower() or re.search(r"\d+\s*[kKlL]", line):
+        if "price" in line.lower() or JOURNAL_PRICE_RE.search(line):
             price = line
             break
 
@@ -233,16 +561,39 @@ def parse_journal_block(block):
     return {
         "link": link,
         "details": details,
-        "price": price
+        "price": price,
+        "price_value": price_value(price)
     }
-JOURNALS_BY_SHEET = load_journals_from_excel()
+def build_journal_index(excel_path):
+    # the readers differ in details (pandas turns 5 into "5.0" in a column
+    # with blanks), so each one has its own snapshot
+    return JournalIndex(load_with_snapshot(excel_path, JOURNALS_SNAPSHOT_PATH, load_journals_from_excel,
+                                           reader=app.config['EXCEL_READER']))
+
+
+# swapped for a fresh JournalIndex whenever journals.xlsx changes on disk;
+# built by the first request that needs it, not at import
+JOURNAL_CATALOG = CatalogManager(
+    "journals",
+    JOURNALS_EXCEL_PATH,
+    build_journal_index,
+    lock_path=os.path.join(BASE_DIR, "instance", "journals.lock"),
+)
+
+
+@app.cli.command("build-journal-snapshot")
+def build_journal_snapshot():
+    """Parse journals.xlsx and write the boot snapshot (run at deploy time)."""
+    key = workbook_key(JOURNALS_EXCEL_PATH, reader=app.config['EXCEL_READER'])
+    data = load_journals_from_excel()
+    write_snapshot(JOURNALS_SNAPSHOT_PATH, JOURNALS_EXCEL_PATH, data, key=key)
+    total = sum(len(v) for v in data.values())
+    print(f"Journal snapshot written: {len(data)} sheets, {total} journals -> {JOURNALS_SNAPSHOT_PATH}")
 
 
 # Author
 
-# put near other imports
 import re
-import pandas as pd
 import os
 
 def parse_author_cell(cell):
@@ -254,178 +605,417 @@ def parse_author_cell(cell):
     return {"price": parts[0], "status": " ".join(parts[1:])}
 
 
-def load_author_positions_from_excel(filepath=None):
+AUTHOR_LABEL_RE = re.compile(r'^\s*Author\b', re.IGNORECASE)
 
-    if filepath is None:
-        filepath = os.path.join("static", "uploads", "Array Research Author Positions (2).xlsx")
 
-    if not os.path.exists(filepath):
-        print("Author Excel not found:", filepath)
-        return []
+def parse_author_sheet_rows(sheet_name, rows):
+    """
+    Single pass over one sheet's rows (lists of stripped cell strings).
 
-    try:
-        excel_data = pd.read_excel(filepath, sheet_name=None, header=None)
-    except Exception as e:
-        print("Error reading author excel:", e)
-        return []
+    Same rules as parse_author_sheet_frame_rescan(), but the table heading
+    is the last meaningful line seen so far instead of a backwards scan, so
+    every row is looked at once and rows can come straight from a streaming
+    reader.
+    """
+    sheet_info = []
+    tables = []
+    current_table = None
+    in_table = False
+    last_line = ""
+
+    for row in rows:
+        line = " ".join([c for c in row if c])
+        lower_row = [c.lower() for c in row]
+
+        # TRUE header row
+        is_header = (
+            any("position" in c for c in lower_row)
+            and any(("amount" in c or "price" in c) for c in lower_row)
+            and any("status" in c for c in lower_row)
+        )
+
+        # AVOID repeating "author position available"
+        is_fake_title = any("author position" in c for c in lower_row if c)
+
+        # Author line?
+        has_author_label = any(AUTHOR_LABEL_RE.match(c) for c in row if c)
+
+        heading = last_line
+        if len(line) > 3 and "author position" not in line.lower():
+            last_line = line
+
+        # SHEET INFO (before tables)
+        if not in_table and not is_header and not has_author_label:
+            if not is_fake_title and len(line) > 3:
+                sheet_info.append(line)
+            continue
+
+        # TABLE START
+        if is_header:
+            if current_table:
+                tables.append(current_table)
+
+            current_table = {"title": heading, "authors": []}
+            in_table = True
+
+            author_col = next((i for i, c in enumerate(lower_row) if "position" in c or "author" in c), 0)
+            amount_col = next((i for i, c in enumerate(lower_row) if "amount" in c or "price" in c), 1)
+            status_col = next((i for i, c in enumerate(lower_row) if "status" in c), 2)
+            current_table["_cols"] = (author_col, amount_col, status_col)
+            continue
+
+        # DATA ROWS
+        if in_table:
+            # blank row ends table
+            if not line:
+                if current_table and current_table["authors"]:
+                    tables.append(current_table)
+                current_table = None
+                in_table = False
+                continue
 
-    all_sheets = []
-    author_label_re = re.compile(r'^\s*Author\b', re.IGNORECASE)
+            ai, bi, ci = current_table["_cols"]
+            author_cell = row[ai] if ai < len(row) else ""
+            amount_cell = row[bi] if bi < len(row) else ""
+            status_cell = row[ci] if ci < len(row) else ""
 
-    for sheet_name, df in excel_data.items():
-        df = df.fillna("")
-        nrows, ncols = df.shape
+            # fix missing author
+            if not author_cell:
+                for c in row:
+                    if c.lower().startswith("author"):
+                        author_cell = c
+                        break
 
-        sheet_info = []
-        tables = []
-        current_table = None
-        in_table = False
+            if not author_cell or not re.search(r"Author", author_cell, re.I):
+                continue
 
-        for r in range(nrows):
-            row = [str(x).strip() for x in df.iloc[r].tolist()]
-            lower_row = [c.lower() for c in row]
+            # clean author label
+            level = re.sub(r'[:\-]', '', author_cell).strip()
+            if not re.search(r'Author', level, re.I):
+                m = re.search(r'(\d+)', level)
+                if m:
+                    level = f"Author {m.group(1)}"
 
-            # TRUE header row
-            is_header = (
-                any("position" in c for c in lower_row)
-                and any(("amount" in c or "price" in c) for c in lower_row)
-                and any("status" in c for c in lower_row)
+            parsed = parse_author_cell(
+                status_cell if not amount_cell else f"{amount_cell} {status_cell}"
             )
 
-            # AVOID repeating "author position available"
-            is_fake_title = any(
-                "author position" in c.lower() for c in row if c
-            )
+            price = amount_cell or parsed["price"]
+            status = status_cell or parsed["status"]
+
+            current_table["authors"].append({
+                "level": level,
+                "price": price.strip(),
+                "price_value": price_value(price),
+                "status": status.strip()
+            })
+
+    if current_table and current_table["authors"]:
+        tables.append(current_table)
+
+    return {
+        "sheet": sheet_name,
+        "info": "\n".join(sheet_info),
+        "tables": [{k: v for k, v in t.items() if k != "_cols"} for t in tables]
+    }
 
-            # Author line?
-            has_author_label = any(author_label_re.match(c) for c in row if c)
-
-            # ----------------------
-            # SHEET INFO (before tables)
-            # ----------------------
-            if not in_table and not is_header and not has_author_label:
-                # Skip fake titles from sheet info too
-                if not is_fake_title:
-                    text = " ".join([c for c in row if c])
-                    if len(text.strip()) > 3:
-                        sheet_info.append(text.strip())
-                continue
 
-            # ----------------------
-            # TABLE START
-            # ----------------------
-            if is_header:
+def author_sheet_rows(df):
+    """Whole sheet as a 2D list of str(x).strip() cells, extracted column-wise."""
+    if df.shape[1] == 0:
+        return [[] for _ in range(len(df))]
+    columns = [column_text(df.iloc[:, j]).tolist() for j in range(df.shape[1])]
+    return [list(row) for row in zip(*columns)]
 
-                # Push previous table
-                if current_table:
+
+def parse_author_sheet_frame_rescan(sheet_name, df):
+    """
+    Reference DataFrame parser that re-reads rows with df.iloc and scans
+    upwards for every table heading (quadratic; kept for benchmarks /
+    parity checks against parse_author_sheet_rows).
+    """
+    df = blank_cells(df)
+    nrows, ncols = df.shape
+
+    sheet_info = []
+    tables = []
+    current_table = None
+    in_table = False
+
+    for r in range(nrows):
+        row = [str(x).strip() for x in df.iloc[r].tolist()]
+        lower_row = [c.lower() for c in row]
+
+        # TRUE header row
+        is_header = (
+            any("position" in c for c in lower_row)
+            and any(("amount" in c or "price" in c) for c in lower_row)
+            and any("status" in c for c in lower_row)
+        )
+
+        # AVOID repeating "author position available"
+        is_fake_title = any(
+            "author position" in c.lower() for c in row if c
+        )
+
+        # Author line?
+        has_author_label = any(AUTHOR_LABEL_RE.match(c) for c in row if c)
+
+        # ----------------------
+        # SHEET INFO (before tables)
+        # ----------------------
+        if not in_table and not is_header and not has_author_label:
+            # Skip fake titles from sheet info too
+            if not is_fake_title:
+                text = " ".join([c for c in row if c])
+                if len(text.strip()) > 3:
+                    sheet_info.append(text.strip())
+            continue
+
+        # ----------------------
+        # TABLE START
+        # ----------------------
+        if is_header:
+
+            # Push previous table
+            if current_table:
+                tables.append(current_table)
+
+            # FIND REAL HEADING ABOVE HEADER
+            heading = ""
+            for up in range(r - 1, -1, -1):
+                prev = [str(x).strip() for x in df.iloc[up].tolist()]
+                line = " ".join([c for c in prev if c])
+
+                if len(line) > 3 and not ("author position" in line.lower()):
+                    heading = line
+                    break
+
+            current_table = {"title": heading, "authors": []}
+            in_table = True
+
+            # find column indexes
+            author_col = next((i for i, c in enumerate(lower_row) if "position" in c or "author" in c), 0)
+            amount_col = next((i for i, c in enumerate(lower_row) if "amount" in c or "price" in c), 1)
+            status_col = next((i for i, c in enumerate(lower_row) if "status" in c), 2)
+
+            current_table["_cols"] = {
+                "author": author_col,
+                "amount": amount_col,
+                "status": status_col
+            }
+            continue
+
+        # ----------------------
+        # DATA ROWS
+        # ----------------------
+        if in_table:
+            # blank row ends table
+            if all(not c for c in row):
+                if current_table and current_table["authors"]:
                     tables.append(current_table)
+                current_table = None
+                in_table = False
+                continue
 
-                # FIND REAL HEADING ABOVE HEADER
-                heading = ""
-                for up in range(r - 1, -1, -1):
-                    prev = [str(x).strip() for x in df.iloc[up].tolist()]
-                    line = " ".join([c for c in prev if c])
+            cols = current_table["_cols"]
+            ai, bi, ci = cols["author"], cols["amount"], cols["status"]
 
-                    if len(line) > 3 and not ("author position" in line.lower()):
-                        heading = line
+            author_cell = row[ai]
+            amount_cell = row[bi] if bi < len(row) else ""
+            status_cell = row[ci] if ci < len(row) else ""
+
+            # fix missing author
+            if not author_cell:
+                for c in row:
+                    if c.lower().startswith("author"):
+                        author_cell = c
                         break
 
-                current_table = {"title": heading, "authors": []}
-                in_table = True
+            if not author_cell or not re.search(r"Author", author_cell, re.I):
+                continue
 
-                # find column indexes
-                author_col = next((i for i, c in enumerate(lower_row) if "position" in c or "author" in c), 0)
-                amount_col = next((i for i, c in enumerate(lower_row) if "amount" in c or "price" in c), 1)
-                status_col = next((i for i, c in enumerate(lower_row) if "status" in c), 2)
+            # clean author label
+            level = re.sub(r'[:\-]', '', author_cell).strip()
+            if not re.search(r'Author', level, re.I):
+                m = re.search(r'(\d+)', level)
+                if m:
+                    level = f"Author {m.group(1)}"
+
+            parsed = parse_author_cell(
+                status_cell if not amount_cell else f"{amount_cell} {status_cell}"
+            )
+
+            price = amount_cell or parsed["price"]
+            status = status_cell or parsed["status"]
+
+            current_table["authors"].append({
+                "level": level,
+                "price": price.strip(),
+                "price_value": price_value(price),
+                "status": status.strip()
+            })
+
+    if current_table and current_table["authors"]:
+        tables.append(current_table)
+
+    return {
+        "sheet": sheet_name,
+        "info": "\n".join(sheet_info),
+        "tables": [{k: v for k, v in t.items() if k != "_cols"} for t in tables]
+    }
+
+
+AUTHOR_EXCEL_PATH = os.path.join(BASE_DIR, "static", "uploads", "Array Research Author Positions (2).xlsx")
+
+
+@REGISTRY.timed("excel_load_duration_seconds", loader="authors")
+def load_author_positions_from_excel(filepath=None):
+    if filepath is None:
+        filepath = AUTHOR_EXCEL_PATH
+
+    if not os.path.exists(filepath):
+        print("Author Excel not found:", filepath)
+        return []
+
+    if app.config['EXCEL_READER'] == 'streaming':
+        try:
+            return [
+                parse_author_sheet_rows(sheet_name, rows)
+                for sheet_name, rows in iter_workbook_sheets(filepath)
+            ]
+        except Exception as e:
+            print("Error reading author excel:", e)
+            return []
+
+    import pandas as pd
+    try:
+        excel_data = pd.read_excel(filepath, sheet_name=None, header=None)
+    except Exception as e:
+        print("Error reading author excel:", e)
+        return []
+
+    return [
+        parse_author_sheet_rows(sheet_name, author_sheet_rows(df))
+        for sheet_name, df in excel_data.items()
+    ]
 
-                current_table["_cols"] = {
-                    "author": author_col,
-                    "amount": amount_col,
-                    "status": status_col
-                }
-                continue
 
-            # ----------------------
-            # DATA ROWS
-            # ----------------------
-            if in_table:
-                # blank row ends table
-                if all(not c for c in row):
-                    if current_table and current_table["authors"]:
-                        tables.append(current_table)
-                    current_table = None
-                    in_table = False
-                    continue
-
-                cols = current_table["_cols"]
-                ai, bi, ci = cols["author"], cols["amount"], cols["status"]
-
-                author_cell = row[ai]
-                amount_cell = row[bi] if bi < len(row) else ""
-                status_cell = row[ci] if ci < len(row) else ""
-
-                # fix missing author
-                if not author_cell:
-                    for c in row:
-                        if c.lower().startswith("author"):
-                            author_cell = c
-                            break
-
-                if not author_cell or not re.search(r"Author", author_cell, re.I):
-                    continue
-
-                # clean author label
-                level = re.sub(r'[:\-]', '', author_cell).strip()
-                if not re.search(r'Author', level, re.I):
-                    m = re.search(r'(\d+)', level)
-                    if m:
-                        level = f"Author {m.group(1)}"
-
-                parsed = parse_author_cell(
-                    status_cell if not amount_cell else f"{amount_cell} {status_cell}"
-                )
-
-                price = amount_cell or parsed["price"]
-                status = status_cell or parsed["status"]
-
-                current_table["authors"].append({
-                    "level": level,
-                    "price": price.strip(),
-                    "status": status.strip()
-                })
-
-        if current_table and current_table["authors"]:
-            tables.append(current_table)
-
-        all_sheets.append({
-            "sheet": sheet_name,
-            "info": "\n".join(sheet_info),
-            "tables": [{k: v for k, v in t.items() if k != "_cols"} for t in tables]
-        })
 
-    return all_sheets
+AUTHOR_READ_MODEL = AuthorReadModel()
 
+# parsed author workbook for the admin pages, re-parsed after an upload
+AUTHOR_CATALOG = CatalogManager("authors", AUTHOR_EXCEL_PATH, load_author_positions_from_excel)
 
 
 @app.route('/authors')
 def authors_cards():
-    sheets = AuthorSheet.query.all()
-    return render_template('author_cards.html', sheets=sheets)
+    return render_template('author_cards.html', sheets=AUTHOR_READ_MODEL.sheets())
+
+
+@app.route('/api/authors/<int:sheet_id>/positions')
+def author_positions_api(sheet_id):
+    """?status=available|booked|unknown; omitted lists every position of the sheet"""
+    from sqlalchemy.orm import contains_eager
+    from models import PositionStatus, positions_query
+    status = request.args.get('status') or None
+    if status is not None and status not in {s.value for s in PositionStatus}:
+        return jsonify({'error': 'Unknown status'}), 400
+    return jsonify([
+        {
+            'id': pos.id,
+            'table_id': pos.table_id,
+            'table': pos.table.title,
+            'level': pos.level,
+            'amount': pos.amount,
+            'amount_value': pos.amount_value,
+            'status': pos.status_code.value,
+        }
+        for pos in positions_query(sheet_id, status).options(contains_eager(AuthorPosition.table))
+    ])
 
 
 
 
 @app.route('/service')
+@PAGE_CACHE.cached()
 def services():
     return render_template('service.html', services=SERVICES)
 
 
+JOURNALS_FIRST_PAGE = 12
+
+
+def journal_catalog_version():
+    JOURNAL_CATALOG.current()
+    return JOURNAL_CATALOG.version
+
+
 @app.route('/journals')
+@PAGE_CACHE.cached(version=journal_catalog_version)
 def journals():
-    # ensure fresh load on each request in dev if you want:
-    # global JOURNALS_BY_SHEET
-    # JOURNALS_BY_SHEET = load_journals_from_excel()
-    return render_template('journals.html', journals_by_sheet=JOURNALS_BY_SHEET)
+    # first page of every sheet is rendered server-side,
+    # the rest is pulled from /api/journals as the visitor asks for it
+    index = JOURNAL_CATALOG.current()
+    sheets = []
+    for sheet in index.sheets:
+        items, next_cursor = index.page(sheet=sheet, limit=JOURNALS_FIRST_PAGE)
+        sheets.append({"name": sheet, "journals": items, "next_cursor": next_cursor})
+    return render_template('journals.html', sheets=sheets, page_size=JOURNALS_FIRST_PAGE)
+
+
+@app.route('/api/journals')
+def journals_api():
+    """
+    Paginated journal catalog.
+
+    ?sheet=&q=&min_price=&max_price=&sort=price&cursor=&limit=
+    (limit defaults to 50, max 200; sort=price lists cheapest first)
+    """
+    args = request.args
+    sheet = args.get('sheet') or None
+    cursor = args.get('cursor', type=int)
+    limit = args.get('limit', default=DEFAULT_PAGE_SIZE, type=int)
+    min_price = args.get('min_price', type=float)
+    max_price = args.get('max_price', type=float)
+
+    items, next_cursor = JOURNAL_CATALOG.current().page(
+        sheet=sheet,
+        query=args.get('q'),
+        min_price=min_price,
+        max_price=max_price,
+        cursor=cursor,
+        limit=limit,
+        sort=args.get('sort'),
+    )
+    return jsonify({'journals': items, 'next_cursor': next_cursor})
+
+
+JOURNAL_SEARCH = JournalSearchIndex(os.path.join(BASE_DIR, "instance", "journal_search.db"))
+
+
+@app.route('/journals/search')
+def journals_search():
+    query = request.args.get('q', '').strip()
+    limit = max(1, min(request.args.get('limit', default=20, type=int), 100))
+
+    results = []
+    if query:
+        try:
+            JOURNAL_SEARCH.ensure_current(
+                JOURNALS_EXCEL_PATH,
+                lambda: load_with_snapshot(JOURNALS_EXCEL_PATH, JOURNALS_SNAPSHOT_PATH, load_journals_from_excel,
+                                           reader=app.config['EXCEL_READER']),
+            )
+            results = JOURNAL_SEARCH.search(query, limit=limit)
+        except Exception as e:
+            print("Journal search error:", e)
+
+    if request.args.get('format') == 'json':
+        return jsonify({'query': query, 'results': [
+            dict(r, name=str(r['name']), snippet=str(r['snippet'])) for r in results
+        ]})
+    return render_template('journal_search.html', query=query, results=results)
 
 
 
@@ -434,340 +1024,36 @@ def journals():
 #def journals():
  #   return render_template('service.html', services=FULL_SERVICES, journals=JOURNALS)
 
-posts = [
-    # 1
-    {
-        "id": "academic-publishing-pitfalls",
-        "title": "Common Pitfalls in Academic Publishing and How to Avoid Them",
-        "author": "arrayresearch3",
-        "date": "Jan 4, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/publishing.jpg",
-        "excerpt": "Publishing in academic journals is a critical milestone for researchers, yet it can be fraught with challenges. Learn how to avoid common pitfalls and strengthen your publication success.",
-        "content": """
-        <p>Publishing in academic journals is a critical milestone for researchers, yet it can be fraught with challenges. From selecting the right journal to adhering to strict submission guidelines, many factors can impact the success of your submission.</p>
-        <p>Here, we explore common pitfalls in academic publishing strategies, how to avoid them, and how Array Research assists in navigating these challenges.</p>
-
-        <h3>1. Choosing the Wrong Journal</h3>
-        <p>A mismatch in scope or audience can lead to outright rejection.</p>
-        <strong>Solution:</strong> Research potential journals thoroughly.<br>
-        <strong>Array Research Helps:</strong> We assist in identifying SCOPUS and PubMed-indexed journals.
-
-        <h3>2. Lack of Novelty or Significance</h3>
-        <p>Editors look for originality and impact.</p>
-        <strong>Solution:</strong> Highlight your research’s novelty.<br>
-        <strong>Array Research Helps:</strong> We help articulate your work’s significance clearly.
-
-        <h3>3. Poorly Written Manuscripts</h3>
-        <p>Grammar or unclear structure reduces credibility.</p>
-        <strong>Solution:</strong> Use professional editing.<br>
-        <strong>Array Research Helps:</strong> We provide editing and proofreading services.
-
-        <h3>4. Ignoring Journal Guidelines</h3>
-        <p>Formatting errors delay or reject submissions.</p>
-        <strong>Solution:</strong> Follow guidelines exactly.<br>
-        <strong>Array Research Helps:</strong> We ensure adherence to journal-specific formatting.</p>
-
-        <h3>Conclusion</h3>
-        <p>By being mindful of these pitfalls, researchers can confidently publish high-quality work. Array Research is your trusted publication partner.</p>
-        """
-    },
-
-    # 2
-    {
-        "id": "academic-support-career",
-        "title": "Why Choosing the Right Academic Support Can Transform Your Career",
-        "author": "arrayresearch3",
-        "date": "Dec 21, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/support.jpg",
-        "excerpt": "The correct academic assistance can help you realize your full potential. Discover how expert guidance transforms your research and career success.",
-        "content": """
-        <p>In today’s competitive academic landscape, choosing the right support can significantly shape your career trajectory.</p>
-
-        <h3>The Challenges of Academic Excellence</h3>
-        <ul>
-            <li>Time constraints balancing studies, work, and research.</li>
-            <li>Complex publication requirements.</li>
-            <li>Skill gaps in writing and data analysis.</li>
-        </ul>
-
-        <h3>How Academic Support Helps</h3>
-        <p>Academic assistance enhances confidence, skill development, and professional growth.</p>
-
-        <h3>Array Research Advantage</h3>
-        <p>We offer plagiarism checks, thesis writing, literature review, and career-aligned support customized to your goals.</p>
-
-        <h3>Conclusion</h3>
-        <p>Choosing Array Research means investing in a lifelong academic partnership dedicated to your success.</p>
-        """
-    },
-
-    # 3
-    {
-        "id": "author-positioning-insights",
-        "title": "From Manuscript to Publication: Navigating the Journey with Author Positioning Insights",
-        "author": "arrayresearch3",
-        "date": "Dec 18, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/manuscript.jpg",
-        "excerpt": "Learn why author positioning matters in research publishing and how to ensure fair recognition for your contributions.",
-        "content": """
-        <p>Author positioning determines credit and recognition in scholarly publications.</p>
-
-        <h3>What Is Author Positioning?</h3>
-        <p>Order reflects contribution — first author leads research, last author supervises, middle authors support.</p>
-
-        <h3>Common Challenges</h3>
-        <ul>
-            <li>Disagreements on contribution weight.</li>
-            <li>Variations in journal author rules.</li>
-        </ul>
-
-        <h3>Array Research Assistance</h3>
-        <p>We guide contribution mapping, conflict resolution, and ethical authorship alignment.</p>
-
-        <h3>Conclusion</h3>
-        <p>Proper author positioning builds collaboration and integrity. Array Research ensures every contributor receives fair recognition.</p>
-        """
-    },
-
-    # 4
-    {
-        "id": "time-management-techniques",
-        "title": "Successful Time Management Techniques for Master's and PhD Students",
-        "author": "arrayresearch3",
-        "date": "Dec 17, 2024",
-        "read_time": "4 min read",
-        "image": "images/blogs/time-management.jpg",
-        "excerpt": "Time management is vital for research students balancing multiple responsibilities. Explore proven strategies for staying productive.",
-        "content": """
-        <h3>Key Techniques</h3>
-        <ul>
-            <li>Use Pomodoro, Trello, or Notion for structure.</li>
-            <li>Apply Eisenhower Matrix to prioritize tasks.</li>
-            <li>Take scheduled breaks to prevent burnout.</li>
-        </ul>
-
-        <h3>How Array Research Helps</h3>
-        <p>We assist postgraduates with thesis planning, time scheduling, and organized progress tracking.</p>
-
-        <h3>Conclusion</h3>
-        <p>Mastering time management leads to efficient research and balanced academic life.</p>
-        """
-    },
-
-    # 5
-    {
-        "id": "creating-perfect-abstract",
-        "title": "Creating the Ideal Abstract: The Secret to Drawing in Reviewers and Readers",
-        "author": "arrayresearch3",
-        "date": "Dec 14, 2024",
-        "read_time": "4 min read",
-        "image": "images/blogs/abstract.jpg",
-        "excerpt": "Your research begins with an abstract. Learn how to craft one that grabs attention and communicates your study’s essence effectively.",
-        "content": """
-        <p>A strong abstract summarizes your research and draws readers in instantly.</p>
-
-        <h3>Essential Elements</h3>
-        <ul>
-            <li>Background and goal of research</li>
-            <li>Methods and key results</li>
-            <li>Impact and implications</li>
-        </ul>
-
-        <h3>Tips for Writing</h3>
-        <ul>
-            <li>Use active voice, avoid jargon</li>
-            <li>Stay under 300 words</li>
-            <li>Include relevant keywords</li>
-        </ul>
-
-        <p>Array Research helps craft abstracts that impress reviewers and boost visibility.</p>
-        """
-    },
-
-    # 6
-    {
-        "id": "why-plagiarism-kills-research",
-        "title": "Why Plagiarism Is the Death of Research Integrity – And How to Avoid It",
-        "author": "arrayresearch3",
-        "date": "Dec 13, 2024",
-        "read_time": "4 min read",
-        "image": "images/blogs/plagiarism.jpg",
-        "excerpt": "Plagiarism destroys trust and credibility in research. Learn to maintain integrity and originality in your work.",
-        "content": """
-        <h3>The Consequences of Plagiarism</h3>
-        <ul>
-            <li>Loss of credibility and reputation</li>
-            <li>Legal and ethical repercussions</li>
-            <li>Stagnation of innovation</li>
-        </ul>
-
-        <h3>How to Avoid It</h3>
-        <ul>
-            <li>Always cite sources properly</li>
-            <li>Use plagiarism detection tools like Turnitin</li>
-            <li>Maintain detailed research notes</li>
-        </ul>
-
-        <p>Array Research provides plagiarism check and removal services ensuring academic originality.</p>
-        """
-    },
-
-    # 7
-    {
-        "id": "publishing-in-scopus-pubmed",
-        "title": "Top Tips for Getting Your Paper Published in Scopus and PubMed Journals",
-        "author": "arrayresearch3",
-        "date": "Dec 6, 2024",
-        "read_time": "5 min read",
-        "image": "images/blogs/scopus.jpg",
-        "excerpt": "Increase your chances of acceptance in Scopus and PubMed journals with these proven publication strategies.",
-        "content": """
-        <h3>1. Choose the Right Journal</h3>
-        <p>Match your paper’s scope and audience to the journal.</p>
-
-        <h3>2. Follow Author Guidelines</h3>
-        <p>Ensure formatting, word count, and citation accuracy.</p>
-
-        <h3>3. Write a Compelling Abstract</h3>
-        <p>Summarize your study with clarity and focus on contribution.</p>
-
-        <h3>4. Ethical Practices</h3>
-        <p>Be transparent about data and conflicts of interest.</p>
-
-        <p>Array Research helps researchers prepare and refine manuscripts for top-tier publications.</p>
-        """
-    },
-
-    # 8
-    {
-        "id": "conference-training-support",
-        "title": "Unlock Knowledge and Collaboration with Conference, Workshop, and Training Support",
-        "author": "arrayresearch3",
-        "date": "Dec 3, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/conference.jpg",
-        "excerpt": "Workshops and conferences drive professional growth. Discover how Array Research maximizes your participation success.",
-        "content": """
-        <h3>Why Events Matter</h3>
-        <p>Conferences enable networking, collaboration, and exposure to new research trends.</p>
-
-        <h3>Array Research Support</h3>
-        <ul>
-            <li>Presentation and paper writing assistance</li>
-            <li>Event planning and promotional guidance</li>
-            <li>Post-event engagement and feedback improvement</li>
-        </ul>
-
-        <p>We ensure your participation or event organization is seamless and impactful.</p>
-        """
-    },
-
-    # 9
-    {
-        "id": "navigating-author-positions",
-        "title": "Navigating Author Positions with Array Research: Ensuring Fair Recognition",
-        "author": "arrayresearch3",
-        "date": "Dec 3, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/author-position.jpg",
-        "excerpt": "Understand author order and ensure fair credit for research contributions with professional guidance.",
-        "content": """
-        <p>Author positions reflect contribution and leadership within research publications.</p>
-
-        <h3>Key Roles</h3>
-        <ul>
-            <li>First Author — main contributor</li>
-            <li>Middle Authors — collaborative roles</li>
-            <li>Last Author — supervisor or PI</li>
-        </ul>
-
-        <p>Array Research mediates authorship order, promotes fairness, and ensures publication ethics compliance.</p>
-        """
-    },
-
-    # 10
-    {
-        "id": "plagiarism-check-services",
-        "title": "Ensure Originality with Plagiarism Check and Removal Services by Array Research",
-        "author": "arrayresearch3",
-        "date": "Dec 3, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/plagiarism-check.jpg",
-        "excerpt": "Maintain credibility and ensure originality with professional plagiarism detection and correction support.",
-        "content": """
-        <p>Plagiarism threatens originality and career credibility. Our services combine advanced tools with expert analysis to eliminate risks.</p>
-        <ul>
-            <li>Accurate plagiarism detection and correction</li>
-            <li>Proper paraphrasing and citation adjustments</li>
-            <li>Comprehensive originality reports</li>
-        </ul>
-        """
-    },
-
-    # 11
-    {
-        "id": "thesis-writing-support",
-        "title": "Thesis Writing Made Easy with Customized Support by Array Research",
-        "author": "arrayresearch3",
-        "date": "Dec 2, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/thesis.jpg",
-        "excerpt": "Simplify your thesis journey with tailored support from research design to final editing.",
-        "content": """
-        <p>Writing a thesis requires clarity, structure, and consistency. We help at every stage — topic selection, proposal drafting, research design, and editing.</p>
-        <p>Our experts ensure your thesis meets all academic standards and submission requirements efficiently.</p>
-        """
-    },
-
-    # 12
-    {
-        "id": "research-paper-services",
-        "title": "Simplifying Academic Success with Research Paper Writing Services by Array Research",
-        "author": "arrayresearch3",
-        "date": "Dec 2, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/research-paper.jpg",
-        "excerpt": "Professional research paper writing and editing support to help you publish confidently.",
-        "content": """
-        <p>From topic selection to publication, our team helps craft impactful research papers with precision and originality.</p>
-        <ul>
-            <li>Topic selection and proposal drafting</li>
-            <li>Data analysis and literature review</li>
-            <li>Formatting, proofreading, and submission help</li>
-        </ul>
-        """
-    },
-
-    # 13
-    {
-        "id": "phd-dissertation-services",
-        "title": "PhD Dissertation Writing Services by Array Research: Your Partner in Academic Excellence",
-        "author": "arrayresearch3",
-        "date": "Dec 2, 2024",
-        "read_time": "3 min read",
-        "image": "images/blogs/dissertation.jpg",
-        "excerpt": "Comprehensive dissertation writing support for PhD candidates from proposal to defense.",
-        "content": """
-        <p>PhD dissertations are complex and demanding. Array Research offers expert support for every phase — proposal, data analysis, writing, editing, and defense preparation.</p>
-        <p>We ensure originality, structure, and academic rigor for successful submission.</p>
-        """
-    }
-]
+# --------------------------------------------------------
+# BLOG
+# --------------------------------------------------------
+from blog_store import CONTENT_DIR as BLOG_DIR, build_index as build_blog_index, directory_key, post_body
+
+# posts live in content/blog/<slug>.html; only their front matter is kept in
+# memory, bodies are read on demand (blog_store.py). Adding, removing or
+# editing a post reloads the index, and the new version invalidates the
+# cached /blog pages.
+BLOG = CatalogManager("blog", BLOG_DIR, build_blog_index, stat_key=directory_key)
+
+def blog_version():
+    BLOG.current()
+    return BLOG.version
+
 @app.route('/blog')
+@PAGE_CACHE.cached(version=blog_version)
 def blog():
-    return render_template('blog.html', posts=posts)
+    return render_template('blog.html', posts=BLOG.current().posts)
 
 @app.route('/blog/<post_id>')
+@PAGE_CACHE.cached(version=blog_version)
 def blog_detail(post_id):
-    post = next((p for p in posts if p["id"] == post_id), None)
+    post = BLOG.current().get(post_id)
     if not post:
-        abort(404)
-    return render_template('blog_detail.html', post=post)
+        return render_template('404.html'), 404
+    return render_template('blog_detail.html', post=post, content=post_body(post))
 
 @app.route('/event')
+@PAGE_CACHE.cached()
 def event():
     return render_template('event.html')
 
@@ -783,6 +1069,7 @@ def contact():
     return render_template('contact.html')
 
 @app.route('/programs')
+@PAGE_CACHE.cached()
 def programs():
     return render_template('programs.html')
 
@@ -830,28 +1117,28 @@ os.environ["OAUTHLIB_INSECURE_TRANSPORT"] = "1"
 client_secrets_file = os.path.join(os.path.dirname(__file__), "client_secret.json")
 GOOGLE_CLIENT_ID = os.getenv('GOOGLE_CLIENT_ID')
 
-@app.route("/login/google")
-def login_google():
-    flow = Flow.from_client_secrets_file(
+def google_oauth_flow():
+    """OAuth flow for Google login; google_auth_oauthlib is only imported on first use."""
+    from google_auth_oauthlib.flow import Flow
+    return Flow.from_client_secrets_file(
         client_secrets_file=client_secrets_file,
         scopes=["https://www.googleapis.com/auth/userinfo.profile",
                 "https://www.googleapis.com/auth/userinfo.email", "openid"],
         redirect_uri="https://array-research-final.onrender.com/callback/google"
 
     )
+
+@app.route("/login/google")
+def login_google():
+    flow = google_oauth_flow()
     authorization_url, state = flow.authorization_url(prompt="consent")
     session["state"] = state
     return redirect(authorization_url)
 
 @app.route("/callback/google")
 def callback_google():
-    flow = Flow.from_client_secrets_file(
-        client_secrets_file=client_secrets_file,
-        scopes=["https://www.googleapis.com/auth/userinfo.profile",
-                "https://www.googleapis.com/auth/userinfo.email", "openid"],
-        redirect_uri="https://array-research-final.onrender.com/callback/google"
-
-    )
+    import requests
+    flow = google_oauth_flow()
     flow.fetch_token(authorization_response=request.url)
     if session["state"] != request.args["state"]:
         return redirect(url_for("login"))
@@ -882,33 +1169,141 @@ def admin_required(func):
     wrapper.__name__ = func.__name__
     return wrapper
 
+@app.route("/admin/metrics")
+def admin_metrics():
+    """Prometheus text format; for an admin session or `Authorization: Bearer $METRICS_TOKEN`."""
+    token = os.getenv("METRICS_TOKEN")
+    if not session.get("admin") and not (token and request.headers.get("Authorization") == f"Bearer {token}"):
+        return redirect(url_for("admin_login"))
+    METRICS.flush()
+    return METRICS.render(), 200, {"Content-Type": "text/plain; version=0.0.4; charset=utf-8"}
+
+@app.route("/admin/profiles", methods=["GET", "POST"])
+@admin_required
+def admin_profiles():
+    message = error = None
+    if request.method == "POST":
+        from profiler import write_sample_percent
+        try:
+            percent = max(0.0, min(100.0, float(request.form.get("percent") or 0)))
+        except ValueError:
+            error = "Sampling rate must be a number between 0 and 100."
+        else:
+            write_sample_percent(PROFILE_SAMPLING_PATH, percent)
+            PROFILE_SAMPLING.load()
+            message = f"Profiling {percent:g}% of requests."
+    return render_template("admin/profiles.html", profiles=PROFILES.summaries(),
+                           sample_percent=PROFILE_SAMPLING.current(), message=message, error=error)
+
+@app.route("/admin/profiles/<profile_id>")
+@admin_required
+def admin_profile(profile_id):
+    from profiler import top_frames
+    try:
+        profile = PROFILES.get(profile_id)
+    except KeyError:
+        return render_template("404.html"), 404
+    return render_template("admin/profile.html", profile=profile, frames=top_frames(profile))
+
+@app.route("/admin/profiles/<profile_id>.<fmt>")
+@admin_required
+def admin_profile_export(profile_id, fmt):
+    """collapsed: folded stacks for flamegraph.pl; speedscope: open in speedscope.app"""
+    from profiler import collapsed, speedscope
+    if fmt not in ("collapsed", "speedscope"):
+        return render_template("404.html"), 404
+    try:
+        profile = PROFILES.get(profile_id)
+    except KeyError:
+        return render_template("404.html"), 404
+    if fmt == "collapsed":
+        body, mimetype, filename = collapsed(profile), "text/plain", f"{profile_id}.collapsed.txt"
+    else:
+        body, mimetype, filename = json.dumps(speedscope(profile)), "application/json", f"{profile_id}.speedscope.json"
+    return app.response_class(body, mimetype=mimetype,
+                              headers={"Content-Disposition": f"attachment; filename={filename}"})
+
+# heavy admin work (migrations) runs here instead of inside the request
+JOBS = JobRunner(JobStore(os.path.join(BASE_DIR, "instance", "jobs.db")))
+
 @app.route('/admin/excel-manager', methods=['GET', 'POST'])
 @admin_required
 def admin_excel_manager():
-    message = ""
+    message = error = ""
     if request.method == "POST":
         file = request.files.get("file")
+        catalog = JOURNAL_CATALOG if request.form.get("target") == "journals" else AUTHOR_CATALOG
         if file:
-            save_path = os.path.join("static", "uploads", "Array Research Author Positions (2).xlsx")
-            file.save(save_path)
-            message = "Excel updated successfully!"
-    return render_template('admin/excel_manager.html', message=message)
+            # write next to the workbook and rename over it, so a worker
+            # re-parsing right now never opens a half-written file
+            tmp_path = f"{catalog.path}.{os.getpid()}.upload"
+            file.save(tmp_path)
+            parsed = parse_upload(catalog, tmp_path)
+            if parsed is None:
+                os.remove(tmp_path)
+                error = "The file could not be read as a workbook of this kind; nothing was changed."
+            else:
+                os.replace(tmp_path, catalog.path)
+                # this worker reloads now, the others notice the new mtime
+                catalog.reload_async()
+                message = "Excel updated successfully!"
+                if catalog is AUTHOR_CATALOG:
+                    from author_migrate_from_excel import migrate_excel_to_db
+                    job, created = JOBS.submit("author-migration", migrate_excel_to_db, sheets=parsed)
+                    if created:
+                        message += f" Syncing the database (job #{job['id']})."
+                    else:
+                        # the running job syncs the sheets it was given, not this upload
+                        error = (f"A database migration (job #{job['id']}) is already running, so this "
+                                 "upload was not synced. Run the migration again once it finishes.")
+    return render_template('admin/excel_manager.html', message=message, error=error)
+
+
+def parse_upload(catalog, path):
+    """The uploaded workbook parsed like the live one, or None if it is unreadable or empty."""
+    try:
+        if catalog is JOURNAL_CATALOG:
+            parsed = load_journals_from_excel(path)
+            ok = any(parsed.values())
+        else:
+            parsed = load_author_positions_from_excel(path)
+            ok = any(sheet.get("tables") for sheet in parsed)
+    except Exception as e:
+        print("Rejected workbook upload:", e)
+        return None
+    return parsed if ok else None
 
-@app.route("/admin/run-migration")
+@app.route("/admin/run-migration", methods=["GET", "POST"])
 def run_migration():
     if not session.get("admin"):
         return "Unauthorized", 401
 
     from author_migrate_from_excel import migrate_excel_to_db
-    migrate_excel_to_db()
-    return "Migration Completed!"
+    mode = request.args.get("mode") if request.args.get("mode") in ("replace", "bulk") else "diff"
+    # one author migration at a time; a second request gets the running job back
+    job, created = JOBS.submit("author-migration", migrate_excel_to_db, mode=mode)
+    return jsonify({
+        'job': job,
+        'created': created,
+        'status_url': url_for('admin_job_status', job_id=job['id']),
+    }), 202
+
+@app.route("/admin/jobs/<int:job_id>")
+def admin_job_status(job_id):
+    if not session.get("admin"):
+        return "Unauthorized", 401
+
+    job = JOBS.store.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job)
 
 
 
 @app.route('/admin/author-positions')
 @admin_required
 def admin_author_positions():
-    data = load_author_positions_from_excel()
+    data = AUTHOR_CATALOG.current()
     return render_template('admin/author_positions.html', data=data)
 
 
@@ -933,24 +1328,75 @@ def admin_logout():
 def admin_dashboard():
     return render_template("admin/dashboard.html")
 
+# admin pages read this local copy of the sheet instead of downloading it
+SHEET_MIRROR = SheetMirror(os.getenv("SHEET_MIRROR_DB", os.path.join(BASE_DIR, "instance", "sheet_mirror.db")), SHEETS)
+
+
+@app.cli.command("sync-sheet")
+@click.option("--full", is_flag=True, help="Re-download the whole sheet (after edits made in Sheets).")
+def sync_sheet(full):
+    """Refresh the local mirror of the Google Sheet."""
+    n = SHEET_MIRROR.sync(full=full)
+    print(f"Sheet mirror: {n} rows fetched")
+
+
+SHEET_PAGE_SIZE = 50
+
+
+def sheet_page():
+    """One page of the sheet mirror for the current request's ?page=&per_page=&sort=&dir=&q=."""
+    args = request.args
+    pager = {
+        'page': max(1, args.get('page', default=1, type=int)),
+        'per_page': max(1, min(args.get('per_page', default=SHEET_PAGE_SIZE, type=int), MAX_PER_PAGE)),
+        'sort': args.get('sort', ''),
+        'dir': 'desc' if args.get('dir') == 'desc' else 'asc',
+        'q': args.get('q', '').strip(),
+    }
+    SHEET_MIRROR.ensure_fresh()
+    records, pager['total'] = SHEET_MIRROR.page(
+        page=pager['page'],
+        per_page=pager['per_page'],
+        sort=pager['sort'],
+        descending=pager['dir'] == 'desc',
+        query=pager['q'] or None,
+    )
+    pager['columns'] = SHEET_MIRROR.header()
+    pager['pages'] = max(1, -(-pager['total'] // pager['per_page']))
+    return records, pager
+
+
 @app.route("/admin/bookings")
 @admin_required
 def admin_bookings():
     try:
-        data = get_gsheet().get_all_records()
-        return render_template("admin/bookings.html", bookings=data)
+        data, pager = sheet_page()
     except Exception as e:
         return f"Error loading Google Sheet: {e}"
+    counts = BOOKINGS.counts()
+    waiting = counts.get('pending', 0) + counts.get('sending', 0)
+    return render_template("admin/bookings.html", bookings=data, pager=pager, waiting=waiting)
 
 @app.route("/admin/journals")
 @admin_required
 def admin_journals():
     try:
-        journals = get_gsheet().get_all_records()
+        journals, pager = sheet_page()
     except Exception as e:
         print("Error loading journals:", e)
-        journals = []
-    return render_template("admin/journals.html", journals=journals)
+        journals, pager = [], None
+    return render_template("admin/journals.html", journals=journals, pager=pager)
+
+@app.route("/admin/sheet/sync", methods=["POST"])
+@admin_required
+def admin_sheet_sync():
+    try:
+        n = SHEET_MIRROR.sync(full=request.form.get("full") == "1")
+        flash(f"Synced {n} rows from Google Sheets.", "success")
+    except Exception as e:
+        print("Sheet mirror sync failed:", e)
+        flash("Could not reach Google Sheets, showing the last synced copy.", "danger")
+    return redirect(request.referrer or url_for("admin_bookings"))
 
 @app.route("/admin/journals/upload", methods=["POST"])
 @admin_required
@@ -965,7 +1411,9 @@ def upload_journal():
     pdf_path = os.path.join(upload_folder, file.filename)
     file.save(pdf_path)
     sheet = get_gsheet()
-    sheet.append_row([title, file.filename, datetime.now().strftime("%d-%m-%Y %H:%M:%S")])
+    with REGISTRY.timed("external_call_duration_seconds", service="sheets", operation="append_row"):
+        sheet.append_row([title, file.filename, datetime.now().strftime("%d-%m-%Y %H:%M:%S")])
+    SHEET_MIRROR.sync_async()
     flash("✅ Journal uploaded successfully!", "success")
     return redirect(url_for("admin_journals"))
 
@@ -974,6 +1422,23 @@ def upload_journal():
 # --------------------------------------------------------
 
 
+# bookings are stored locally first and copied to the sheet in batches
+BOOKINGS = BookingLedger(os.getenv("BOOKINGS_DB", os.path.join(BASE_DIR, "instance", "bookings.db")))
+BOOKING_REPLICATOR = Replicator(BOOKINGS, SHEETS, on_synced=lambda: SHEET_MIRROR.sync_async())
+
+
+@app.cli.command("sync-bookings")
+def sync_bookings():
+    """Push every due pending booking to the Google Sheet now."""
+    total = 0
+    while True:
+        n = BOOKING_REPLICATOR.flush()
+        if not n:
+            break
+        total += n
+    print(f"Bookings synced: {total}; ledger: {BOOKINGS.counts()}")
+
+
 @app.route('/api/book-service', methods=['POST'])
 def book_service_api():
     try:
@@ -981,13 +1446,33 @@ def book_service_api():
         name, email, service, details = data.get('name'), data.get('email'), data.get('service'), data.get('details')
         if not all([name, email, service]):
             return jsonify({'success': False, 'message': 'Missing required fields'}), 400
-        sheet = get_gsheet()
-        sheet.append_row([name, email, service, details, datetime.now().strftime("%d-%m-%Y %H:%M:%S")])
+        # acknowledged once it is in the local ledger; the sheet catches up
+        BOOKINGS.add(name, email, service, details)
+        BOOKING_REPLICATOR.wake()
         return jsonify({'success': True, 'message': 'Your booking has been received!'}), 200
     except Exception as e:
-        print("🔥 GOOGLE SHEET ERROR:", e)
+        print("🔥 BOOKING LEDGER ERROR:", e)
         return jsonify({'success': False, 'message': 'Error while saving booking!'}), 500
 
+OUTBOX = MailOutbox(os.getenv("MAIL_OUTBOX_DB", os.path.join(BASE_DIR, "instance", "outbox.db")))
+MAIL_SENDER = MailSender(app, mail, OUTBOX)
+
+
+@app.before_request
+def start_queue_workers():
+    # once per worker process: rows left pending, backed off or stuck
+    # mid-send by a previous worker are retried without waiting for new ones
+    BOOKING_REPLICATOR.start()
+    MAIL_SENDER.start()
+
+
+@app.cli.command("send-mail")
+def send_mail():
+    """Deliver every due message in the mail outbox now."""
+    sent = MAIL_SENDER.drain()
+    print(f"Mail sent: {sent}; outbox: {OUTBOX.counts()}")
+
+
 @app.route('/api/contact', methods=['POST'])
 def submit_contact():
     try:
@@ -995,10 +1480,12 @@ def submit_contact():
         name, email, phone, message = data.get('name'), data.get('email'), data.get('phone'), data.get('message')
         if not all([name, email, message]):
             return jsonify({'success': False, 'message': 'Please fill all required fields'}), 400
-        msg = Message(subject=f'New Contact Form Submission from {name}',
-                      recipients=['info@arrayresearch.co.in'],
-                      body=f"Name: {name}\nEmail: {email}\nPhone: {phone}\n\nMessage:\n{message}")
-        mail.send(msg)
+        # queued locally; MAIL_SENDER delivers it over a shared SMTP connection
+        OUTBOX.add(subject=f'New Contact Form Submission from {name}',
+                   recipients=['info@arrayresearch.co.in'],
+                   body=f"Name: {name}\nEmail: {email}\nPhone: {phone}\n\nMessage:\n{message}",
+                   sender=app.config['MAIL_DEFAULT_SENDER'])
+        MAIL_SENDER.wake()
         return jsonify({'success': True, 'message': 'Thank you for contacting us! We will get back soon.'})
     except Exception as e:
         print(f"Error: {e}")
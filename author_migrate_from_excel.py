@@ -1,44 +1,327 @@
+from collections import defaultdict
+
+from sqlalchemy.orm import selectinload
+
 from app import app, db
-from models import AuthorSheet, AuthorTable, AuthorPosition
+from models import AuthorSheet, AuthorTable, AuthorPosition, AuthorSheetView, PositionStatus
 from app import load_author_positions_from_excel
+from author_read_model import write_read_model
 
-def migrate_excel_to_db():
-    with app.app_context():
+# ids per DELETE ... WHERE id IN (...) statement
+DELETE_CHUNK = 500
 
-        # Load excel data
-        sheets = load_author_positions_from_excel()
+# rows per executemany() batch in the bulk loader
+INSERT_CHUNK = 50_000
 
-        # Clear old data
-        AuthorPosition.query.delete()
-        AuthorTable.query.delete()
-        AuthorSheet.query.delete()
-        db.session.commit()
+AUTHOR_DATA_TABLES = ("author_position", "author_table", "author_sheet")
 
-        # Insert new structured data
-        for sheet_data in sheets:
-            sheet = AuthorSheet(
-                name=sheet_data.get("sheet", ""),
-                info=sheet_data.get("info", "")
-            )
+
+def empty_summary():
+    return {
+        kind: {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        for kind in ("sheets", "tables", "positions")
+    }
+
+
+def summary_text(summary):
+    return "; ".join(
+        f"{kind}: " + ", ".join(f"{n} {action}" for action, n in counts.items())
+        for kind, counts in summary.items()
+    )
+
+
+def keyed(items, key):
+    """
+    {(natural key, occurrence): item}. The occurrence number keeps repeated
+    keys (two tables with the same title, an empty title, ...) apart.
+    """
+    seen = defaultdict(int)
+    out = {}
+    for item in items:
+        k = key(item)
+        out[(k, seen[k])] = item
+        seen[k] += 1
+    return out
+
+
+def delete_ids(model, ids):
+    ids = list(ids)
+    for i in range(0, len(ids), DELETE_CHUNK):
+        model.query.filter(model.id.in_(ids[i:i + DELETE_CHUNK])).delete(synchronize_session=False)
+
+
+def no_progress(done, total, message=""):
+    pass
+
+
+def table_count(sheets):
+    return sum(len(sheet_data.get("tables", [])) for sheet_data in sheets)
+
+
+def replace_author_data(sheets, progress=no_progress):
+    """Old behaviour: drop every author row and insert the workbook again."""
+    summary = empty_summary()
+    total, done = table_count(sheets), 0
+    summary["positions"]["deleted"] = AuthorPosition.query.delete()
+    summary["tables"]["deleted"] = AuthorTable.query.delete()
+    summary["sheets"]["deleted"] = AuthorSheet.query.delete()
+
+    for sheet_data in sheets:
+        sheet = AuthorSheet(
+            name=sheet_data.get("sheet", ""),
+            info=sheet_data.get("info", "")
+        )
+        db.session.add(sheet)
+        summary["sheets"]["inserted"] += 1
+
+        for table_data in sheet_data.get("tables", []):
+            table = AuthorTable(sheet=sheet, title=table_data.get("title", ""))
+            db.session.add(table)
+            summary["tables"]["inserted"] += 1
+            done += 1
+            progress(done, total, f"{sheet.name} / {table.title}")
+
+            for author in table_data.get("authors", []):
+                db.session.add(AuthorPosition(
+                    table=table,
+                    level=author.get("level", ""),
+                    amount=author.get("price", ""),
+                    amount_value=author.get("price_value"),
+                    status=author.get("status", ""),
+                    status_code=PositionStatus.from_text(author.get("status")),
+                ))
+                summary["positions"]["inserted"] += 1
+
+    return summary
+
+
+def diff_author_data(sheets, progress=no_progress):
+    """
+    Match sheets, tables and positions on their natural keys (sheet name,
+    table title, author level) and only insert / update / delete rows that
+    differ from the workbook.
+    """
+    summary = empty_summary()
+    stale_sheets, stale_tables, stale_positions = [], [], []
+    total, done = table_count(sheets), 0
+
+    existing = AuthorSheet.query.options(
+        selectinload(AuthorSheet.tables).selectinload(AuthorTable.positions)
+    ).order_by(AuthorSheet.id).all()
+    old_sheets = keyed(existing, lambda s: s.name)
+
+    for key, sheet_data in keyed(sheets, lambda s: s.get("sheet", "")).items():
+        sheet = old_sheets.pop(key, None)
+        info = sheet_data.get("info", "")
+        if sheet is None:
+            sheet = AuthorSheet(name=key[0], info=info)
             db.session.add(sheet)
-            db.session.flush()
+            summary["sheets"]["inserted"] += 1
+        elif sheet.info != info:
+            sheet.info = info
+            summary["sheets"]["updated"] += 1
+        else:
+            summary["sheets"]["unchanged"] += 1
 
-            for table_data in sheet_data.get("tables", []):
-                table = AuthorTable(
-                    sheet_id=sheet.id,
-                    title=table_data.get("title", "")
-                )
+        old_tables = keyed(list(sheet.tables), lambda t: t.title)
+        for tkey, table_data in keyed(sheet_data.get("tables", []), lambda t: t.get("title", "")).items():
+            table = old_tables.pop(tkey, None)
+            if table is None:
+                table = AuthorTable(sheet=sheet, title=tkey[0])
                 db.session.add(table)
-                db.session.flush()
+                summary["tables"]["inserted"] += 1
+            else:
+                summary["tables"]["unchanged"] += 1
+            done += 1
+            progress(done, total, f"{key[0]} / {tkey[0]}")
+
+            old_positions = keyed(list(table.positions), lambda p: p.level)
+            for pkey, author in keyed(table_data.get("authors", []), lambda a: a.get("level", "")).items():
+                pos = old_positions.pop(pkey, None)
+                values = {
+                    "amount": author.get("price", ""),
+                    "amount_value": author.get("price_value"),
+                    "status": author.get("status", ""),
+                    "status_code": PositionStatus.from_text(author.get("status")),
+                }
+                if pos is None:
+                    db.session.add(AuthorPosition(table=table, level=pkey[0], **values))
+                    summary["positions"]["inserted"] += 1
+                elif any(getattr(pos, k) != v for k, v in values.items()):
+                    for k, v in values.items():
+                        setattr(pos, k, v)
+                    summary["positions"]["updated"] += 1
+                else:
+                    summary["positions"]["unchanged"] += 1
+
+            stale_positions.extend(p.id for p in old_positions.values())
+
+        for table in old_tables.values():
+            stale_tables.append(table.id)
+            stale_positions.extend(p.id for p in table.positions)
+
+    for sheet in old_sheets.values():
+        stale_sheets.append(sheet.id)
+        for table in sheet.tables:
+            stale_tables.append(table.id)
+            stale_positions.extend(p.id for p in table.positions)
 
+    db.session.flush()
+    delete_ids(AuthorPosition, stale_positions)
+    delete_ids(AuthorTable, stale_tables)
+    delete_ids(AuthorSheet, stale_sheets)
+    summary["positions"]["deleted"] = len(stale_positions)
+    summary["tables"]["deleted"] = len(stale_tables)
+    summary["sheets"]["deleted"] = len(stale_sheets)
+
+    return summary
+
+
+def sqlite_secondary_indexes(conn):
+    """(name, CREATE INDEX sql) of the explicit indexes on the author tables."""
+    placeholders = ", ".join("?" * len(AUTHOR_DATA_TABLES))
+    return conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL "
+        f"AND tbl_name IN ({placeholders})",
+        AUTHOR_DATA_TABLES,
+    ).fetchall()
+
+
+def insert_chunked(conn, table, rows):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == INSERT_CHUNK:
+            conn.execute(table.insert(), batch)
+            batch = []
+    if batch:
+        conn.execute(table.insert(), batch)
+
+
+def bulk_load_author_data(sheets, progress=no_progress):
+    """
+    Full reload without the ORM unit of work: ids are assigned up front and
+    rows go in through executemany() core inserts. On SQLite the load runs
+    in WAL mode with synchronous=OFF and the secondary indexes are dropped
+    first and rebuilt once at the end.
+    """
+    summary = empty_summary()
+    counts = {"sheets": 0, "tables": 0, "positions": 0}
+    total = table_count(sheets)
+
+    def sheet_rows():
+        for sheet_id, sheet_data in enumerate(sheets, start=1):
+            counts["sheets"] += 1
+            yield {"id": sheet_id, "name": sheet_data.get("sheet", ""), "info": sheet_data.get("info", "")}
+
+    def table_rows():
+        table_id = 0
+        for sheet_id, sheet_data in enumerate(sheets, start=1):
+            for table_data in sheet_data.get("tables", []):
+                table_id += 1
+                counts["tables"] += 1
+                yield {"id": table_id, "sheet_id": sheet_id, "title": table_data.get("title", "")}
+
+    def position_rows():
+        table_id = position_id = 0
+        for sheet_data in sheets:
+            for table_data in sheet_data.get("tables", []):
+                table_id += 1
+                progress(table_id, total, f"{sheet_data.get('sheet', '')} / {table_data.get('title', '')}")
                 for author in table_data.get("authors", []):
-                    pos = AuthorPosition(
-                        table_id=table.id,
-                        level=author.get("level", ""),
-                        amount=author.get("price", ""),
-                        status=author.get("status", "")
-                    )
-                    db.session.add(pos)
+                    position_id += 1
+                    counts["positions"] += 1
+                    yield {
+                        "id": position_id,
+                        "table_id": table_id,
+                        "level": author.get("level", ""),
+                        "amount": author.get("price", ""),
+                        "amount_value": author.get("price_value"),
+                        "status": author.get("status", ""),
+                        "status_code": PositionStatus.from_text(author.get("status")),
+                    }
+
+    engine = db.engine
+    is_sqlite = engine.dialect.name == "sqlite"
+
+    with engine.connect() as conn:
+        if is_sqlite:
+            old_journal = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+            old_sync = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+            conn.exec_driver_sql("PRAGMA journal_mode=WAL")
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+            conn.commit()
+
+        try:
+            with conn.begin():
+                indexes = sqlite_secondary_indexes(conn) if is_sqlite else []
+                for name, _ in indexes:
+                    conn.exec_driver_sql(f'DROP INDEX "{name}"')
+
+                for kind, name in zip(("positions", "tables", "sheets"), AUTHOR_DATA_TABLES):
+                    summary[kind]["deleted"] = conn.exec_driver_sql(f"DELETE FROM {name}").rowcount
+
+                insert_chunked(conn, AuthorSheet.__table__, sheet_rows())
+                insert_chunked(conn, AuthorTable.__table__, table_rows())
+                insert_chunked(conn, AuthorPosition.__table__, position_rows())
+
+                for _, sql in indexes:
+                    conn.exec_driver_sql(sql)
+        finally:
+            if is_sqlite:
+                conn.exec_driver_sql(f"PRAGMA synchronous={old_sync}")
+                if old_journal.lower() != "wal":
+                    conn.exec_driver_sql(f"PRAGMA journal_mode={old_journal}")
+                conn.commit()
+
+    for kind, n in counts.items():
+        summary[kind]["inserted"] = n
+    return summary
+
+
+def has_changes(summary):
+    return any(
+        counts[action]
+        for counts in summary.values()
+        for action in ("inserted", "updated", "deleted")
+    )
+
+
+def migrate_excel_to_db(sheets=None, mode="diff", progress=no_progress, allow_empty=False):
+    """
+    Sync the author tables with the workbook in a single transaction.
+
+    mode="diff" (default) touches only what changed; mode="replace"
+    rewrites everything through the ORM; mode="bulk" is the fast full
+    reload (see bulk_load_author_data). `progress(done, total, message)`
+    is called once per table. Returns the per-level change summary.
+
+    A workbook without any author table (missing, unreadable, wrong file)
+    would delete every author row, so it raises ValueError unless
+    `allow_empty` is set.
+    """
+    with app.app_context():
+
+        # Load excel data
+        if sheets is None:
+            progress(0, 0, "Reading workbook")
+            sheets = load_author_positions_from_excel()
+
+        if not table_count(sheets) and not allow_empty:
+            raise ValueError("author workbook has no tables; refusing to empty the author tables")
+
+        if mode == "replace":
+            summary = replace_author_data(sheets, progress)
+        elif mode == "bulk":
+            summary = bulk_load_author_data(sheets, progress)
+        else:
+            summary = diff_author_data(sheets, progress)
+
+        # /authors renders from this; swapped in by the same commit
+        if has_changes(summary) or AuthorSheetView.query.first() is None:
+            write_read_model(sheets)
 
         db.session.commit()
-        print("Migration Completed from Excel")
+        print("Migration Completed from Excel:", summary_text(summary))
+        return summary
@@ -0,0 +1,114 @@
+import json
+import threading
+
+from sqlalchemy.orm import selectinload
+
+from extensions import db
+from models import AuthorSheet, AuthorSheetView, AuthorTable
+
+
+def sheet_payload(sheet_data):
+    """Parsed author sheet (load_author_positions_from_excel) → read model dict."""
+    return {
+        "name": sheet_data.get("sheet", ""),
+        "info": sheet_data.get("info", ""),
+        "tables": [
+            {
+                "title": table.get("title", ""),
+                "positions": [
+                    {
+                        "level": author.get("level", ""),
+                        "amount": author.get("price", ""),
+                        "amount_value": author.get("price_value"),
+                        "status": author.get("status", ""),
+                    }
+                    for author in table.get("authors", [])
+                ],
+            }
+            for table in sheet_data.get("tables", [])
+        ],
+    }
+
+
+def write_read_model(sheets):
+    """
+    Add the read model rows for a new version and drop the older ones.
+    Runs inside the caller's transaction, so readers switch over on commit.
+    """
+    version = (db.session.query(db.func.max(AuthorSheetView.version)).scalar() or 0) + 1
+    db.session.add_all([
+        AuthorSheetView(
+            version=version,
+            position=i,
+            name=sheet_data.get("sheet", ""),
+            payload=json.dumps(sheet_payload(sheet_data)),
+        )
+        for i, sheet_data in enumerate(sheets)
+    ])
+    AuthorSheetView.query.filter(AuthorSheetView.version < version).delete()
+    return version
+
+
+def sheets_from_tables():
+    """Fallback for databases migrated before the read model existed."""
+    sheets = AuthorSheet.query.options(
+        selectinload(AuthorSheet.tables).selectinload(AuthorTable.positions)
+    ).order_by(AuthorSheet.id).all()
+    return [
+        {
+            "name": sheet.name,
+            "info": sheet.info,
+            "tables": [
+                {
+                    "title": table.title,
+                    "positions": [
+                        {
+                            "level": pos.level,
+                            "amount": pos.amount,
+                            "amount_value": pos.amount_value,
+                            "status": pos.status,
+                        }
+                        for pos in table.positions
+                    ],
+                }
+                for table in sheet.tables
+            ],
+        }
+        for sheet in sheets
+    ]
+
+
+class AuthorReadModel:
+    """
+    In-process copy of the latest author_sheet_view version.
+
+    Each call costs one MAX(version) query; the payload rows are only
+    re-read and decoded after a migration bumped the version.
+    """
+
+    def __init__(self):
+        self._version = None
+        self._sheets = []
+        self._lock = threading.Lock()
+
+    def sheets(self):
+        version = db.session.query(db.func.max(AuthorSheetView.version)).scalar()
+        if version is None:
+            return sheets_from_tables()
+        if version == self._version:
+            return self._sheets
+
+        with self._lock:
+            if version != self._version:
+                # one statement, so a migration committing in between can't
+                # leave us holding a version whose rows were just deleted
+                latest = db.session.query(db.func.max(AuthorSheetView.version)).scalar_subquery()
+                rows = (
+                    AuthorSheetView.query.filter(AuthorSheetView.version == latest)
+                    .order_by(AuthorSheetView.position)
+                    .all()
+                )
+                if rows:
+                    self._sheets = [json.loads(row.payload) for row in rows]
+                    self._version = rows[0].version
+        return self._sheets
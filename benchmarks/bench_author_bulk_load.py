@@ -0,0 +1,79 @@
+"""
+Full author reload throughput: ORM unit of work vs the bulk loader.
+
+Generates synthetic parsed sheets and loads them into a throwaway SQLite
+database with migrate_excel_to_db(mode="replace") and mode="bulk",
+reporting author_position rows/sec for each. The ORM path holds every
+object in the session, so it is measured on --old-rows (default 100k)
+and reported as a rate.
+
+    python benchmarks/bench_author_bulk_load.py [--rows 1000000] [--old-rows 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(TMP, "bulk.db")
+
+from app import app  # noqa: E402
+from author_migrate_from_excel import migrate_excel_to_db  # noqa: E402
+from schema_migrations import migrate_schema  # noqa: E402
+
+
+def synthetic_sheets(rows, sheets=20, authors_per_table=10):
+    tables = max(1, rows // authors_per_table)
+    per_sheet = -(-tables // sheets)
+    out = []
+    made = 0
+    for s in range(sheets):
+        sheet_tables = []
+        for t in range(per_sheet):
+            if made >= tables:
+                break
+            made += 1
+            sheet_tables.append({
+                "title": f"{t + 1}) Synthetic Article {s + 1}.{t + 1}",
+                "authors": [
+                    {"level": f"Author {a + 1}", "price": f"{10 - a * 0.5}K",
+                     "price_value": (10 - a * 0.5) * 1000, "status": "Available"}
+                    for a in range(authors_per_table)
+                ],
+            })
+        out.append({"sheet": f"Sheet {s + 1}", "info": "Synthetic", "tables": sheet_tables})
+    return out
+
+
+def run(mode, rows):
+    sheets = synthetic_sheets(rows)
+    start = time.perf_counter()
+    summary = migrate_excel_to_db(sheets, mode=mode)
+    elapsed = time.perf_counter() - start
+    loaded = summary["positions"]["inserted"]
+    return loaded, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--old-rows", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        migrate_schema()
+
+    results = [("replace (ORM)", *run("replace", args.old_rows)),
+               ("bulk", *run("bulk", args.rows))]
+
+    print(f"\n{'path':>14} {'rows':>9} {'seconds':>8} {'rows/sec':>10}")
+    for name, rows, seconds in results:
+        print(f"{name:>14} {rows:>9} {seconds:>8.1f} {rows / seconds:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Backwards-scan vs single-pass author sheet parsing.
+
+Builds synthetic author sheets with N tables, checks both parsers return
+identical output and prints the timings, plus a parity check against the
+real workbook. Two layouts are timed:
+
+  titled    heading row, header row, author rows, blank row
+  untitled  no heading and "Author position N" labels, so every backwards
+            scan runs all the way to row 0 (the quadratic case)
+
+    python benchmarks/bench_author_parser.py [--tables 250 500 1000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import author_sheet_rows, parse_author_sheet_frame_rescan, parse_author_sheet_rows  # noqa: E402
+
+AUTHOR_EXCEL_PATH = os.path.join(ROOT, "static", "uploads", "Array Research Author Positions (2).xlsx")
+
+
+def synthetic_sheet(tables, titled=True, authors_per_table=6):
+    rows = [["Available author positions for the upcoming issue", None, None, None]]
+    for t in range(tables):
+        if titled:
+            rows.append([None, f"{t + 1}) Synthetic Review Article Number {t + 1}", None, None])
+        rows.append(["Author Position", "Amount", "Status", None])
+        for a in range(authors_per_table):
+            label = f"Author {a + 1}" if titled else f"Author position {a + 1}"
+            status = "Booked" if (t + a) % 3 == 0 else "Available"
+            rows.append([label, f"- {10 - a * 0.5}K", status, None])
+        rows.append([None, None, None, None])
+    return pd.DataFrame(rows)
+
+
+def single_pass(sheet_name, df):
+    return parse_author_sheet_rows(sheet_name, author_sheet_rows(df))
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, nargs="+", default=[250, 500, 1000])
+    args = parser.parse_args()
+
+    # a date typed into the status column leaves NaT in the blank cells
+    dated = synthetic_sheet(3)
+    dated[3] = pd.Series([pd.Timestamp("2024-01-01")] + [None] * (len(dated) - 1), dtype="datetime64[ns]")
+    if parse_author_sheet_frame_rescan("dated", dated) != single_pass("dated", dated):
+        raise SystemExit("output mismatch on a sheet with a datetime column")
+
+    if not os.path.exists(AUTHOR_EXCEL_PATH):
+        raise SystemExit(f"author workbook not found: {AUTHOR_EXCEL_PATH}")
+    sheets = pd.read_excel(AUTHOR_EXCEL_PATH, sheet_name=None, header=None)
+    for name, df in sheets.items():
+        if parse_author_sheet_frame_rescan(name, df) != single_pass(name, df):
+            raise SystemExit(f"output mismatch on sheet {name!r}")
+    print(f"parity OK on {len(sheets)} sheets of the author workbook\n")
+
+    print(f"{'layout':>9} {'tables':>7} {'rows':>7} {'rescan s':>9} {'1-pass s':>9} {'speedup':>8}")
+    for titled in (True, False):
+        layout = "titled" if titled else "untitled"
+        for n in args.tables:
+            df = synthetic_sheet(n, titled=titled)
+            old_s, old = timed(parse_author_sheet_frame_rescan, "synthetic", df)
+            new_s, new = timed(single_pass, "synthetic", df)
+            if old != new:
+                raise SystemExit(f"output mismatch at {n} {layout} tables")
+            print(f"{layout:>9} {n:>7} {len(df):>7} {old_s:>9.3f} {new_s:>9.3f} {old_s / new_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Positions of one sheet with one status (models.positions_query): query plan
+and timing with the indexes added by schema migrations 3 and 4, and with
+them dropped.
+
+Loads synthetic author sheets into a throwaway SQLite database migrated
+from scratch. Exits non-zero if EXPLAIN QUERY PLAN shows a table scan
+instead of index lookups.
+
+    python benchmarks/bench_author_positions_filter.py [--tables 1000 10000] [--repeat 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(TMP, "authors.db")
+
+from app import app, db  # noqa: E402
+from author_migrate_from_excel import migrate_excel_to_db  # noqa: E402
+from models import PositionStatus, positions_query  # noqa: E402
+from schema_migrations import migrate_schema  # noqa: E402
+
+SHEETS = 20
+INDEXES = ("ix_author_table_sheet_id", "ix_author_position_table_id_status_code")
+
+
+def synthetic_sheets(tables, authors_per_table=6, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "sheet": f"Sheet {s + 1}",
+            "info": "Synthetic author positions",
+            "tables": [
+                {
+                    "title": f"{t + 1}) Synthetic Article {s + 1}.{t + 1}",
+                    "authors": [
+                        {"level": f"Author {a + 1}", "price": f"{10 - a}K", "price_value": (10 - a) * 1000.0,
+                         "status": rng.choice(["Available", "BOOKED ", "Booked"])}
+                        for a in range(authors_per_table)
+                    ],
+                }
+                for t in range(tables // SHEETS)
+            ],
+        }
+        for s in range(SHEETS)
+    ]
+
+
+def query_plan(sheet_id, status):
+    query = positions_query(sheet_id, status)
+    compiled = query.statement.compile(db.engine)
+    params = [compiled.params[name] for name in compiled.positiontup]
+    rows = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), tuple(params))
+    return [row[3] for row in rows]
+
+
+def time_query(repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        positions_query(i % SHEETS + 1, PositionStatus.AVAILABLE).all()
+        db.session.expunge_all()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    with app.app_context():
+        migrate_schema()
+
+    failed = False
+    for n in args.tables:
+        migrate_excel_to_db(synthetic_sheets(n), mode="bulk")
+        with app.app_context():
+            plan = query_plan(1, PositionStatus.AVAILABLE)
+            indexed = time_query(args.repeat)
+
+            conn = db.session.connection()
+            saved = [conn.exec_driver_sql("SELECT sql FROM sqlite_master WHERE name = ?", (name,)).scalar()
+                     for name in INDEXES]
+            for name in INDEXES:
+                conn.exec_driver_sql(f"DROP INDEX {name}")
+            scan = time_query(args.repeat)
+            for sql in saved:
+                conn.exec_driver_sql(sql)
+            db.session.commit()
+
+        print(f"{n} tables, {n * 6} positions")
+        for line in plan:
+            print("   ", line)
+        print(f"    indexed {indexed * 1000:7.2f}ms   without indexes {scan * 1000:7.2f}ms   "
+              f"x{scan / indexed:.1f}")
+        failed |= any(line.startswith("SCAN") for line in plan)
+
+    if failed:
+        raise SystemExit("filtering positions by sheet and status scans a table")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+SQL queries issued by /authors: lazy ORM walk vs the denormalized read model.
+
+Loads synthetic author sheets with N tables into a throwaway SQLite
+database, then counts the statements each rendering path executes. Exits
+non-zero if the read model path stops being constant.
+
+    python benchmarks/bench_authors_queries.py [--tables 10 100 500]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(TMP, "authors.db")
+
+from flask import render_template  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+from app import app, db  # noqa: E402
+from author_migrate_from_excel import migrate_excel_to_db  # noqa: E402
+from models import AuthorSheet  # noqa: E402
+from schema_migrations import migrate_schema  # noqa: E402
+
+# the read model path must never need more than this, whatever the size
+MAX_READ_MODEL_QUERIES = 2
+
+
+def synthetic_sheets(tables, sheets=5, authors_per_table=6):
+    out = []
+    for s in range(sheets):
+        out.append({
+            "sheet": f"Sheet {s + 1}",
+            "info": "Synthetic author positions",
+            "tables": [
+                {
+                    "title": f"{t + 1}) Synthetic Article {s + 1}.{t + 1}",
+                    "authors": [
+                        {"level": f"Author {a + 1}", "price": f"{10 - a}K",
+                         "price_value": (10 - a) * 1000.0, "status": "Available"}
+                        for a in range(authors_per_table)
+                    ],
+                }
+                for t in range(tables // sheets)
+            ],
+        })
+    return out
+
+
+class QueryCounter:
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+def measure(render):
+    with app.test_request_context("/authors"):
+        with QueryCounter(db.engine) as counter:
+            start = time.perf_counter()
+            render()
+            elapsed = time.perf_counter() - start
+        db.session.remove()
+    return counter.count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 100, 500])
+    args = parser.parse_args()
+
+    with app.app_context():
+        migrate_schema()
+
+    def lazy_orm():
+        render_template("author_cards.html", sheets=AuthorSheet.query.all())
+
+    def read_model():
+        app.view_functions["authors_cards"]()
+
+    print(f"{'tables':>7} {'lazy queries':>13} {'lazy ms':>8} "
+          f"{'model cold':>11} {'model warm':>11} {'warm ms':>8}")
+    failed = False
+    for n in args.tables:
+        migrate_excel_to_db(synthetic_sheets(n))
+
+        lazy_q, lazy_s = measure(lazy_orm)
+        cold_q, _ = measure(read_model)
+        warm_q, warm_s = measure(read_model)
+        failed |= max(cold_q, warm_q) > MAX_READ_MODEL_QUERIES
+
+        print(f"{n:>7} {lazy_q:>13} {lazy_s * 1000:>8.1f} {cold_q:>11} {warm_q:>11} {warm_s * 1000:>8.1f}")
+
+    if failed:
+        raise SystemExit(f"read model used more than {MAX_READ_MODEL_QUERIES} queries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Blog content store with many posts: index build time and memory held by
+the index versus loading every post body up front (the old inline list),
+plus uncached/cached body reads.
+
+    python benchmarks/bench_blog_store.py [--posts 500] [--body-kb 20]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from blog_store import build_index, post_body, read_front_matter  # noqa: E402
+
+
+def write_posts(directory, n, body_kb):
+    paragraph = "<p>" + "Research writing and publication support. " * 20 + "</p>\n"
+    body = paragraph * max(1, body_kb * 1024 // len(paragraph))
+    for i in range(n):
+        with open(os.path.join(directory, f"post-{i:05d}.html"), "w", encoding="utf-8") as f:
+            f.write(f"---\ntitle: Post {i}\nauthor: Team\ndate: Dec {i % 28 + 1}, 2024\n"
+                    f"read_time: 3 min read\nimage: images/blogs/abstract.jpg\nexcerpt: Excerpt {i}\n---\n{body}")
+
+
+def load_everything(directory):
+    posts = []
+    for name in sorted(os.listdir(directory)):
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            meta = read_front_matter(f)
+            meta["content"] = f.read()
+        posts.append(meta)
+    return posts
+
+
+def measure(label, fn):
+    fn()  # warm the page cache and imports
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    # tracemalloc slows everything down, so memory is a separate run
+    tracemalloc.start()
+    result = fn()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<14} {elapsed * 1000:8.1f}ms  {held / 1e6:7.2f} MB held")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--posts", type=int, default=500)
+    parser.add_argument("--body-kb", type=int, default=20)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        write_posts(directory, args.posts, args.body_kb)
+        measure("load all", lambda: load_everything(directory))
+        index = measure("index only", lambda: build_index(directory))
+
+        post = index.posts[len(index.posts) // 2]
+        start = time.perf_counter()
+        post_body(post)
+        cold = time.perf_counter() - start
+        start = time.perf_counter()
+        for _ in range(1000):
+            post_body(post)
+        warm = (time.perf_counter() - start) / 1000
+        print(f"body read     cold {cold * 1000:.2f}ms  cached {warm * 1e6:.1f}µs")
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+A burst of bookings: synchronous append_row per request vs the local
+ledger + batched replicator.
+
+Runs against the in-memory LocalWorksheet with a simulated API round
+trip. Reports how long visitors wait for the acknowledgement, how long
+the sheet takes to catch up and how many Sheets API calls were made.
+--outage makes the sheet fail for the first few seconds to exercise the
+retry/backoff path; every booking must still arrive exactly once.
+
+    python benchmarks/bench_booking_burst.py [--bookings 1000] [--clients 16]
+        [--latency 0.05] [--outage 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(TMP, "users.db")
+os.environ["BOOKINGS_DB"] = os.path.join(TMP, "bookings.db")
+os.environ["SHEETS_BACKEND"] = "local"
+
+from app import app, SHEETS, BOOKINGS  # noqa: E402
+from sheets_client import LocalWorksheet  # noqa: E402
+
+
+class FlakyWorksheet(LocalWorksheet):
+    """LocalWorksheet that raises for the first `outage` seconds."""
+
+    def __init__(self, outage=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.fail_until = time.monotonic() + outage
+
+    def _round_trip(self):
+        super()._round_trip()
+        if time.monotonic() < self.fail_until:
+            raise ConnectionError("simulated Sheets outage")
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def burst(n, clients, send):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        send(i)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(one, range(n)))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, total, latencies, extra=""):
+    print(f"{label:<10} burst {total:7.2f}s  ack p50 {statistics.median(latencies) * 1000:7.1f}ms  "
+          f"p95 {percentile(latencies, 0.95) * 1000:7.1f}ms  {extra}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--bookings", type=int, default=1000)
+    parser.add_argument("--clients", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per Sheets API call")
+    parser.add_argument("--outage", type=float, default=0.0, help="seconds the sheet fails at first")
+    args = parser.parse_args()
+
+    # before: every request waits for its own append_row
+    direct = LocalWorksheet(latency=args.latency)
+    total, latencies = burst(
+        args.bookings, args.clients,
+        lambda i: direct.append_row([f"Visitor {i}", f"v{i}@example.com", "Editing", "", "now"]),
+    )
+    report("direct", total, latencies, f"api calls {direct.calls}")
+
+    # after: requests only write the ledger, the replicator batches
+    worksheet = FlakyWorksheet(outage=args.outage, latency=args.latency)
+    SHEETS._worksheet = worksheet
+    BOOKINGS.backoff_base = 0.5
+
+    client = app.test_client()
+
+    def post(i):
+        r = client.post("/api/book-service", json={
+            "name": f"Visitor {i}", "email": f"v{i}@example.com", "service": "Editing", "details": "",
+        })
+        assert r.status_code == 200, r.data
+
+    total, latencies = burst(args.bookings, args.clients, post)
+    report("ledger", total, latencies)
+
+    start = time.perf_counter()
+    while BOOKINGS.counts().get("synced", 0) < args.bookings:
+        if time.perf_counter() - start > 120:
+            raise SystemExit(f"replication stalled: {BOOKINGS.counts()}")
+        time.sleep(0.05)
+    synced_after = time.perf_counter() - start
+
+    rows = worksheet.get_all_records()
+    emails = [row["email"] for row in rows]
+    print(f"{'':<10} sheet caught up {synced_after:.2f}s after the burst, "
+          f"api calls {worksheet.calls - 1}, rows {len(rows)}")
+    if sorted(emails) != sorted(f"v{i}@example.com" for i in range(args.bookings)):
+        raise SystemExit("sheet rows do not match the bookings")
+
+
+if __name__ == "__main__":
+    main()
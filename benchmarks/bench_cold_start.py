@@ -0,0 +1,114 @@
+"""
+Cold start: `import app` plus the first GET / in a fresh interpreter, as a
+Vercel cold start or a gunicorn worker boot sees it.
+
+Each run is a new process, so nothing is shared between runs except the
+OS file cache. Exits non-zero when the median is over --budget-ms or when
+an integration the first request does not need (pandas, gspread, OAuth,
+openpyxl) was imported, so it can gate CI.
+
+    python benchmarks/bench_cold_start.py [--runs 5] [--budget-ms 1000] [--importtime]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# must not be imported before a request actually needs them
+DEFERRED_MODULES = ("pandas", "openpyxl", "gspread", "google_auth_oauthlib", "google.oauth2", "requests")
+
+CHILD = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+response = app.app.test_client().get("/")
+first = time.perf_counter()
+assert response.status_code == 200, response.status_code
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_response_ms": (first - imported) * 1000,
+    "total_ms": (first - start) * 1000,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+"""
+
+
+def run_once(env, importtime=False):
+    cmd = [sys.executable]
+    if importtime:
+        cmd += ["-X", "importtime"]
+    cmd += ["-c", CHILD % (DEFERRED_MODULES,)]
+    proc = subprocess.run(cmd, cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+    return json.loads(proc.stdout.strip().splitlines()[-1]), proc.stderr
+
+
+def slowest_imports(stderr, n=15):
+    """Modules imported directly by app.py, slowest first (from -X importtime)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # children are listed before their parent, two spaces deeper
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            rows.append((int(cumulative), name.strip()))
+        elif depth == 0:
+            if name.strip() == "app":
+                return sorted(rows, reverse=True)[:n]
+            rows = []
+    return []
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=1000.0)
+    parser.add_argument("--importtime", action="store_true", help="list the slowest top-level imports")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    try:
+        db_path = os.path.join(tmp, "users.db")
+        shutil.copy(os.path.join(ROOT, "instance", "users.db"), db_path)
+        env = dict(os.environ, DATABASE_URL="sqlite:///" + db_path, SHEETS_BACKEND="local")
+
+        run_once(env)  # warm the OS file cache and __pycache__
+        results = [run_once(env)[0] for _ in range(args.runs)]
+        importtime_log = run_once(env, importtime=True)[1] if args.importtime else ""
+    finally:
+        shutil.rmtree(tmp)
+
+    summary = {
+        key: round(statistics.median(r[key] for r in results), 1)
+        for key in ("import_ms", "first_response_ms", "total_ms")
+    }
+    loaded = sorted({m for r in results for m in r["loaded"]})
+    print(f"import {summary['import_ms']:7.1f}ms  first / {summary['first_response_ms']:6.1f}ms  "
+          f"total {summary['total_ms']:7.1f}ms  (median of {args.runs}, budget {args.budget_ms:.0f}ms)")
+
+    if args.importtime:
+        for cumulative, name in slowest_imports(importtime_log):
+            print(f"  {cumulative / 1000:7.1f}ms  {name}")
+
+    failures = []
+    if summary["total_ms"] > args.budget_ms:
+        failures.append(f"cold start {summary['total_ms']:.0f}ms is over the {args.budget_ms:.0f}ms budget")
+    if loaded:
+        failures.append(f"imported before they were needed: {', '.join(loaded)}")
+    for failure in failures:
+        print("FAIL:", failure)
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
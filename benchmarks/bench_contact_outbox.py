@@ -0,0 +1,103 @@
+"""
+/api/contact: inline mail.send() per submission vs the mail outbox.
+
+Both paths talk to local_smtp.LocalSMTPServer with a simulated
+handshake (--connect-delay) and per-command round trip
+(--command-delay). Reports acknowledgement latency, time until every
+message was delivered and how many SMTP connections were opened.
+
+    python benchmarks/bench_contact_outbox.py [--messages 200] [--clients 8]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from local_smtp import LocalSMTPServer  # noqa: E402
+
+
+def burst(n, clients, send):
+    latencies = []
+
+    def one(i):
+        start = time.perf_counter()
+        send(i)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(one, range(n)))
+    return time.perf_counter() - start, latencies
+
+
+def report(label, total, latencies, smtp, delivered_after):
+    p95 = sorted(latencies)[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<8} ack p50 {statistics.median(latencies) * 1000:7.1f}ms  p95 {p95 * 1000:7.1f}ms  "
+          f"all delivered {delivered_after:6.2f}s  smtp connections {smtp.connections}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--connect-delay", type=float, default=0.25)
+    parser.add_argument("--command-delay", type=float, default=0.01)
+    args = parser.parse_args()
+
+    smtp = LocalSMTPServer(connect_delay=args.connect_delay, command_delay=args.command_delay).start()
+    tmp = tempfile.mkdtemp()
+    os.environ.update({
+        "DATABASE_URL": "sqlite:///" + os.path.join(tmp, "users.db"),
+        "MAIL_OUTBOX_DB": os.path.join(tmp, "outbox.db"),
+        "MAIL_SERVER": "127.0.0.1",
+        "MAIL_PORT": str(smtp.port),
+        "MAIL_USE_TLS": "False",
+        "MAIL_USERNAME": "site@example.com",
+        "MAIL_PASSWORD": "",
+    })
+
+    from flask_mail import Message
+    from app import app, mail, OUTBOX
+
+    def form(i):
+        return {"name": f"Visitor {i}", "email": f"v{i}@example.com", "phone": "", "message": "Hello"}
+
+    # before: the request opens its own SMTP connection and waits for the server
+    def inline(i):
+        f = form(i)
+        with app.app_context():
+            mail.send(Message(subject=f"New Contact Form Submission from {f['name']}",
+                              recipients=["info@arrayresearch.co.in"], body=f["message"]))
+
+    total, latencies = burst(args.messages, args.clients, inline)
+    report("inline", total, latencies, smtp, total)
+
+    # after: the request only writes the outbox
+    smtp.connections = 0
+    smtp.messages.clear()
+    client = app.test_client()
+
+    def post(i):
+        r = client.post("/api/contact", json=form(i))
+        assert r.status_code == 200, r.data
+
+    start = time.perf_counter()
+    total, latencies = burst(args.messages, args.clients, post)
+    while len(smtp.messages) < args.messages:
+        if time.perf_counter() - start > 120:
+            raise SystemExit(f"delivery stalled: {OUTBOX.counts()}")
+        time.sleep(0.02)
+    report("outbox", total, latencies, smtp, time.perf_counter() - start)
+
+    if OUTBOX.counts() != {"sent": args.messages}:
+        raise SystemExit(f"unexpected outbox state: {OUTBOX.counts()}")
+
+
+if __name__ == "__main__":
+    main()
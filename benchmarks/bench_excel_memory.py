@@ -0,0 +1,92 @@
+"""
+Peak memory of EXCEL_READER=pandas vs EXCEL_READER=streaming.
+
+Builds scaled copies of static/uploads/journals.xlsx (rows repeated N times
+per sheet) and loads each one in a fresh subprocess per reader mode, so the
+reported figures do not leak between runs. "kept MB" is the parsed catalog
+itself; "parse MB" is the transient overhead of reading on top of it. The
+reader's library is imported before measuring, and the streaming reader
+fails the run if it imports pandas.
+
+    python benchmarks/bench_excel_memory.py [--scales 1 10 50]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+from openpyxl import Workbook, load_workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join(ROOT, "static", "uploads", "journals.xlsx")
+
+CHILD = r"""
+import json, os, resource, sys, time, tracemalloc
+os.environ["EXCEL_READER"] = sys.argv[2]
+sys.path.insert(0, sys.argv[3])
+import app
+# library imports are not parse memory; only the pandas reader loads pandas
+import openpyxl
+if sys.argv[2] == "pandas":
+    import pandas
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+start = time.perf_counter()
+data = app.load_journals_from_excel(sys.argv[1])
+elapsed = time.perf_counter() - start
+current, peak = tracemalloc.get_traced_memory()
+print(json.dumps({
+    "seconds": elapsed,
+    "journals": sum(len(v) for v in data.values()),
+    "retained_mb": current / 2**20,
+    "transient_mb": (peak - current) / 2**20,
+    "rss_growth_mb": (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base_rss) / 1024,
+    "pandas_loaded": "pandas" in sys.modules,
+}))
+"""
+
+
+def build_scaled(path, factor):
+    src = load_workbook(SOURCE, read_only=True, data_only=True)
+    out = Workbook(write_only=True)
+    for ws in src.worksheets:
+        rows = [list(r) for r in ws.iter_rows(values_only=True)]
+        target = out.create_sheet(ws.title)
+        for _ in range(factor):
+            for r in rows:
+                target.append(r)
+            target.append([])
+    out.save(path)
+    src.close()
+
+
+def run(path, mode):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, path, mode, ROOT],
+        check=True, capture_output=True, text=True, cwd=ROOT,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    print(f"{'scale':>6} {'mode':>10} {'journals':>9} {'seconds':>8} {'kept MB':>8} {'parse MB':>9} {'RSS +MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.scales:
+            path = os.path.join(tmp, f"journals_x{factor}.xlsx")
+            build_scaled(path, factor)
+            for mode in ("pandas", "streaming"):
+                r = run(path, mode)
+                if mode == "streaming" and r["pandas_loaded"]:
+                    raise SystemExit("streaming reader imported pandas")
+                print(f"{factor:>5}x {mode:>10} {r['journals']:>9} {r['seconds']:>8.2f} "
+                      f"{r['retained_mb']:>8.1f} {r['transient_mb']:>9.1f} {r['rss_growth_mb']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
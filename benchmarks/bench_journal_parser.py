@@ -0,0 +1,67 @@
+"""
+Row-wise vs column-wise journal block parsing.
+
+Scales the sheets of static/uploads/journals.xlsx by 1x / 10x / 100x,
+checks both parsers return identical output and prints the timings.
+
+    python benchmarks/bench_journal_parser.py [--scales 1 10 100]
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import JOURNALS_EXCEL_PATH, journals_from_frame, journals_from_frame_iterrows
+
+
+def scaled(df, factor):
+    # a blank row between copies keeps the last block of one copy
+    # from merging into the first block of the next
+    blank = pd.DataFrame([[None] * df.shape[1]], columns=df.columns)
+    return pd.concat([df, blank] * factor, ignore_index=True)
+
+
+# blank cells in datetime / numeric columns (NaT, NaN) must read as blank
+EDGE_FRAMES = [
+    pd.DataFrame([["http://x", None], [5, None], [None, None], ["Price 3k", pd.Timestamp("2024-01-01")]]),
+    pd.DataFrame([[1.0, None], [None, None], [2.5, "Price 2k"]]),
+    pd.DataFrame([[None, None], [None, None]]),
+]
+
+
+def timed(fn, frames):
+    start = time.perf_counter()
+    out = [fn(df) for df in frames]
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    args = parser.parse_args()
+
+    for i, df in enumerate(EDGE_FRAMES):
+        if journals_from_frame_iterrows(df) != journals_from_frame(df):
+            raise SystemExit(f"output mismatch on edge frame {i}")
+
+    sheets = pd.read_excel(JOURNALS_EXCEL_PATH, sheet_name=None, header=None, engine="openpyxl")
+
+    print(f"{'scale':>6} {'rows':>9} {'iterrows s':>11} {'vectorized s':>13} {'speedup':>8}")
+    for factor in args.scales:
+        frames = [scaled(df, factor) for df in sheets.values()]
+        rows = sum(len(df) for df in frames)
+
+        old_s, old = timed(journals_from_frame_iterrows, frames)
+        new_s, new = timed(journals_from_frame, frames)
+        if old != new:
+            raise SystemExit(f"output mismatch at scale {factor}x")
+
+        print(f"{factor:>5}x {rows:>9} {old_s:>11.3f} {new_s:>13.3f} {old_s / new_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+/admin/bookings cost as the sheet grows: full get_all_records() download
+vs a page from the local sheet mirror.
+
+The download is simulated by LocalWorksheet (latency per call plus
+--per-row seconds per row to stand in for transfer); the mirror page is
+measured for the default order, a column sort and a search.
+
+    python benchmarks/bench_sheet_mirror.py [--rows 1000 10000 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from sheet_mirror import SheetMirror  # noqa: E402
+from sheets_client import LocalSheetsClient, LocalWorksheet  # noqa: E402
+
+
+def timed(fn, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--per-row", type=float, default=2e-6)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'download ms':>12} {'page ms':>8} {'sorted ms':>10} {'search ms':>10} {'sync new 10 ms':>15}")
+    for n in args.rows:
+        worksheet = LocalWorksheet()
+        worksheet.append_rows([
+            [f"Visitor {i}", f"v{i}@example.com", f"Service {i % 7}", "", f"{i:08d}"] for i in range(n)
+        ])
+        worksheet.latency = args.latency + args.per_row * n
+        download = timed(worksheet.get_all_records, repeat=1)
+
+        mirror = SheetMirror(os.path.join(tempfile.mkdtemp(), "mirror.db"), LocalSheetsClient(worksheet))
+        mirror.sync(full=True)
+
+        page = timed(lambda: mirror.page(page=3))
+        sorted_page = timed(lambda: mirror.page(page=3, sort="timestamp", descending=True))
+        search = timed(lambda: mirror.page(query="v12345@"))
+
+        worksheet.append_rows([[f"New {i}", f"n{i}@example.com", "S", "", "x"] for i in range(10)])
+        worksheet.latency = args.latency
+        sync = timed(mirror.sync, repeat=1)
+
+        print(f"{n:>8} {download:>12.1f} {page:>8.2f} {sorted_page:>10.2f} {search:>10.2f} {sync:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Benchmark suite: the workbook loaders on synthetic workbooks at several
+scales, and every public route through the Flask test client under
+concurrency. Results are written as JSON so runs can be compared.
+
+    python benchmarks/bench_suite.py [--rows 1000 10000 100000] [--repeat 3] [--requests 200] [--clients 8]
+                                     [--output bench.json] [--compare previous.json] [--skip routes]
+
+Nothing leaves the machine: Sheets is the in-memory LocalSheetsClient,
+mail goes to local_smtp.LocalSMTPServer and the Google OAuth flow and
+userinfo call are replaced by local fakes. Databases live in a temp dir.
+With --compare, timings more than --threshold slower than the previous
+run are listed and the exit status is 1.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from local_smtp import LocalSMTPServer  # noqa: E402
+from workbooks import write_author_workbook, write_journals_workbook  # noqa: E402
+
+TMP = tempfile.mkdtemp()
+SMTP = LocalSMTPServer().start()
+shutil.copy(os.path.join(ROOT, "instance", "users.db"), os.path.join(TMP, "users.db"))
+os.environ.update({
+    "DATABASE_URL": "sqlite:///" + os.path.join(TMP, "users.db"),
+    "SHEETS_BACKEND": "local",
+    "BOOKINGS_DB": os.path.join(TMP, "bookings.db"),
+    "SHEET_MIRROR_DB": os.path.join(TMP, "sheet_mirror.db"),
+    "MAIL_OUTBOX_DB": os.path.join(TMP, "outbox.db"),
+    "MAIL_SERVER": "127.0.0.1",
+    "MAIL_PORT": str(SMTP.port),
+    "MAIL_USE_TLS": "False",
+    "MAIL_USERNAME": "site@example.com",
+    "MAIL_PASSWORD": "",
+})
+
+import app as site  # noqa: E402
+from author_migrate_from_excel import migrate_excel_to_db  # noqa: E402
+
+
+# ---------------------------------------------------------------- loaders
+
+def timed(repeat, fn, *args, setup=None, **kwargs):
+    """
+    Best of `repeat` runs; the minimum is the least noisy figure to compare.
+    `setup()` runs untimed before each one.
+    """
+    best = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def edited(sheets, fraction=0.05, seed=1):
+    """
+    Copy of parsed author sheets after a routine edit: about `fraction` of
+    the positions change status or price, and as many tables are dropped
+    and added. This is what the diff sync is for; diffing a workbook against
+    itself only measures the read.
+    """
+    from prices import price_value
+
+    rng = random.Random(seed)
+    out = copy.deepcopy(sheets)
+    for s, sheet in enumerate(out):
+        for table in sheet["tables"]:
+            for author in table["authors"]:
+                if rng.random() < fraction:
+                    author["status"] = "Available" if "book" in author["status"].lower() else "Booked"
+                if rng.random() < fraction:
+                    author["price"] = f"{rng.randint(5, 20)}K"
+                    author["price_value"] = price_value(author["price"])
+        kept = [t for t in sheet["tables"] if rng.random() >= fraction]
+        added = len(sheet["tables"]) - len(kept)
+        sheet["tables"] = kept + [
+            {"title": f"Added Article {s + 1}.{i + 1}", "authors": copy.deepcopy(kept[0]["authors"]) if kept else []}
+            for i in range(added)
+        ]
+    return out
+
+
+def bench_loaders(rows_list, migrate_modes, repeat, log):
+    import openpyxl  # noqa: F401  (import time is not the loaders' time)
+    import pandas  # noqa: F401
+
+    results = []
+    for rows in rows_list:
+        journals_path = os.path.join(TMP, f"journals-{rows}.xlsx")
+        authors_path = os.path.join(TMP, f"authors-{rows}.xlsx")
+        journals = write_journals_workbook(journals_path, rows)
+        tables = write_author_workbook(authors_path, rows)
+
+        sheets = None
+        for reader in ("pandas", "streaming"):
+            site.app.config["EXCEL_READER"] = reader
+            seconds, data = timed(repeat, site.load_journals_from_excel, journals_path)
+            assert sum(len(v) for v in data.values()) == journals
+            results.append({"name": "load_journals_from_excel", "reader": reader, "rows": rows,
+                            "items": journals, "seconds": seconds})
+
+            seconds, sheets = timed(repeat, site.load_author_positions_from_excel, authors_path)
+            assert sum(len(s["tables"]) for s in sheets) == tables
+            results.append({"name": "load_author_positions_from_excel", "reader": reader, "rows": rows,
+                            "items": tables, "seconds": seconds})
+        site.app.config["EXCEL_READER"] = "pandas"
+
+        for mode in migrate_modes:
+            if mode == "diff":
+                # every run starts from the unedited workbook in the database
+                seconds, summary = timed(repeat, migrate_excel_to_db, edited(sheets), mode=mode,
+                                         setup=lambda: migrate_excel_to_db(sheets, mode="bulk"))
+            else:
+                seconds, summary = timed(repeat, migrate_excel_to_db, sheets, mode=mode)
+            results.append({"name": "migrate_excel_to_db", "mode": mode, "rows": rows,
+                            "items": tables, "seconds": seconds, "changes": summary})
+
+        for r in results[-(4 + len(migrate_modes)):]:
+            label = r.get("reader") or r.get("mode")
+            log(f"{r['name']:<34} {label:<10} {rows:>9} rows  {r['seconds'] * 1000:9.1f}ms")
+    return results
+
+
+# ---------------------------------------------------------------- routes
+
+class FakeFlow:
+    """Stands in for google_auth_oauthlib's Flow: no client_secret.json, no network."""
+    credentials = SimpleNamespace(token="local-token")
+
+    def authorization_url(self, **kwargs):
+        return "http://127.0.0.1/oauth/authorize?state=bench", "bench"
+
+    def fetch_token(self, **kwargs):
+        pass
+
+
+def fake_userinfo(url, headers=None, **kwargs):
+    return SimpleNamespace(json=lambda: {"email": "bench@example.com", "name": "Bench User"})
+
+
+def google_login(client):
+    client.get("/login/google")
+    return client.get("/callback/google?state=bench&code=local")
+
+
+def public_routes():
+    post = site.BLOG.current().posts[0]["id"]
+    service = site.SERVICES[0]["title"].lower().replace(" ", "-")
+    booking = {"name": "Bench", "email": "bench@example.com", "service": "Data Analysis", "details": "-"}
+    contact = {"name": "Bench", "email": "bench@example.com", "phone": "", "message": "Hello"}
+    get = lambda path: lambda client: client.get(path)  # noqa: E731
+    return {
+        "GET /": get("/"),
+        "GET /about": get("/about"),
+        "GET /service": get("/service"),
+        "GET /journals": get("/journals"),
+        "GET /api/journals": get("/api/journals?limit=50"),
+        "GET /api/journals?q": get("/api/journals?q=science&sort=price"),
+        "GET /journals/search": get("/journals/search?q=computer"),
+        "GET /authors": get("/authors"),
+        "GET /blog": get("/blog"),
+        "GET /blog/<slug>": get(f"/blog/{post}"),
+        "GET /event": get("/event"),
+        "GET /programs": get("/programs"),
+        "GET /contact": get("/contact"),
+        "GET /refer": get("/refer"),
+        "GET /book/<service>": get(f"/book/{service}"),
+        "GET /login": get("/login"),
+        "GET /signup": get("/signup"),
+        "POST /api/book-service": lambda client: client.post("/api/book-service", json=booking),
+        "POST /api/contact": lambda client: client.post("/api/contact", json=contact),
+        "GET /login/google + callback": google_login,
+    }
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p))]
+
+
+def drive(call, requests, clients):
+    local = threading.local()
+    latencies, statuses = [], {}
+    lock = threading.Lock()
+
+    def one(_):
+        # one test client (cookie jar) per thread
+        client = getattr(local, "client", None)
+        if client is None:
+            client = local.client = site.app.test_client()
+        start = time.perf_counter()
+        status = call(client).status_code
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.append(elapsed)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(clients) as pool:
+        list(pool.map(one, range(requests)))
+    wall = time.perf_counter() - start
+    return {
+        "requests": requests,
+        "clients": clients,
+        "errors": sum(n for status, n in statuses.items() if status >= 500),
+        "statuses": {str(k): v for k, v in sorted(statuses.items())},
+        "rps": requests / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def bench_routes(requests, clients, log):
+    results = {}
+    with mock.patch.object(site, "google_oauth_flow", FakeFlow), mock.patch("requests.get", fake_userinfo):
+        for name, call in public_routes().items():
+            call(site.app.test_client())  # first hit: lazy loads, page cache fill
+            results[name] = r = drive(call, requests, clients)
+            log(f"{name:<34} p50 {r['p50_ms']:7.2f}ms  p95 {r['p95_ms']:7.2f}ms  "
+                f"{r['rps']:8.1f} req/s  {r['statuses']}")
+    return results
+
+
+# ---------------------------------------------------------------- compare
+
+def timings(report):
+    """Flat {key: milliseconds} of everything comparable in a report."""
+    out = {}
+    for r in report.get("loaders", []):
+        out[f"{r['name']}[{r.get('reader') or r.get('mode')}, rows={r['rows']}]"] = r["seconds"] * 1000
+    for name, r in report.get("routes", {}).items():
+        out[f"{name} p50"] = r["p50_ms"]
+    return out
+
+
+def compare(previous, current, threshold):
+    old, new = timings(previous), timings(current)
+    regressions = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = new[key] / old[key] if old[key] else 1.0
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<64} {old[key]:9.2f} -> {new[key]:9.2f}ms  x{ratio:5.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--migrate-modes", nargs="+", default=["bulk", "diff"],
+                        choices=["bulk", "diff", "replace"])
+    parser.add_argument("--repeat", type=int, default=3, help="runs per loader measurement (best is kept)")
+    parser.add_argument("--requests", type=int, default=200, help="per route")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--skip", nargs="+", default=[], choices=["loaders", "routes"])
+    parser.add_argument("--output", default=None, help="write the JSON report here (default: stdout)")
+    parser.add_argument("--compare", default=None, help="previous JSON report")
+    parser.add_argument("--threshold", type=float, default=0.25, help="slowdown counted as a regression")
+    args = parser.parse_args()
+
+    log = lambda line: print(line, file=sys.stderr)  # noqa: E731
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "args": vars(args),
+        },
+    }
+    try:
+        if "routes" not in args.skip:
+            report["routes"] = bench_routes(args.requests, args.clients, log)
+        if "loaders" not in args.skip:
+            report["loaders"] = bench_loaders(args.rows, args.migrate_modes, args.repeat, log)
+    finally:
+        shutil.rmtree(TMP, ignore_errors=True)
+
+    text = json.dumps(report, indent=1)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        log(f"report written to {args.output}")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            regressions = compare(json.load(f), report, args.threshold)
+        if regressions:
+            log(f"{len(regressions)} regression(s) over {args.threshold:.0%}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
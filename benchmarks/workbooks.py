@@ -0,0 +1,107 @@
+"""
+Synthetic journals.xlsx and author-position workbooks in the same layout
+as the ones in static/uploads, at any scale.
+
+    python benchmarks/workbooks.py journals out.xlsx --rows 100000 --sheets 7
+    python benchmarks/workbooks.py authors out.xlsx --rows 100000 --sheets 19
+"""
+import argparse
+import os
+import random
+
+from openpyxl import Workbook
+
+JOURNAL_SHEETS = ["Scopus", "WOS", "SCIE", "ABDC", "IEEE", "UGC", "Peer"]
+SUBJECTS = ["Multidisciplinary", "Computer Science", "Medicine", "Engineering", "Management", "Education"]
+STATUSES = ["Available", "Available", "BOOKED ", "Booked "]
+
+
+def sheet_names(prefix_names, count):
+    names = list(prefix_names[:count])
+    names += [f"Sheet {i + 1}" for i in range(len(names), count)]
+    return names
+
+
+def journal_block(i, rng):
+    """Lines of one journal: link, name, details, price line (like journals.xlsx)."""
+    return [
+        f"https://journals.example.org/j{i}",
+        f"International Journal of Synthetic Research {i}",
+        f"Publisher: Example Press {i % 97}",
+        f"E-ISSN: {1000 + i % 9000}-{i % 10000:04d}",
+        f"https://www.scopus.com/sourceid/{21100000000 + i}",
+        f"Q{i % 4 + 1} JOURNAL",
+        f"Subject: {SUBJECTS[i % len(SUBJECTS)]}",
+        f"Acceptance Time: {rng.randint(1, 8)} weeks",
+        f"Publication Time: {rng.randint(1, 30)} days",
+        f" {rng.choice([40, 60, 80, 90])}k" if i % 3 else f" {rng.choice([1.0, 1.2, 1.5])}L",
+    ]
+
+
+def write_journals_workbook(path, rows, sheets=len(JOURNAL_SHEETS), seed=1):
+    """About `rows` spreadsheet rows spread over `sheets` sheets; returns the journal count."""
+    rng = random.Random(seed)
+    per_block = len(journal_block(0, rng)) + 1
+    blocks = max(1, rows // per_block)
+    wb = Workbook(write_only=True)
+    made = 0
+    for s, name in enumerate(sheet_names(JOURNAL_SHEETS, sheets)):
+        ws = wb.create_sheet(name)
+        for _ in range(-(-blocks // sheets)):
+            if made >= blocks:
+                break
+            for line in journal_block(made, rng):
+                ws.append([None, line])
+            ws.append([])
+            made += 1
+    wb.save(path)
+    return made
+
+
+def write_author_workbook(path, rows, sheets=19, authors_per_table=6, seed=1):
+    """About `rows` spreadsheet rows of author tables; returns the table count."""
+    rng = random.Random(seed)
+    per_table = authors_per_table + 3
+    tables = max(1, rows // per_table)
+    wb = Workbook(write_only=True)
+    made = 0
+    for s, name in enumerate(sheet_names([], sheets)):
+        ws = wb.create_sheet(name)
+        ws.append([])
+        ws.append([None, "📢 CALL FOR AUTHORS – Scopus (Q2) Indexed Journal ✅"])
+        ws.append([None, f"📘 Journal Name: Synthetic Review {s + 1}"])
+        ws.append([None, "Acceptance: 4 Days"])
+        ws.append([None, "Title List"])
+        ws.append([])
+        for t in range(-(-tables // sheets)):
+            if made >= tables:
+                break
+            made += 1
+            ws.append([f"{t + 1})", f"Synthetic Article {s + 1}.{t + 1}: A Systematic Review of Trend {made}"])
+            ws.append([None, "Position", "Amount", "Status"])
+            for a in range(authors_per_table):
+                ws.append([None, f"Author: {a + 1}", f"-             {10 - a * 0.5:g}K", rng.choice(STATUSES)])
+            ws.append([])
+    wb.save(path)
+    return made
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("kind", choices=["journals", "authors"])
+    parser.add_argument("path")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sheets", type=int, default=None)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.path)), exist_ok=True)
+    if args.kind == "journals":
+        n = write_journals_workbook(args.path, args.rows, args.sheets or len(JOURNAL_SHEETS))
+        print(f"{args.path}: {n} journals")
+    else:
+        n = write_author_workbook(args.path, args.rows, args.sheets or 19)
+        print(f"{args.path}: {n} author tables")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Blog posts as files: content/blog/<slug>.html, a front matter block of
+`key: value` lines between `---` markers followed by the HTML body.
+
+    ---
+    title: Creating the Perfect Abstract
+    author: arrayresearch3
+    date: Dec 14, 2024
+    read_time: 2 min read
+    image: images/blogs/abstract.jpg
+    excerpt: One or two sentences for the listing.
+    pinned: yes              (optional, listed before the dated posts)
+    ---
+    <p>Body…</p>
+
+Only the front matter is read when the index is built; bodies are read on
+demand and kept in a small LRU.
+"""
+import os
+from datetime import datetime
+from functools import lru_cache
+
+from markupsafe import Markup
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTENT_DIR = os.path.join(BASE_DIR, "content", "blog")
+EXTENSION = ".html"
+DATE_FORMAT = "%b %d, %Y"
+
+# rendered bodies kept per worker
+BODY_CACHE_SIZE = 32
+
+REQUIRED = ("title", "date")
+
+
+def read_front_matter(f):
+    """Parse the header of an open post file; leaves `f` positioned at the body."""
+    meta = {}
+    if f.readline().strip() != "---":
+        raise ValueError("missing front matter")
+    for line in f:
+        line = line.strip()
+        if line == "---":
+            return meta
+        if line and not line.startswith("#"):
+            key, sep, value = line.partition(":")
+            if not sep:
+                raise ValueError(f"bad front matter line: {line!r}")
+            meta[key.strip()] = value.strip()
+    raise ValueError("unterminated front matter")
+
+
+class BlogIndex:
+    """Metadata of every post, newest first, plus slug lookups."""
+
+    def __init__(self, posts):
+        self.posts = posts
+        self.by_slug = {p["id"]: p for p in posts}
+
+    def get(self, slug):
+        return self.by_slug.get(slug)
+
+    def latest(self, n):
+        return self.posts[:n]
+
+
+def post_files(directory):
+    return [name for name in sorted(os.listdir(directory))
+            if name.endswith(EXTENSION) and not name.startswith(".")]
+
+
+def directory_key(directory=CONTENT_DIR):
+    """
+    (name, size, mtime) of every post. Editing a post in place does not
+    touch the directory's own mtime, so the files are stat'ed one by one.
+    """
+    key = []
+    for name in post_files(directory):
+        st = os.stat(os.path.join(directory, name))
+        key.append((name, st.st_size, st.st_mtime_ns))
+    return tuple(key)
+
+
+def build_index(directory=CONTENT_DIR):
+    posts = []
+    for name in post_files(directory):
+        path = os.path.join(directory, name)
+        try:
+            with open(path, encoding="utf-8") as f:
+                meta = read_front_matter(f)
+            missing = [k for k in REQUIRED if k not in meta]
+            if missing:
+                raise ValueError(f"missing {', '.join(missing)}")
+            meta["published"] = datetime.strptime(meta["date"], DATE_FORMAT)
+        except (OSError, ValueError) as e:
+            print(f"Skipping blog post {name}:", e)
+            continue
+        meta["id"] = name[: -len(EXTENSION)]
+        meta["path"] = path
+        posts.append(meta)
+    posts.sort(key=lambda p: p["id"])
+    posts.sort(key=lambda p: p["published"], reverse=True)
+    posts.sort(key=lambda p: p.get("pinned", "").lower() not in ("yes", "true"))
+    return BlogIndex(posts)
+
+
+@lru_cache(maxsize=BODY_CACHE_SIZE)
+def _render_body(path, mtime_ns):
+    with open(path, encoding="utf-8") as f:
+        read_front_matter(f)
+        return Markup(f.read().strip())
+
+
+def post_body(post):
+    """HTML body of a post from the index; re-read when the file changes."""
+    return _render_body(post["path"], os.stat(post["path"]).st_mtime_ns)
@@ -0,0 +1,115 @@
+import time
+from datetime import datetime
+
+from metrics import REGISTRY
+from sqlite_queue import QueueWorker, SqliteQueue
+
+# rows per append_rows() call
+BATCH_SIZE = 200
+
+# retry delay after a failed push: BACKOFF_BASE * 2**attempts, capped
+BACKOFF_BASE = 2.0
+MAX_BACKOFF = 15 * 60
+
+# a batch claimed by a worker that then died is sent again after this long
+CLAIM_TIMEOUT = 5 * 60
+
+# the replicator also wakes up on its own this often (seconds)
+POLL_INTERVAL = 30
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS booking (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    service TEXT NOT NULL,
+    details TEXT,
+    timestamp TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    claimed_at REAL,
+    synced_at REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_booking_pending ON booking (status, next_attempt_at);
+"""
+
+
+class BookingLedger(SqliteQueue):
+    """
+    Bookings are committed here first and acknowledged straight away; the
+    Replicator copies them to the Google Sheet afterwards.
+
+    Status goes pending -> sending -> synced. Delivery is at-least-once
+    only when a worker dies mid-push.
+    """
+
+    table = "booking"
+    schema = SCHEMA
+    batch_size = BATCH_SIZE
+    backoff_base = BACKOFF_BASE
+    max_backoff = MAX_BACKOFF
+    claim_timeout = CLAIM_TIMEOUT
+
+    def add(self, name, email, service, details=None):
+        timestamp = datetime.now().strftime("%d-%m-%Y %H:%M:%S")
+        cur = self.connect().execute(
+            "INSERT INTO booking (name, email, service, details, timestamp) VALUES (?, ?, ?, ?, ?)",
+            (name, email, service, details, timestamp),
+        )
+        return cur.lastrowid
+
+    def claim(self, limit=BATCH_SIZE):
+        """Mark up to `limit` due rows as sending and return (id, sheet row) pairs."""
+        rows = self.claim_rows(("name", "email", "service", "details", "timestamp"), limit)
+        return [(row[0], [row[1], row[2], row[3], row[4] or "", row[5]]) for row in rows]
+
+    def mark_synced(self, ids):
+        now = time.time()
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "UPDATE booking SET status = 'synced', synced_at = ?, last_error = NULL WHERE id = ?",
+                [(now, i) for i in ids],
+            )
+
+
+class Replicator(QueueWorker):
+    """
+    Background thread pushing pending ledger rows to the sheet with
+    append_rows(), BATCH_SIZE rows per API call. `on_synced` is called
+    after every batch that reached the sheet.
+    """
+
+    name = "booking-replicator"
+    poll_interval = POLL_INTERVAL
+
+    def __init__(self, ledger, sheets, on_synced=None):
+        super().__init__(ledger)
+        self.ledger = ledger
+        self.sheets = sheets
+        self.on_synced = on_synced
+
+    def drain(self):
+        while self.flush():
+            pass
+
+    def flush(self):
+        """Push one batch; returns the number of rows synced."""
+        batch = self.ledger.claim()
+        if not batch:
+            return 0
+        ids = [i for i, _ in batch]
+        try:
+            with REGISTRY.timed("external_call_duration_seconds", service="sheets", operation="append_rows"):
+                self.sheets.worksheet().append_rows([row for _, row in batch])
+        except Exception as e:
+            print(f"Booking replication failed for {len(ids)} rows:", e)
+            self.ledger.mark_failed(ids, f"{type(e).__name__}: {e}")
+            return 0
+        self.ledger.mark_synced(ids)
+        if self.on_synced:
+            self.on_synced()
+        return len(ids)
@@ -0,0 +1,124 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, every worker parses for itself
+    fcntl = None
+
+from journal_snapshot import workbook_key
+
+
+class CatalogManager:
+    """
+    One immutable catalog built from a workbook, swapped for a new one when
+    the file changes on disk.
+
+    current() returns whatever catalog is live; a request that grabbed it
+    keeps using that object, and a new one only becomes visible once it is
+    completely built. Changes are noticed by a stat() at most every
+    `check_interval` seconds and re-parsed on a background thread, so no
+    request waits on the parse. Every worker process watches the file on
+    its own; with a `lock_path` the first one to notice does the parse while
+    the others wait for it and then pick up the snapshot it left behind.
+
+    `stat_key(path)` says what "changed" means; the default is the size and
+    mtime of the file itself.
+    """
+
+    def __init__(self, name, path, build, check_interval=2.0, lock_path=None, stat_key=None):
+        self.name = name
+        self.path = path
+        self.build = build
+        self.stat_key = stat_key
+        self.check_interval = check_interval
+        self.lock_path = lock_path
+        # (workbook key, catalog, version) — replaced in one assignment
+        self._state = None
+        self._failed_key = None
+        self._checked_at = 0.0
+        self._load_lock = threading.Lock()
+        self._first_load = threading.Lock()
+        self._reloading = threading.Lock()
+
+    @property
+    def version(self):
+        return self._state[2] if self._state else 0
+
+    def _stat_key(self):
+        try:
+            if self.stat_key is not None:
+                return self.stat_key(self.path)
+            key = workbook_key(self.path, with_hash=False)
+        except OSError:
+            return None
+        return key["size"], key["mtime_ns"]
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None or self.lock_path is None:
+            yield
+            return
+        try:
+            os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+            f = open(self.lock_path, "a")
+        except OSError:
+            # read-only filesystem: parse without coordinating
+            yield
+            return
+        with f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def load(self):
+        """Build the catalog from the workbook on this thread and make it live."""
+        with self._load_lock:
+            # stat before parsing: a write during the parse shows up as
+            # another change on the next check
+            key = self._stat_key()
+            with self._file_lock():
+                catalog = self.build(self.path)
+            self._state = (key, catalog, self.version + 1)
+            self._failed_key = None
+        return catalog
+
+    def current(self):
+        state = self._state
+        if state is None:
+            # first use: concurrent requests wait for one build
+            with self._first_load:
+                if self._state is None:
+                    return self.load()
+            state = self._state
+
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            key = self._stat_key()
+            if key != state[0] and key != self._failed_key:
+                self.reload_async()
+        return state[1]
+
+    def reload_async(self):
+        """Re-parse in the background unless a reload is already running."""
+        if not self._reloading.acquire(blocking=False):
+            return False
+        threading.Thread(target=self._reload, name=f"reload-{self.name}", daemon=True).start()
+        return True
+
+    def _reload(self):
+        key = self._stat_key()
+        try:
+            self.load()
+            print(f"{self.name} catalog reloaded (version {self.version})")
+        except Exception as e:
+            # keep serving the old catalog; retry once the file changes again
+            self._failed_key = key
+            print(f"Reloading {self.name} catalog failed:", e)
+        finally:
+            self._reloading.release()
@@ -0,0 +1,31 @@
+def cell_text(value):
+    """str(x).strip() of a raw openpyxl value, with empty cells as ""."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def iter_sheet_rows(worksheet):
+    """Yield every row of a read-only worksheet as a list of stripped strings."""
+    for row in worksheet.iter_rows(values_only=True):
+        yield [cell_text(v) for v in row]
+
+
+def iter_workbook_sheets(path):
+    """
+    Yield (sheet_name, row_iterator) pairs from a workbook opened in
+    openpyxl read-only mode.
+
+    Only the current row of the current sheet is held in memory, so each
+    row iterator must be consumed before advancing to the next sheet.
+    """
+    from openpyxl import load_workbook
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        for ws in wb.worksheets:
+            yield ws.title, iter_sheet_rows(ws)
+    finally:
+        wb.close()
@@ -0,0 +1,224 @@
+"""
+Resized AVIF / WebP / JPEG (PNG for images with transparency) copies of
+static/images at several widths, plus the manifest the `responsive_img`
+template helper reads.
+
+    flask build-images          (or: python image_derivatives.py)
+"""
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from markupsafe import Markup, escape
+
+from journal_snapshot import file_sha256
+
+# bump to rebuild every derivative after a change to build_image itself;
+# WIDTHS and QUALITY are hashed into the file names on their own
+PIPELINE_VERSION = 1
+
+WIDTHS = (320, 640, 960, 1280, 1920)
+MODERN_FORMATS = ("avif", "webp")
+QUALITY = {"avif": 55, "webp": 75, "jpeg": 80, "png": None}
+MIME = {"avif": "image/avif", "webp": "image/webp", "jpeg": "image/jpeg", "png": "image/png"}
+EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+SOURCE_DIR = os.path.join(STATIC_DIR, "images")
+OUTPUT_DIR = os.path.join(STATIC_DIR, "derived")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+
+def pipeline_hash():
+    """Short hash of everything that changes the bytes of a derivative; part of every file name."""
+    settings = {"version": PIPELINE_VERSION, "widths": WIDTHS, "quality": QUALITY}
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def source_images(source_dir=SOURCE_DIR):
+    for root, _, files in os.walk(source_dir):
+        for name in sorted(files):
+            if name.lower().endswith(EXTENSIONS):
+                yield os.path.join(root, name)
+
+
+def target_widths(width):
+    largest = min(width, WIDTHS[-1])
+    return [w for w in WIDTHS if w < largest] + [largest]
+
+
+def build_image(path, digest, static_dir, output_dir):
+    """
+    Write every derivative of one source image; returns its manifest entry.
+    Files are named after the source hash and the pipeline hash, so a
+    derivative on disk always matches the current settings, and written
+    through a temp file so a crash never leaves a truncated one behind.
+    """
+    from PIL import Image, ImageOps
+
+    pipeline = pipeline_hash()
+
+    with Image.open(path) as im:
+        im = ImageOps.exif_transpose(im)
+        has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        im = im.convert("RGBA" if has_alpha else "RGB")
+        width, height = im.size
+        fallback = "png" if has_alpha else "jpeg"
+
+        stem = os.path.splitext(os.path.basename(path))[0]
+        variants = {}
+        for fmt in (*MODERN_FORMATS, fallback):
+            variants[fmt] = []
+            for w in target_widths(width):
+                h = round(height * w / width)
+                out_name = f"{stem}-{digest[:10]}-{pipeline}-{w}.{'jpg' if fmt == 'jpeg' else fmt}"
+                out_path = os.path.join(output_dir, out_name)
+                if not os.path.exists(out_path):
+                    resized = im if w == width else im.resize((w, h), Image.LANCZOS)
+                    options = {"optimize": True}
+                    if QUALITY[fmt] is not None:
+                        options["quality"] = QUALITY[fmt]
+                    if fmt == "jpeg":
+                        options["progressive"] = True
+                    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+                    try:
+                        resized.save(tmp_path, fmt.upper(), **options)
+                        os.replace(tmp_path, out_path)
+                    finally:
+                        if os.path.exists(tmp_path):
+                            os.remove(tmp_path)
+                variants[fmt].append({
+                    "w": w,
+                    "file": os.path.relpath(out_path, static_dir).replace(os.sep, "/"),
+                    "bytes": os.path.getsize(out_path),
+                })
+
+    return {
+        "pipeline": pipeline,
+        "sha256": digest,
+        "width": width,
+        "height": height,
+        "fallback": fallback,
+        "source_bytes": os.path.getsize(path),
+        "variants": variants,
+    }
+
+
+def entry_is_current(entry, digest, static_dir):
+    return (
+        entry is not None
+        and entry.get("pipeline") == pipeline_hash()
+        and entry.get("sha256") == digest
+        and all(
+            os.path.exists(os.path.join(static_dir, v["file"]))
+            for variants in entry["variants"].values()
+            for v in variants
+        )
+    )
+
+
+def build_derivatives(source_dir=SOURCE_DIR, static_dir=STATIC_DIR, output_dir=OUTPUT_DIR, log=print, workers=None):
+    """
+    Bring static/derived in line with static/images. Unchanged images (same
+    content hash) are skipped; derivatives of changed or deleted images are
+    removed. Returns (manifest, stats).
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    old = load_manifest(manifest_path)
+    manifest = {}
+    stats = {"built": 0, "skipped": 0, "source_bytes": 0, "served_bytes": 0}
+
+    todo = {}
+    for path in source_images(source_dir):
+        key = os.path.relpath(path, static_dir).replace(os.sep, "/")
+        digest = file_sha256(path)
+        if entry_is_current(old.get(key), digest, static_dir):
+            manifest[key] = old[key]
+            stats["skipped"] += 1
+        else:
+            todo[key] = (path, digest)
+
+    # AVIF encoding dominates; spread the images over the CPUs
+    with ProcessPoolExecutor(workers) as pool:
+        futures = {
+            key: pool.submit(build_image, path, digest, static_dir, output_dir)
+            for key, (path, digest) in todo.items()
+        }
+        for key, future in futures.items():
+            try:
+                entry = future.result()
+            except Exception as e:
+                print(f"Skipping {key}:", e)
+                continue
+            manifest[key] = entry
+            stats["built"] += 1
+            log(f"built {key} ({entry['width']}x{entry['height']})")
+
+    for entry in manifest.values():
+        # what a desktop browser with WebP support downloads instead of the original
+        stats["source_bytes"] += entry["source_bytes"]
+        stats["served_bytes"] += entry["variants"]["webp"][-1]["bytes"]
+
+    # drop derivatives nothing points at any more
+    keep = {v["file"] for e in manifest.values() for vs in e["variants"].values() for v in vs}
+    for name in os.listdir(output_dir):
+        rel = os.path.relpath(os.path.join(output_dir, name), static_dir).replace(os.sep, "/")
+        if name != "manifest.json" and rel not in keep:
+            os.remove(os.path.join(output_dir, name))
+
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest, stats
+
+
+def srcset(variants, url_for):
+    return ", ".join(f"{url_for('static', filename=v['file'])} {v['w']}w" for v in variants)
+
+
+def responsive_img(manifest, url_for, path, alt="", sizes="100vw", loading="lazy", **attrs):
+    """
+    <picture> with AVIF / WebP sources and a JPEG/PNG <img srcset> fallback
+    for a path under static/ ("images/blog1.jpg"). Images missing from the
+    manifest (build not run) get a plain lazy <img>.
+    """
+    entry = manifest.get(path)
+    extra = "".join(f' {k.rstrip("_").replace("_", "-")}="{escape(v)}"' for k, v in attrs.items())
+    img_attrs = f'alt="{escape(alt)}" loading="{loading}" decoding="async"{extra}'
+    if entry is None:
+        return Markup(f'<img src="{url_for("static", filename=path)}" {img_attrs}>')
+
+    fallback = entry["variants"][entry["fallback"]]
+    sources = "".join(
+        f'<source type="{MIME[fmt]}" srcset="{srcset(entry["variants"][fmt], url_for)}" sizes="{escape(sizes)}">'
+        for fmt in MODERN_FORMATS
+    )
+    return Markup(
+        f"<picture>{sources}"
+        f'<img src="{url_for("static", filename=fallback[-1]["file"])}" '
+        f'srcset="{srcset(fallback, url_for)}" sizes="{escape(sizes)}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" {img_attrs}>'
+        f"</picture>"
+    )
+
+
+def stats_text(stats):
+    saved = stats["source_bytes"] - stats["served_bytes"]
+    return (f"{stats['built']} built, {stats['skipped']} unchanged; "
+            f"{stats['source_bytes'] / 1e6:.1f} MB originals -> {stats['served_bytes'] / 1e6:.1f} MB "
+            f"largest WebP ({saved / 1e6:.1f} MB saved)")
+
+
+if __name__ == "__main__":
+    print(stats_text(build_derivatives()[1]))
@@ -0,0 +1,187 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+
+# seconds between two heartbeat writes of a queued or running job
+HEARTBEAT_INTERVAL = 15
+
+# A job whose worker died stops heartbeating; after this long it no longer
+# blocks a new job of the same kind.
+STALE_AFTER = 4 * HEARTBEAT_INTERVAL
+
+# minimum seconds between two progress writes of the same job
+PROGRESS_INTERVAL = 0.5
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS job (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER NOT NULL DEFAULT 0,
+    message TEXT NOT NULL DEFAULT '',
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    updated_at REAL NOT NULL,
+    finished_at REAL
+);
+-- at most one queued/running job per kind, across every worker process
+CREATE UNIQUE INDEX IF NOT EXISTS ux_job_active_kind
+    ON job (kind) WHERE status IN ('queued', 'running');
+"""
+
+COLUMNS = (
+    "id", "kind", "status", "done", "total", "message", "result", "error",
+    "created_at", "started_at", "updated_at", "finished_at",
+)
+
+
+class JobStore:
+    """
+    Job rows in their own SQLite file, so progress writes never wait on the
+    write lock a long migration holds on users.db.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._ready = False
+
+    def connect(self):
+        if self._ready:
+            return sqlite3.connect(self.db_path, timeout=10)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        self._ready = True
+        return conn
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{k} = ?" for k in fields)
+        with closing(self.connect()) as conn, conn:
+            conn.execute(f"UPDATE job SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+    def create(self, kind):
+        """Queue a job; returns (job, created). An active job of the same kind is returned as is."""
+        now = time.time()
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                "UPDATE job SET status = 'failed', error = 'worker stopped responding', finished_at = ? "
+                "WHERE kind = ? AND status IN ('queued', 'running') AND updated_at < ?",
+                (now, kind, now - STALE_AFTER),
+            )
+            try:
+                cur = conn.execute(
+                    "INSERT INTO job (kind, status, created_at, updated_at) VALUES (?, 'queued', ?, ?)",
+                    (kind, now, now),
+                )
+                return self.get(cur.lastrowid, conn), True
+            except sqlite3.IntegrityError:
+                row = conn.execute(
+                    "SELECT id FROM job WHERE kind = ? AND status IN ('queued', 'running')", (kind,)
+                ).fetchone()
+        return self.get(row[0]), False
+
+    def start(self, job_id):
+        self._update(job_id, status="running", started_at=time.time())
+
+    def heartbeat(self, job_id):
+        self._update(job_id)
+
+    def progress(self, job_id, done, total, message=""):
+        self._update(job_id, done=done, total=total, message=message)
+
+    def finish(self, job_id, result=None):
+        self._update(job_id, status="done", result=json.dumps(result), finished_at=time.time())
+
+    def fail(self, job_id, error):
+        self._update(job_id, status="failed", error=error, finished_at=time.time())
+
+    def get(self, job_id, conn=None):
+        if conn is None:
+            with closing(self.connect()) as conn:
+                return self.get(job_id, conn)
+        row = conn.execute(f"SELECT {', '.join(COLUMNS)} FROM job WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def recent(self, limit=20):
+        with closing(self.connect()) as conn:
+            ids = conn.execute("SELECT id FROM job ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+            return [self.get(job_id, conn) for (job_id,) in ids]
+
+
+class JobRunner:
+    """
+    Runs heavy admin work on a small thread pool outside the request.
+
+    The callable gets a `progress(done, total, message)` keyword argument;
+    its return value is stored as the job result.
+    """
+
+    def __init__(self, store, max_workers=2):
+        self.store = store
+        self.max_workers = max_workers
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        # created lazily so gunicorn workers each get their own pool after fork
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="job")
+            return self._executor
+
+    def submit(self, kind, fn, *args, **kwargs):
+        job, created = self.store.create(kind)
+        if created:
+            stop = threading.Event()
+            threading.Thread(target=self._heartbeat, args=(job["id"], stop),
+                             name=f"job-{job['id']}-heartbeat", daemon=True).start()
+            self.executor.submit(self._run, job["id"], fn, args, kwargs, stop)
+        return job, created
+
+    def _heartbeat(self, job_id, stop):
+        """Keep updated_at fresh while the job waits or runs, even between progress calls."""
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.store.heartbeat(job_id)
+            except sqlite3.Error as e:
+                print(f"Job {job_id} heartbeat failed: {e}")
+
+    def _run(self, job_id, fn, args, kwargs, stop):
+        try:
+            self._execute(job_id, fn, args, kwargs)
+        finally:
+            stop.set()
+
+    def _execute(self, job_id, fn, args, kwargs):
+        last_write = 0.0
+
+        def progress(done, total, message=""):
+            nonlocal last_write
+            now = time.monotonic()
+            if done >= total or now - last_write >= PROGRESS_INTERVAL:
+                last_write = now
+                self.store.progress(job_id, done, total, message)
+
+        self.store.start(job_id)
+        try:
+            result = fn(*args, progress=progress, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            self.store.fail(job_id, f"{type(e).__name__}: {e}")
+        else:
+            self.store.finish(job_id, result)
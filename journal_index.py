@@ -0,0 +1,248 @@
+import bisect
+import heapq
+import re
+
+from prices import PriceIndex, price_value
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# posting lists of every prefix up to this length are merged at build time,
+# so "j" or "sc" is one list instead of a union over thousands of tokens
+PRECOMPUTED_PREFIX = 3
+# longer prefixes matching more tokens than this are merged once and kept
+MAX_LAZY_EXPANSION = 16
+MAX_CACHED_EXPANSIONS = 256
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+class JournalIndex:
+    """
+    Read-only indexes over the parsed {sheet: [journal blocks]} catalog.
+
+    Every journal gets an integer id in (sheet, position) order, so a sheet
+    is a contiguous id range and every posting list is sorted. A page is
+    "the next N matching ids after the cursor", found with bisect instead of
+    walking the whole catalog. Query tokens are intersected lazily from
+    the cursor (leapfrogging with bisect over the sorted lists) and stop
+    after `limit` hits, so a page costs about the same at any catalog size.
+    Per-sheet PriceIndex lists give the same for price ranges and
+    cheapest-first ordering.
+    """
+
+    def __init__(self, journals_by_sheet):
+        self.entries = []
+        self.sheet_ranges = {}
+        self.sheet_prices = {}
+        postings = {}
+
+        for sheet, journals in journals_by_sheet.items():
+            start = len(self.entries)
+            for j in journals:
+                jid = len(self.entries)
+                self.entries.append({
+                    "id": jid,
+                    "sheet": sheet,
+                    "link": j["link"],
+                    "details": j["details"],
+                    "price": j["price"],
+                    "price_value": j.get("price_value", price_value(j["price"])),
+                })
+                text = " ".join([j["link"], *j["details"]])
+                for token in set(tokenize(text)):
+                    postings.setdefault(token, []).append(jid)
+            self.sheet_ranges[sheet] = (start, len(self.entries))
+            self.sheet_prices[sheet] = PriceIndex(
+                (e["price_value"], e["id"]) for e in self.entries[start:]
+            )
+
+        self.prices = PriceIndex((e["price_value"], e["id"]) for e in self.entries)
+        # id -> position in the price index (None when the journal has no price)
+        self.price_positions = {None: price_positions(self.prices, 0, len(self.entries))}
+        for sheet, (start, end) in self.sheet_ranges.items():
+            self.price_positions[sheet] = price_positions(self.sheet_prices[sheet], start, end)
+        self.vocabulary = sorted(postings)
+        self.postings = postings
+
+        prefixes = {}
+        for token, ids in postings.items():
+            for n in range(1, min(len(token), PRECOMPUTED_PREFIX) + 1):
+                prefixes.setdefault(token[:n], set()).update(ids)
+        self.prefix_postings = {prefix: sorted(ids) for prefix, ids in prefixes.items()}
+        self._expansions = {}
+
+    @property
+    def sheets(self):
+        return list(self.sheet_ranges)
+
+    def _token_lists(self, prefix):
+        """Sorted id lists whose union is the journals with a token starting with prefix."""
+        if len(prefix) <= PRECOMPUTED_PREFIX:
+            return [self.prefix_postings.get(prefix, [])]
+        merged = self._expansions.get(prefix)
+        if merged is not None:
+            return [merged]
+        i = bisect.bisect_left(self.vocabulary, prefix)
+        lists = []
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(prefix):
+            lists.append(self.postings[self.vocabulary[i]])
+            i += 1
+        if len(lists) <= MAX_LAZY_EXPANSION:
+            return lists
+        merged = sorted(set().union(*lists))
+        if len(self._expansions) >= MAX_CACHED_EXPANSIONS:
+            self._expansions.clear()
+        self._expansions[prefix] = merged
+        return [merged]
+
+    def _terms(self, query):
+        """One PostingUnion per query token (smallest first), or None for "all ids"."""
+        tokens = tokenize(query or "")
+        if not tokens:
+            return None
+        terms = [PostingUnion(self._token_lists(token)) for token in set(tokens)]
+        return sorted(terms, key=len)
+
+    def page(self, sheet=None, query=None, min_price=None, max_price=None,
+             cursor=None, limit=DEFAULT_PAGE_SIZE, sort=None):
+        """
+        Return (items, next_cursor) for one page of matching journals.
+
+        sort="price" orders cheapest first (journals without a price are
+        left out); otherwise journals keep their workbook order.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        if sheet is not None and sheet not in self.sheet_ranges:
+            return [], None
+
+        if sort == "price":
+            return self._page_by_price(sheet, query, min_price, max_price, cursor, limit)
+
+        lo, hi = 0, len(self.entries)
+        if sheet is not None:
+            lo, hi = self.sheet_ranges[sheet]
+        if cursor is not None:
+            lo = max(lo, int(cursor) + 1)
+
+        terms = self._terms(query)
+        price_filter = min_price is not None or max_price is not None
+        if price_filter:
+            prices = self.prices if sheet is None else self.sheet_prices[sheet]
+            p_lo, p_hi = prices.bounds(min_price, max_price)
+            if p_lo == p_hi:
+                return [], None
+            if (p_hi - p_lo) ** 2 <= limit * max(1, hi - lo):
+                # few journals in the price range: join their ids like a query token
+                # instead of testing the price of every id in the sheet
+                in_range = PostingUnion([sorted(prices.keys[p_lo:p_hi])])
+                terms = sorted([*(terms or []), in_range], key=len)
+                price_filter = False
+        ids = range(lo, hi) if terms is None else intersect(terms, lo, hi)
+
+        items = []
+        for jid in ids:
+            entry = self.entries[jid]
+            if price_filter:
+                value = entry["price_value"]
+                if value is None:
+                    continue
+                if min_price is not None and value < min_price:
+                    continue
+                if max_price is not None and value > max_price:
+                    continue
+            if len(items) == limit:
+                return items, str(items[-1]["id"])
+            items.append(entry)
+
+        return items, None
+
+    def _page_by_price(self, sheet, query, min_price, max_price, cursor, limit):
+        """Cheapest-first page; the cursor is a position in the price index."""
+        prices = self.prices if sheet is None else self.sheet_prices[sheet]
+        lo, hi = prices.bounds(min_price, max_price)
+        if cursor is not None:
+            lo = max(lo, int(cursor) + 1)
+
+        terms = self._terms(query)
+        if terms is None:
+            positions = range(lo, hi)
+        elif len(terms[0]) ** 2 <= limit * max(1, hi - lo):
+            # few matches: price-position them instead of walking the price list
+            positions = self._match_positions(prices, terms, sheet, lo, hi, limit)
+        else:
+            positions = (pos for pos in range(lo, hi)
+                         if all(term.contains(prices.keys[pos]) for term in terms))
+
+        items = []
+        last_pos = lo - 1
+        for pos in positions:
+            if len(items) == limit:
+                return items, str(last_pos)
+            items.append(self.entries[prices.keys[pos]])
+            last_pos = pos
+
+        return items, None
+
+    def _match_positions(self, prices, terms, sheet, lo, hi, limit):
+        """The limit + 1 cheapest price positions in [lo, hi) of the matching journals."""
+        id_lo, id_hi = (0, len(self.entries)) if sheet is None else self.sheet_ranges[sheet]
+        position_of = self.price_positions[sheet]
+        positions = []
+        for jid in intersect(terms, id_lo, id_hi):
+            pos = position_of[jid - id_lo]
+            if pos is not None and lo <= pos < hi:
+                positions.append(pos)
+        return heapq.nsmallest(limit + 1, positions)
+
+
+def price_positions(prices, start, end):
+    """[position in `prices` of id start, ..., of id end - 1]"""
+    positions = [None] * (end - start)
+    for pos, jid in enumerate(prices.keys):
+        positions[jid - start] = pos
+    return positions
+
+
+class PostingUnion:
+    """The union of a few sorted id lists, searched without merging them."""
+
+    def __init__(self, lists):
+        self.lists = [ids for ids in lists if ids]
+        self._len = sum(len(ids) for ids in self.lists)
+
+    def __len__(self):
+        return self._len
+
+    def next_at_least(self, x):
+        """Smallest id >= x, or None."""
+        best = None
+        for ids in self.lists:
+            i = bisect.bisect_left(ids, x)
+            if i < len(ids) and (best is None or ids[i] < best):
+                best = ids[i]
+        return best
+
+    def contains(self, x):
+        return self.next_at_least(x) == x
+
+
+def intersect(terms, lo, hi):
+    """Ids in [lo, hi) present in every term, ascending, found lazily (leapfrog join)."""
+    x = lo
+    while x < hi:
+        for term in terms:
+            y = term.next_at_least(x)
+            if y is None or y >= hi:
+                return
+            if y != x:
+                x = y
+                break
+        else:
+            yield x
+            x += 1
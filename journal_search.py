@@ -0,0 +1,318 @@
+import heapq
+import os
+import re
+import sqlite3
+import threading
+from contextlib import closing
+
+from markupsafe import Markup, escape
+
+from journal_snapshot import file_sha256, workbook_key
+
+WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+SCHEMA = """
+CREATE VIRTUAL TABLE journal_fts USING fts5(
+    name, issn, subject, details,
+    sheet UNINDEXED, link UNINDEXED, price UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+CREATE VIRTUAL TABLE temp.journal_vocab USING fts5vocab(main, journal_fts, row);
+-- words in at least half the journals (see weighted_terms)
+CREATE TABLE common_word (term TEXT PRIMARY KEY);
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# bm25 column weights: name, issn, subject, details; stored as the table's
+# rank function so ORDER BY rank scores inside FTS5
+RANK = "bm25(10.0, 8.0, 4.0, 1.0)"
+
+# most matches ranked per search. Scoring every hit of "journal" in a 100k
+# catalog takes ~250ms; finding matches in rowid (catalog) order is cheap,
+# so a broad query is ranked over its first RANK_WINDOW matches
+RANK_WINDOW = 1000
+
+SNIPPET_WIDTH = 160
+
+# bump when SCHEMA or journal_fields() changes so existing files get rebuilt
+INDEX_VERSION = 4
+
+
+def journal_fields(journal):
+    """Split a parsed journal block into the searchable FTS columns."""
+    details = [d for d in journal["details"] if d.strip()]
+    name = next((d for d in details if not d.startswith("http")), "")
+
+    issn = [d for d in details if "issn" in d.lower()]
+
+    subject = []
+    for i, d in enumerate(details):
+        if "subject" in d.lower():
+            subject.append(d)
+            # "Subject area:" puts the actual subjects on the next line
+            if d.rstrip().endswith(":") and i + 1 < len(details):
+                subject.append(details[i + 1])
+
+    return name, "\n".join(issn), "\n".join(subject), "\n".join(details)
+
+
+def query_terms(text):
+    """
+    Split free text into (words, prefix) terms. Words match whole tokens;
+    a trailing "*" asks for a prefix match. Hyphenated terms such as ISSNs
+    keep their words together as a phrase.
+    """
+    terms = []
+    for term in (text or "").split():
+        words = WORD_RE.findall(term)
+        if words:
+            terms.append((words, term.endswith("*")))
+    return terms
+
+
+def fts_query(terms):
+    """Safe FTS5 MATCH expression requiring every term."""
+    parts = []
+    for words, prefix in terms:
+        phrase = '"' + " ".join(words) + '"'
+        parts.append(phrase + "*" if prefix else phrase)
+    return " ".join(parts)
+
+
+def highlight_re(terms):
+    patterns = []
+    for words, prefix in terms:
+        pattern = r"\W+".join(re.escape(w) for w in words)
+        patterns.append(rf"(?<!\w){pattern}" + ("" if prefix else r"(?!\w)"))
+    return re.compile("|".join(patterns), re.IGNORECASE)
+
+
+def mark(text, pattern):
+    """HTML-escape text and wrap every match of pattern in <mark>."""
+    out = []
+    pos = 0
+    for m in pattern.finditer(text):
+        out.append(str(escape(text[pos:m.start()])))
+        out.append(f"<mark>{escape(m.group(0))}</mark>")
+        pos = m.end()
+    out.append(str(escape(text[pos:])))
+    return Markup("".join(out))
+
+
+def snippet(details, name, pattern, width=SNIPPET_WIDTH):
+    """Best matching detail line (other than the name), trimmed around the first hit."""
+    lines = [d for d in details.split("\n") if d != name]
+    line = next((d for d in lines if pattern.search(d)), lines[0] if lines else "")
+
+    m = pattern.search(line)
+    if len(line) > width:
+        start = max(0, (m.start() if m else 0) - width // 3)
+        clipped = line[start:start + width]
+        line = ("…" if start else "") + clipped + ("…" if start + width < len(line) else "")
+    return mark(line, pattern)
+
+
+def weighted_terms(conn, terms):
+    """
+    The query terms bm25 gives any weight to. FTS5 clamps the IDF of a word
+    found in half the journals or more to ~0, so such a word only filters;
+    leaving it out of the scored expression saves bm25 from walking its
+    whole posting list. Phrases and prefixes are always kept.
+    """
+    kept = []
+    for words, prefix in terms:
+        if len(words) == 1 and not prefix and conn.execute(
+            "SELECT 1 FROM common_word WHERE term = ?", (words[0].lower(),)
+        ).fetchone():
+            continue
+        kept.append((words, prefix))
+    return kept
+
+
+def match_window(conn, match, size):
+    """Rowids of the first `size` matches, in rowid order (no scoring)."""
+    return [rowid for (rowid,) in conn.execute(
+        "SELECT rowid FROM journal_fts WHERE journal_fts MATCH ? LIMIT ?", (match, size)
+    )]
+
+
+def rank_window(conn, window, scored_match, limit):
+    """The `limit` best rowids of a match window, scored with the stored rank function on `scored_match`."""
+    if not window:
+        return []
+    in_window = set(window)
+    scored = conn.execute(
+        "SELECT rowid, rank FROM journal_fts WHERE journal_fts MATCH ? AND rowid BETWEEN ? AND ?",
+        (scored_match, window[0], window[-1]),
+    )
+    best = heapq.nsmallest(limit, ((rank, rowid) for rowid, rank in scored if rowid in in_window))
+    return [rowid for _, rowid in best]
+
+
+class JournalSearchIndex:
+    """
+    SQLite FTS5 copy of the journal catalog.
+
+    The index file remembers the size/mtime/hash of the journals.xlsx it was
+    built from and is rebuilt (into a temp file, then swapped in) whenever
+    the workbook changes.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._key = None
+        self._failed = None
+        self._lock = threading.Lock()
+        self._rebuilding = threading.Lock()
+
+    def connect(self):
+        return sqlite3.connect(self.db_path)
+
+    def _stored_key(self):
+        if not os.path.exists(self.db_path):
+            return None
+        try:
+            with closing(self.connect()) as conn:
+                rows = dict(conn.execute("SELECT key, value FROM meta").fetchall())
+        except sqlite3.Error:
+            return None
+        if rows.get("version") != str(INDEX_VERSION):
+            return None
+        return {
+            "size": int(rows.get("size", -1)),
+            "mtime_ns": int(rows.get("mtime_ns", -1)),
+            "sha256": rows.get("sha256"),
+        }
+
+    def ensure_current(self, workbook_path, load_catalog):
+        """
+        Make sure there is an index for journals.xlsx. Only the very first
+        build (or one after an INDEX_VERSION bump) happens on this thread; a
+        changed workbook is re-indexed in the background while searches keep
+        using the previous index.
+        """
+        if not os.path.exists(workbook_path):
+            return
+
+        st = os.stat(workbook_path)
+        stat_key = (st.st_size, st.st_mtime_ns)
+        key = self._key
+        if key and (key["size"], key["mtime_ns"]) == stat_key:
+            return
+        if stat_key == self._failed:
+            return
+
+        if key is None and self._stored_key() is None:
+            with self._lock:
+                self._refresh(workbook_path, load_catalog)
+            return
+
+        if self._rebuilding.acquire(blocking=False):
+            threading.Thread(
+                target=self._rebuild, args=(workbook_path, load_catalog, stat_key),
+                name="rebuild-journal-search", daemon=True,
+            ).start()
+
+    def _rebuild(self, workbook_path, load_catalog, stat_key):
+        try:
+            with self._lock:
+                self._refresh(workbook_path, load_catalog)
+        except Exception as e:
+            # keep searching the old index; retry once the workbook changes again
+            self._failed = stat_key
+            print("Rebuilding the journal search index failed:", e)
+        finally:
+            self._rebuilding.release()
+
+    def _refresh(self, workbook_path, load_catalog):
+        """Adopt the stored index if it matches the workbook, else build a new one."""
+        st = os.stat(workbook_path)
+        key = self._stored_key()
+        if key and key["size"] == st.st_size and (
+            key["mtime_ns"] == st.st_mtime_ns or key["sha256"] == file_sha256(workbook_path)
+        ):
+            self._key = dict(key, mtime_ns=st.st_mtime_ns)
+            return
+
+        # key first: if the workbook is replaced while it is parsed, the
+        # index is stored under the old key and rebuilt on the next search
+        key = workbook_key(workbook_path)
+        self.build(load_catalog(), workbook_path, key=key)
+
+    def build(self, journals_by_sheet, workbook_path, key=None):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        tmp_path = f"{self.db_path}.{os.getpid()}.tmp"
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+        key = key or workbook_key(workbook_path)
+        conn = sqlite3.connect(tmp_path)
+        try:
+            conn.executescript(SCHEMA)
+            conn.executemany(
+                "INSERT INTO journal_fts (name, issn, subject, details, sheet, link, price) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    (*journal_fields(j), sheet, j["link"], j["price"])
+                    for sheet, journals in journals_by_sheet.items()
+                    for j in journals
+                ),
+            )
+            conn.execute("INSERT INTO journal_fts (journal_fts, rank) VALUES ('rank', ?)", (RANK,))
+            (rows,) = conn.execute("SELECT COUNT(*) FROM journal_fts").fetchone()
+            conn.execute("INSERT INTO common_word SELECT term FROM journal_vocab WHERE doc * 2 >= ?", (rows,))
+            conn.execute("INSERT INTO journal_fts (journal_fts) VALUES ('optimize')")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [("version", str(INDEX_VERSION))]
+                + [(k, str(key[k])) for k in ("size", "mtime_ns", "sha256")],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        os.replace(tmp_path, self.db_path)
+        self._key = key
+
+    def search(self, query, limit=20):
+        """Ranked matches with <mark>-highlighted name and snippet."""
+        terms = query_terms(query)
+        if not terms or not os.path.exists(self.db_path):
+            return []
+
+        match = fts_query(terms)
+        with closing(self.connect()) as conn:
+            weighted = weighted_terms(conn, terms)
+            if weighted:
+                ranked = rank_window(conn, match_window(conn, match, RANK_WINDOW), fts_query(weighted), limit)
+            else:
+                # every word is in most journals: bm25 weighs them ~0 and
+                # scoring still walks their whole posting lists (~3ms a word
+                # at 100k), so keep catalog order
+                ranked = match_window(conn, match, limit)
+            if not ranked:
+                return []
+
+            rows = conn.execute(
+                "SELECT rowid, name, details, sheet, link, price FROM journal_fts "
+                f"WHERE rowid IN ({', '.join('?' * len(ranked))})",
+                ranked,
+            ).fetchall()
+
+        # highlighting happens here for the handful of rows kept, rather than
+        # through FTS5 highlight()/snippet() which re-scan the whole match set
+        pattern = highlight_re(terms)
+        by_id = {row[0]: row for row in rows}
+        results = []
+        for rowid in ranked:
+            _, name, details, sheet, link, price = by_id[rowid]
+            results.append({
+                "id": rowid,
+                "sheet": sheet,
+                "link": link,
+                "price": price,
+                "name": mark(name or link, pattern),
+                "snippet": snippet(details, name, pattern),
+            })
+        return results
@@ -0,0 +1,105 @@
+import hashlib
+import os
+import pickle
+
+# bump when the shape of the parsed journal blocks changes
+SNAPSHOT_VERSION = 3
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def workbook_key(path, with_hash=True, reader=None):
+    """Size / mtime / content hash of the workbook the snapshot was built from, and the reader used."""
+    st = os.stat(path)
+    return {
+        "version": SNAPSHOT_VERSION,
+        "reader": reader,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "sha256": file_sha256(path) if with_hash else None,
+    }
+
+
+def write_snapshot(snapshot_path, workbook_path, data, key=None):
+    """
+    Atomically write the parsed catalog next to the key of its workbook.
+    Pass the `key` taken before parsing; it defaults to the file as it is now.
+    """
+    os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+    payload = {"key": key or workbook_key(workbook_path), "data": data}
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, snapshot_path)
+
+
+def read_snapshot(snapshot_path, workbook_path, reader=None):
+    """
+    Return the cached catalog if it still matches the workbook, else None.
+
+    Size + mtime is checked first; only when those differ (fresh checkout,
+    copied file) is the workbook hashed to decide whether it really changed.
+    """
+    if not os.path.exists(snapshot_path) or not os.path.exists(workbook_path):
+        return None
+
+    try:
+        with open(snapshot_path, "rb") as f:
+            payload = pickle.load(f)
+        key = payload["key"]
+        data = payload["data"]
+    except Exception as e:
+        print("Ignoring unreadable journal snapshot:", e)
+        return None
+
+    if key.get("version") != SNAPSHOT_VERSION or key.get("reader") != reader:
+        return None
+
+    current = workbook_key(workbook_path, with_hash=False)
+    if current["size"] == key["size"] and current["mtime_ns"] == key["mtime_ns"]:
+        return data
+
+    if current["size"] != key["size"] or file_sha256(workbook_path) != key["sha256"]:
+        return None
+
+    # same content, new mtime: refresh the key so the next boot skips hashing
+    try:
+        write_snapshot(snapshot_path, workbook_path, data, key=dict(key, mtime_ns=current["mtime_ns"]))
+    except OSError:
+        pass
+    return data
+
+
+def load_with_snapshot(workbook_path, snapshot_path, loader, reader=None):
+    """
+    Serve the catalog from the snapshot, re-parsing only when the workbook
+    (or the `reader` that parsed it) changed.
+    """
+    data = read_snapshot(snapshot_path, workbook_path, reader)
+    if data is not None:
+        return data
+
+    try:
+        # keyed on the file as it was before parsing: a workbook replaced
+        # mid-parse must not get the old data saved under its key
+        key = workbook_key(workbook_path, reader=reader)
+    except OSError:
+        key = None
+    data = loader(workbook_path)
+    if key is not None:
+        try:
+            after = workbook_key(workbook_path, with_hash=False)
+            if (after["size"], after["mtime_ns"]) != (key["size"], key["mtime_ns"]):
+                print("Workbook changed while parsing, not writing the snapshot:", workbook_path)
+                return data
+            write_snapshot(snapshot_path, workbook_path, data, key=key)
+        except OSError as e:
+            # read-only filesystems (e.g. serverless) just keep the parsed copy
+            print("Could not write journal snapshot:", e)
+    return data
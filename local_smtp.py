@@ -0,0 +1,99 @@
+"""
+Minimal SMTP sink for running the mail outbox offline.
+
+Accepts every message, keeps it in memory and counts connections. Delays
+can be added to mimic a remote server (connect_delay for the TCP/TLS
+handshake and greeting, command_delay per SMTP command).
+
+    python local_smtp.py [--port 1025]
+    MAIL_SERVER=localhost MAIL_PORT=1025 MAIL_USE_TLS=False flask run
+"""
+import argparse
+import socketserver
+import threading
+import time
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+
+    def reply(self, line):
+        if self.server.command_delay:
+            time.sleep(self.server.command_delay)
+        self.wfile.write(line.encode() + b"\r\n")
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        if server.connect_delay:
+            time.sleep(server.connect_delay)
+        self.reply("220 localhost local SMTP sink")
+
+        sender, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors="replace").strip()
+            verb = command[:4].upper()
+
+            if verb in ("HELO", "EHLO"):
+                self.reply("250 localhost")
+            elif verb == "MAIL":
+                sender, recipients = command[10:].strip(), []
+                self.reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command[8:].strip())
+                self.reply("250 OK")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = []
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data.append(chunk[1:] if chunk.startswith(b"..") else chunk)
+                with server.lock:
+                    server.messages.append({"from": sender, "to": recipients, "data": b"".join(data)})
+                if server.verbose:
+                    print(f"Message from {sender} to {', '.join(recipients)} ({sum(map(len, data))} bytes)")
+                self.reply("250 OK: queued")
+            elif verb in ("RSET", "NOOP"):
+                self.reply("250 OK")
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("502 Command not implemented")
+
+
+class LocalSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host="127.0.0.1", port=0, connect_delay=0.0, command_delay=0.0, verbose=False):
+        super().__init__((host, port), SMTPHandler)
+        self.connect_delay = connect_delay
+        self.command_delay = command_delay
+        self.verbose = verbose
+        self.connections = 0
+        self.messages = []
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="local-smtp", daemon=True).start()
+        return self
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    args = parser.parse_args()
+    server = LocalSMTPServer(args.host, args.port, verbose=True)
+    print(f"SMTP sink listening on {args.host}:{server.port}")
+    server.serve_forever()
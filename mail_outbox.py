@@ -0,0 +1,142 @@
+import json
+import smtplib
+import time
+
+from flask_mail import BadHeaderError, Message
+
+from metrics import REGISTRY
+from sqlite_queue import QueueWorker, SqliteQueue
+
+# messages claimed and sent per round over the open connection
+BATCH_SIZE = 20
+
+# retry delay after a failed send: BACKOFF_BASE * 2**attempts, capped
+BACKOFF_BASE = 5.0
+MAX_BACKOFF = 30 * 60
+
+# after this many failed attempts a message is parked as 'failed'
+MAX_ATTEMPTS = 8
+
+# a batch claimed by a worker that then died is sent again after this long
+CLAIM_TIMEOUT = 5 * 60
+
+# the sender also wakes up on its own this often (seconds)
+POLL_INTERVAL = 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    subject TEXT NOT NULL,
+    sender TEXT,
+    recipients TEXT NOT NULL,
+    body TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    claimed_at REAL,
+    sent_at REAL,
+    created_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_outbox_pending ON outbox (status, next_attempt_at);
+"""
+
+# failures of one message; anything else is taken as the connection failing,
+# and the rest of the batch is retried later on a new connection
+MESSAGE_ERRORS = (
+    smtplib.SMTPRecipientsRefused,
+    smtplib.SMTPSenderRefused,
+    smtplib.SMTPDataError,
+    BadHeaderError,
+    AssertionError,
+    ValueError,
+)
+
+
+class MailOutbox(SqliteQueue):
+    """
+    SQLite queue of outgoing mail. Status goes pending -> sending -> sent,
+    or back to pending with a retry delay, or 'failed' after MAX_ATTEMPTS.
+    """
+
+    table = "outbox"
+    schema = SCHEMA
+    batch_size = BATCH_SIZE
+    backoff_base = BACKOFF_BASE
+    max_backoff = MAX_BACKOFF
+    max_attempts = MAX_ATTEMPTS
+    claim_timeout = CLAIM_TIMEOUT
+
+    def add(self, subject, recipients, body, sender=None):
+        cur = self.connect().execute(
+            "INSERT INTO outbox (subject, sender, recipients, body, created_at) VALUES (?, ?, ?, ?, ?)",
+            (subject, sender, json.dumps(list(recipients)), body, time.time()),
+        )
+        return cur.lastrowid
+
+    def claim(self, limit=BATCH_SIZE):
+        """Mark up to `limit` due messages as sending; returns [(id, Message)]."""
+        rows = self.claim_rows(("subject", "sender", "recipients", "body"), limit)
+        return [
+            (msg_id, Message(subject=subject, sender=sender, recipients=json.loads(recipients), body=body))
+            for msg_id, subject, sender, recipients, body in rows
+        ]
+
+    def mark_sent(self, msg_id):
+        self.connect().execute(
+            "UPDATE outbox SET status = 'sent', sent_at = ?, last_error = NULL WHERE id = ?",
+            (time.time(), msg_id),
+        )
+
+
+class MailSender(QueueWorker):
+    """
+    Background thread draining the outbox through Flask-Mail.
+
+    One SMTP connection (TLS handshake and login included) is opened per
+    drain and reused for every message waiting in the queue, instead of one
+    connection per message.
+    """
+
+    name = "mail-sender"
+    poll_interval = POLL_INTERVAL
+
+    def __init__(self, app, mail, outbox):
+        super().__init__(outbox)
+        self.app = app
+        self.mail = mail
+        self.outbox = outbox
+
+    def drain(self):
+        """Send everything that is due over one connection; returns the number sent."""
+        sent = 0
+        with self.app.app_context():
+            # Message() reads the default sender from the app
+            remaining = self.outbox.claim()
+            if not remaining:
+                return 0
+            try:
+                with self.mail.connect() as conn:
+                    while remaining:
+                        msg_id, msg = remaining[0]
+                        try:
+                            with REGISTRY.timed("external_call_duration_seconds", service="smtp", operation="send"):
+                                conn.send(msg)
+                        except MESSAGE_ERRORS as e:
+                            print(f"Mail {msg_id} failed:", e)
+                            self.outbox.mark_failed([msg_id], f"{type(e).__name__}: {e}")
+                        else:
+                            self.outbox.mark_sent(msg_id)
+                            sent += 1
+                        remaining.pop(0)
+                        if not remaining:
+                            remaining = self.outbox.claim()
+            except Exception as e:
+                print("SMTP connection failed:", e)
+                REGISTRY.inc("external_call_errors_total", service="smtp", operation="connection")
+                if remaining:
+                    # the server, not these messages, failed: retry them
+                    # without spending their attempts
+                    self.outbox.mark_failed([m for m, _ in remaining], f"{type(e).__name__}: {e}",
+                                            count_attempt=False)
+        return sent
@@ -0,0 +1,242 @@
+"""
+Counters and histograms in Prometheus text format, summed over every
+worker process.
+
+Each process records into the in-memory REGISTRY (no I/O on the request
+path) and periodically adds what it collected since the last flush to a
+shared SQLite file; /admin/metrics renders the totals from that file, so
+the numbers cover all gunicorn workers and survive restarts.
+
+    from metrics import REGISTRY
+    REGISTRY.inc("bookings_total")
+    with REGISTRY.timed("external_call_duration_seconds", service="smtp", operation="send"):
+        ...
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import ContextDecorator
+
+# seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# SQL statements per request
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 1000)
+
+# a worker adds its numbers to the shared file at most this often (seconds)
+FLUSH_INTERVAL = 5.0
+
+DESCRIPTIONS = {
+    "http_requests_total": "HTTP requests by endpoint, method and status.",
+    "http_request_duration_seconds": "Time from before_request to after_request.",
+    "db_queries_per_request": "SQL statements executed while handling one request.",
+    "db_queries_total": "SQL statements executed by requests, by endpoint.",
+    "db_query_seconds_total": "Time spent in SQL statements by requests, by endpoint.",
+    "external_call_duration_seconds": "Calls to Google Sheets and the SMTP server.",
+    "external_call_errors_total": "Failed calls to Google Sheets and the SMTP server.",
+    "excel_load_duration_seconds": "Parsing an uploaded workbook.",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS metric (
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    labels TEXT NOT NULL,
+    field TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, labels, field)
+);
+"""
+
+
+def label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    """
+    Per-process counters and histograms. Histogram buckets are stored
+    non-cumulative and turned into Prometheus' cumulative `le` buckets
+    when rendered.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._counters = defaultdict(float)
+        # (name, labels) -> [buckets, per-bucket counts (+Inf last), sum, count]
+        self._histograms = {}
+
+    def _check_fork(self):
+        # a forked worker starts with its parent's unflushed numbers; drop them
+        if self._pid != os.getpid():
+            self._reset()
+
+    def inc(self, name, value=1.0, **labels):
+        with self._lock:
+            self._check_fork()
+            self._counters[(name, label_key(labels))] += value
+
+    def observe(self, name, value, buckets=LATENCY_BUCKETS, **labels):
+        key = (name, label_key(labels))
+        with self._lock:
+            self._check_fork()
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [buckets, [0] * (len(buckets) + 1), 0.0, 0]
+            i = 0
+            while i < len(buckets) and value > buckets[i]:
+                i += 1
+            hist[1][i] += 1
+            hist[2] += value
+            hist[3] += 1
+
+    def timed(self, name, **labels):
+        """Context manager / decorator observing the elapsed seconds into `name`."""
+        return Timer(self, name, labels)
+
+    def drain(self):
+        """Everything recorded since the last drain as (name, kind, labels, field, value) rows."""
+        with self._lock:
+            self._check_fork()
+            counters, histograms = self._counters, self._histograms
+            self._counters, self._histograms = defaultdict(float), {}
+
+        rows = []
+        for (name, labels), value in counters.items():
+            rows.append((name, "counter", json.dumps(labels), "", value))
+        for (name, labels), (buckets, counts, total, count) in histograms.items():
+            labels = json.dumps(labels)
+            # zero buckets too, so every series exposes the full bucket set
+            for le, n in zip((*buckets, math.inf), counts):
+                rows.append((name, "histogram", labels, f"bucket:{le:g}", n))
+            rows.append((name, "histogram", labels, "sum", total))
+            rows.append((name, "histogram", labels, "count", count))
+        return rows
+
+
+class Timer(ContextDecorator):
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # a fresh timer per decorated call, so concurrent calls don't share _start
+        return Timer(self.registry, self.name, self.labels)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self._start, **self.labels)
+        if exc_type is not None and self.name == "external_call_duration_seconds":
+            self.registry.inc("external_call_errors_total", **self.labels)
+        return False
+
+
+class MetricsStore:
+    """The shared SQLite file every worker adds its drained numbers to."""
+
+    def __init__(self, db_path, registry, flush_interval=FLUSH_INTERVAL):
+        self.db_path = db_path
+        self.registry = registry
+        self.flush_interval = flush_interval
+        self._local = threading.local()
+        self._flushed_at = time.monotonic()
+        self._flush_lock = threading.Lock()
+
+    def connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def flush(self):
+        """Add this process's numbers since the last flush to the shared totals."""
+        with self._flush_lock:
+            self._flushed_at = time.monotonic()
+            rows = self.registry.drain()
+            if not rows:
+                return 0
+            conn = self.connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    "INSERT INTO metric (name, kind, labels, field, value) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (name, labels, field) DO UPDATE SET value = value + excluded.value",
+                    rows,
+                )
+            return len(rows)
+
+    def maybe_flush(self):
+        if time.monotonic() - self._flushed_at >= self.flush_interval:
+            try:
+                self.flush()
+            except sqlite3.Error as e:
+                print("Metrics flush failed:", e)
+
+    def render(self):
+        """All totals in the Prometheus text exposition format."""
+        rows = self.connect().execute(
+            "SELECT name, kind, labels, field, value FROM metric ORDER BY name, labels"
+        ).fetchall()
+
+        families = {}
+        for name, kind, labels, field, value in rows:
+            series = families.setdefault(name, (kind, {}))[1].setdefault(labels, {})
+            series[field] = value
+
+        out = []
+        for name, (kind, series) in families.items():
+            out.append(f"# HELP {name} {DESCRIPTIONS.get(name, name)}")
+            out.append(f"# TYPE {name} {kind}")
+            for labels, fields in series.items():
+                labels = dict(json.loads(labels))
+                if kind == "counter":
+                    out.append(f"{name}{format_labels(labels)} {format_value(fields[''])}")
+                    continue
+                buckets = sorted(
+                    (float(f.split(":", 1)[1]), v) for f, v in fields.items() if f.startswith("bucket:")
+                )
+                cumulative = 0
+                for le, n in buckets:
+                    cumulative += n
+                    if le != math.inf:
+                        out.append(f"{name}_bucket{format_labels(labels, le=format_value(le))} {format_value(cumulative)}")
+                out.append(f"{name}_bucket{format_labels(labels, le='+Inf')} {format_value(fields.get('count', 0))}")
+                out.append(f"{name}_sum{format_labels(labels)} {format_value(fields.get('sum', 0))}")
+                out.append(f"{name}_count{format_labels(labels)} {format_value(fields.get('count', 0))}")
+        return "\n".join(out) + "\n"
+
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(labels, **extra):
+    labels = {**labels, **extra}
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{escape_label(v)}"' for k, v in labels.items()) + "}"
+
+
+def format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+REGISTRY = Registry()
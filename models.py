@@ -1,3 +1,5 @@
+import enum
+
 from extensions import db
 
 class AuthorSheet(db.Model):
@@ -14,17 +16,70 @@ class AuthorTable(db.Model):
     __tablename__ = "author_table"
 
     id = db.Column(db.Integer, primary_key=True)
-    sheet_id = db.Column(db.Integer, db.ForeignKey("author_sheet.id"), nullable=False)
+    sheet_id = db.Column(db.Integer, db.ForeignKey("author_sheet.id"), nullable=False, index=True)
     title = db.Column(db.String(255))
 
     positions = db.relationship("AuthorPosition", backref="table", lazy=True)
 
 
+class PositionStatus(str, enum.Enum):
+    AVAILABLE = "available"
+    BOOKED = "booked"
+    UNKNOWN = "unknown"
+
+    @classmethod
+    def from_text(cls, text):
+        """The workbook's free-form status ("Available", "BOOKED ", ...) as a PositionStatus."""
+        text = (text or "").strip().lower()
+        if text.startswith("avail"):
+            return cls.AVAILABLE
+        if text.startswith("book"):
+            return cls.BOOKED
+        return cls.UNKNOWN
+
+
 class AuthorPosition(db.Model):
     __tablename__ = "author_position"
+    # positions of a table with a given status are one index lookup;
+    # table_id leads, so it also serves as the foreign key index
+    __table_args__ = (
+        db.Index("ix_author_position_table_id_status_code", "table_id", "status_code"),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     table_id = db.Column(db.Integer, db.ForeignKey("author_table.id"), nullable=False)
     level = db.Column(db.String(100))
     amount = db.Column(db.String(100))
+    # normalized rupee value of `amount`; indexed so price ranges and
+    # cheapest-first listings are an index range scan
+    amount_value = db.Column(db.Float, index=True)
+    # status as written in the workbook, and normalized
     status = db.Column(db.String(200))
+    status_code = db.Column(
+        db.Enum(PositionStatus, native_enum=False, length=16, validate_strings=True,
+                values_callable=lambda e: [m.value for m in e]),
+        nullable=False, default=PositionStatus.UNKNOWN, server_default=PositionStatus.UNKNOWN.value,
+    )
+
+
+class AuthorSheetView(db.Model):
+    """
+    Denormalized read model for /authors: one JSON payload per sheet
+    (tables and positions included), rebuilt under a new version number by
+    every migration.
+    """
+    __tablename__ = "author_sheet_view"
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, index=True)
+    position = db.Column(db.Integer, nullable=False)
+    name = db.Column(db.String(100))
+    payload = db.Column(db.Text, nullable=False)
+
+
+def positions_query(sheet_id, status=None):
+    """Positions of one sheet, optionally with one PositionStatus, in table order."""
+    query = AuthorPosition.query.join(AuthorTable).filter(AuthorTable.sheet_id == sheet_id)
+    if status is not None:
+        query = query.filter(AuthorPosition.status_code == PositionStatus(status))
+    return query.order_by(AuthorTable.id, AuthorPosition.id)
@@ -0,0 +1,102 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from flask import g, make_response, request, session
+
+# pages kept per worker; least recently used ones are dropped first
+MAX_ENTRIES = 256
+
+
+class PageCache:
+    """
+    In-process LRU of rendered pages for routes that only show module-level
+    data.
+
+    Entries are keyed on endpoint, view args, query string and a version
+    tuple: the cache-wide `version()` (asset manifests, ...) plus the
+    route's own, so a reloaded catalog or a new asset build simply stops
+    matching the old entries. Every response carries a strong ETag (hash of
+    the body) and If-None-Match is answered with 304.
+
+    Templates rendered for the cache see `g.page_cache_render`, which the
+    context processor uses to leave per-request values such as `now` out.
+    """
+
+    def __init__(self, version=lambda: (), max_entries=MAX_ENTRIES, enabled=True):
+        self.version = version
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+    def cached(self, version=None):
+        """Route decorator; `version` returns whatever the route's output also depends on."""
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                # a profiled request should show the real rendering work
+                if not self.enabled or request.method != "GET" or g.get("profiler"):
+                    return view(*args, **kwargs)
+
+                key = (
+                    request.endpoint,
+                    tuple(sorted(kwargs.items())),
+                    tuple(sorted(request.args.items(multi=True))),
+                    self.version(),
+                    version() if version else (),
+                )
+                entry = self.get(key)
+                if entry is None:
+                    g.page_cache_render = True
+                    try:
+                        response = make_response(view(*args, **kwargs))
+                    finally:
+                        g.page_cache_render = False
+                    # errors, redirects and anything touching the session go out uncached
+                    if response.status_code != 200 or session.modified or "Set-Cookie" in response.headers:
+                        return response
+                    body = response.get_data()
+                    entry = (body, response.content_type, hashlib.sha256(body).hexdigest()[:32])
+                    self.put(key, entry)
+
+                body, content_type, etag = entry
+                response = make_response(body)
+                response.content_type = content_type
+                response.set_etag(etag)
+                # let browsers keep the page but check back every time
+                response.cache_control.no_cache = True
+                return response.make_conditional(request)
+
+            return wrapper
+
+        return decorator
@@ -0,0 +1,131 @@
+import bisect
+import re
+
+UNITS = {
+    "k": 1_000,
+    "thousand": 1_000,
+    "l": 100_000,
+    "lac": 100_000,
+    "lacs": 100_000,
+    "lakh": 100_000,
+    "lakhs": 100_000,
+}
+
+# optional currency, number (with 1,000 / 1,00,000 grouping), optional unit;
+# the number must not continue a word or number ("Q1", "v2.5") and a unit
+# must not run into more letters ("10 languages" is not 10 lakh)
+AMOUNT_RE = re.compile(
+    r"(?<![\w.])(₹|rs\.?|inr\.?)?\s*(\d[\d,]*(?:\.\d+)?)\s*(lakhs|lakh|lacs|lac|thousand|k|l)?(?![a-z])"
+)
+RANGE_SEP_RE = re.compile(r"^\s*(?:-|–|—|to)\s*$")
+COMPOUND_SEP_RE = re.compile(r"^\s*(?:\+|and)?\s*$")
+
+
+def _amounts(text):
+    """
+    (value, unit, start, end) for every amount in lowercased text, skipping
+    percentages. When some amount has a currency or unit, bare numbers
+    that do not start a range ("Author 1 7k", "Q1 15k") are labels,
+    not prices, and are left out.
+    """
+    found = []
+    for m in AMOUNT_RE.finditer(text):
+        if text[m.end():m.end() + 1] == "%" or text[m.end():].lstrip().startswith("%"):
+            continue
+        number = m.group(2).replace(",", "").rstrip(".")
+        try:
+            value = float(number)
+        except ValueError:
+            continue
+        found.append((value, m.group(3), m.start(), m.end(), bool(m.group(1) or m.group(3))))
+
+    if not any(marked for *_, marked in found):
+        return [a[:4] for a in found]
+    out = []
+    for i, (value, unit, start, end, marked) in enumerate(found):
+        starts_range = (
+            i + 1 < len(found) and found[i + 1][4] and RANGE_SEP_RE.match(text[end:found[i + 1][2]])
+        )
+        if marked or starts_range:
+            out.append((value, unit, start, end))
+    return out
+
+
+def parse_price(text):
+    """
+    Normalize a free-form price to (low, high) rupees, or None.
+
+    Understands "3.5k", "1.0L", "2 lakh", "1 lakh 20k", "₹25,000",
+    "INR. 40k", "Price: 30k" and ranges such as "10-15k", "10k to 15k" or
+    "₹10,000 – ₹15,000". A single amount gives low == high.
+    """
+    if not text:
+        return None
+
+    s = str(text).lower()
+    # "... Price: 30k" – only look at what follows the label
+    label = s.find("price")
+    if label >= 0:
+        s = s[label + len("price"):]
+
+    amounts = _amounts(s)
+    if not amounts:
+        return None
+
+    def take(i):
+        value, unit, _, end = amounts[i]
+        value *= UNITS.get(unit, 1)
+        i += 1
+        # "1 lakh 20k" → 120000
+        if unit in UNITS and UNITS[unit] == 100_000 and i < len(amounts):
+            nvalue, nunit, nstart, nend = amounts[i]
+            if nunit in ("k", "thousand") and COMPOUND_SEP_RE.match(s[end:nstart]):
+                value += nvalue * UNITS[nunit]
+                end = nend
+                i += 1
+        return value, unit, end, i
+
+    low, low_unit, end, i = take(0)
+    high = low
+
+    if i < len(amounts) and RANGE_SEP_RE.match(s[end:amounts[i][2]]):
+        raw_low = amounts[0][0]
+        high, high_unit, _, _ = take(i)
+        # "10-15k": the unit written once applies to both ends
+        if low_unit is None and high_unit is not None:
+            low = raw_low * UNITS[high_unit]
+
+    if high < low:
+        low, high = high, low
+    return low, high
+
+
+def price_value(text):
+    """Numeric (lower bound) value of a price string, None if it has no amount."""
+    parsed = parse_price(text)
+    return parsed[0] if parsed else None
+
+
+class PriceIndex:
+    """
+    Keys sorted by numeric price, so "everything under 10k, cheapest first"
+    is a bisect on the value list plus a slice of the key list.
+    """
+
+    def __init__(self, items):
+        pairs = sorted((value, key) for value, key in items if value is not None)
+        self.values = [value for value, _ in pairs]
+        self.keys = [key for _, key in pairs]
+
+    def __len__(self):
+        return len(self.keys)
+
+    def bounds(self, min_price=None, max_price=None):
+        """Positions [lo, hi) of the keys priced within min_price..max_price."""
+        lo = 0 if min_price is None else bisect.bisect_left(self.values, min_price)
+        hi = len(self.values) if max_price is None else bisect.bisect_right(self.values, max_price)
+        return lo, max(lo, hi)
+
+    def between(self, min_price=None, max_price=None):
+        lo, hi = self.bounds(min_price, max_price)
+        return self.keys[lo:hi]
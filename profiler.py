@@ -0,0 +1,233 @@
+"""
+Wall-clock sampling profiler for single requests.
+
+While a request is profiled a helper thread looks at the request thread's
+Python stack every `interval` seconds (sys._current_frames) and adds the
+time since its previous look to that stack. Template rendering, SQLAlchemy,
+the workbook parsers and time spent waiting on Sheets or SMTP all show up
+as the frames they were in. Requests that are not profiled pay nothing
+beyond the check that decides it.
+
+Profiles are saved as JSON under PROFILE_DIR and can be exported as
+collapsed stacks (flamegraph.pl, speedscope, ...) or speedscope's own
+format:
+
+    sampler = Sampler(threading.get_ident()).start()
+    ...
+    PROFILES.save(sampler.stop(), path="/journals", ...)
+"""
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+INTERVAL = 0.002
+# oldest profiles are deleted once there are more than this many
+MAX_PROFILES = 200
+MAX_DEPTH = 128
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def frame_label(code):
+    filename = code.co_filename
+    if filename.startswith(ROOT + os.sep):
+        filename = filename[len(ROOT) + 1:]
+    else:
+        # keep the part from the package on: .../site-packages/jinja2/environment.py
+        for marker in ("site-packages" + os.sep, "lib" + os.sep + "python"):
+            i = filename.rfind(marker)
+            if i != -1:
+                filename = filename[i + len(marker):]
+                break
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class Sampler:
+    """Samples one thread's stack on a background thread until stop()."""
+
+    def __init__(self, thread_id, interval=INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        # collapsed stack ("outer;...;inner") -> microseconds
+        self.stacks = {}
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        last = self.started
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                break
+            self._record(frame, now - last)
+            last = now
+
+    def _record(self, frame, elapsed):
+        labels = self._labels
+        stack = []
+        while frame is not None and len(stack) < MAX_DEPTH:
+            code = frame.f_code
+            label = labels.get(code)
+            if label is None:
+                label = labels[code] = frame_label(code)
+            stack.append(label)
+            frame = frame.f_back
+        key = ";".join(reversed(stack))
+        self.stacks[key] = self.stacks.get(key, 0) + int(elapsed * 1_000_000)
+        self.samples += 1
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.duration = time.perf_counter() - self.started
+        return self
+
+
+class ProfileStore:
+    """One JSON file per profile in `directory`, newest first."""
+
+    def __init__(self, directory, max_profiles=MAX_PROFILES):
+        self.directory = directory
+        self.max_profiles = max_profiles
+
+    def _path(self, profile_id):
+        # ids come from URLs
+        if not profile_id or os.sep in profile_id or profile_id.startswith("."):
+            raise KeyError(profile_id)
+        return os.path.join(self.directory, profile_id + ".json")
+
+    def save(self, sampler, **meta):
+        os.makedirs(self.directory, exist_ok=True)
+        created = datetime.now()
+        profile_id = f"{created:%Y%m%d-%H%M%S-%f}-{os.getpid()}"
+        profile = {
+            "id": profile_id,
+            "created": created.isoformat(timespec="seconds"),
+            "duration_ms": round(sampler.duration * 1000, 1),
+            "interval_ms": sampler.interval * 1000,
+            "samples": sampler.samples,
+            **meta,
+            "stacks": sampler.stacks,
+        }
+        path = self._path(profile_id)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, path)
+        self.prune()
+        return profile_id
+
+    def ids(self):
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted((n[:-5] for n in names if n.endswith(".json") and not n.startswith(".")), reverse=True)
+
+    def prune(self):
+        for profile_id in self.ids()[self.max_profiles:]:
+            try:
+                os.remove(self._path(profile_id))
+            except OSError:
+                pass
+
+    def get(self, profile_id):
+        try:
+            with open(self._path(profile_id), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise KeyError(profile_id)
+
+    def summaries(self, limit=100):
+        out = []
+        for profile_id in self.ids()[:limit]:
+            try:
+                profile = self.get(profile_id)
+            except KeyError:
+                continue  # pruned by another worker meanwhile
+            profile.pop("stacks")
+            out.append(profile)
+        return out
+
+
+def collapsed(profile):
+    """Brendan Gregg's folded format, one `stack weight` line per stack (microseconds)."""
+    return "".join(f"{stack} {weight}\n" for stack, weight in sorted(profile["stacks"].items()) if weight)
+
+
+def speedscope(profile):
+    """The profile as a speedscope.app "sampled" profile weighted in microseconds."""
+    frames, index = [], {}
+    samples, weights = [], []
+    for stack, weight in profile["stacks"].items():
+        if not weight:
+            continue
+        sample = []
+        for label in stack.split(";"):
+            i = index.get(label)
+            if i is None:
+                i = index[label] = len(frames)
+                name, _, where = label.rpartition(" (")
+                file, _, line = where.rstrip(")").rpartition(":")
+                frames.append({"name": name, "file": file, "line": int(line)})
+            sample.append(i)
+        samples.append(sample)
+        weights.append(weight)
+    name = f"{profile.get('method', '')} {profile.get('path', '')} ({profile['created']})".strip()
+    return {
+        "$schema": "https://www.speedscope.app/file-format-schema.json",
+        "name": name,
+        "exporter": "array-research profiler",
+        "shared": {"frames": frames},
+        "profiles": [{
+            "type": "sampled",
+            "name": name,
+            "unit": "microseconds",
+            "startValue": 0,
+            "endValue": sum(weights),
+            "samples": samples,
+            "weights": weights,
+        }],
+    }
+
+
+def read_sample_percent(path):
+    """Share of requests to profile, as saved from the admin page (0 when unset)."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return max(0.0, min(100.0, float(f.read().strip() or 0)))
+    except (OSError, ValueError):
+        return 0.0
+
+
+def write_sample_percent(path, percent):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f"{percent:g}\n")
+    os.replace(tmp_path, path)
+
+
+def top_frames(profile, limit=30):
+    """(label, self µs, total µs) for the frames the most time was spent in."""
+    own, total = {}, {}
+    for stack, weight in profile["stacks"].items():
+        labels = stack.split(";")
+        own[labels[-1]] = own.get(labels[-1], 0) + weight
+        for label in set(labels):
+            total[label] = total.get(label, 0) + weight
+    rows = [(label, own.get(label, 0), t) for label, t in total.items()]
+    rows.sort(key=lambda r: (r[1], r[2]), reverse=True)
+    return rows[:limit]
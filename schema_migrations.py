@@ -0,0 +1,206 @@
+"""
+Versioned schema changes for the main database (users.db).
+
+Every change is a numbered function registered with @migration; the
+versions already applied are listed in the schema_version table, and
+migrate_schema() applies the missing ones in order, each in its own
+transaction together with its version row.
+
+Migrations run as a deploy step, never when the app is imported (workers
+and serverless cold starts may sit on a read-only filesystem):
+
+    flask db-upgrade
+
+instance/users.db ships with the Vercel deploy, so it is committed
+already upgraded.
+
+Migration 1 spells out the tables as they were first shipped, so every
+later migration starts from a known schema whatever the models look like
+now. Databases created before the migrations existed may already have
+some of their columns, so the migrations check before they add one and
+use IF NOT EXISTS. New migrations go at the end with the next number;
+applied ones are never edited.
+"""
+import json
+from datetime import datetime
+
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from models import PositionStatus
+from prices import price_value
+
+MIGRATIONS = []
+
+VERSION_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    applied_at VARCHAR(32) NOT NULL
+)
+"""
+
+
+def migration(version, name):
+    def register(fn):
+        MIGRATIONS.append((version, name, fn))
+        return fn
+    return register
+
+
+def column_names(conn, table):
+    return {c["name"] for c in db.inspect(conn).get_columns(table)}
+
+
+def backfill(conn, table, column, rows):
+    """Set `column` from (id, value) pairs."""
+    if rows:
+        conn.execute(
+            db.text(f"UPDATE {table} SET {column} = :value WHERE id = :id"),
+            [{"id": row_id, "value": value} for row_id, value in rows],
+        )
+
+
+# --------------------------------------------------------
+# MIGRATIONS
+# --------------------------------------------------------
+
+@migration(1, "author tables")
+def create_author_tables(conn):
+    for statement in (
+        """CREATE TABLE IF NOT EXISTS author_sheet (
+            id INTEGER NOT NULL,
+            name VARCHAR(100),
+            info TEXT,
+            PRIMARY KEY (id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS author_table (
+            id INTEGER NOT NULL,
+            sheet_id INTEGER NOT NULL,
+            title VARCHAR(255),
+            PRIMARY KEY (id),
+            FOREIGN KEY(sheet_id) REFERENCES author_sheet (id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS author_position (
+            id INTEGER NOT NULL,
+            table_id INTEGER NOT NULL,
+            level VARCHAR(100),
+            amount VARCHAR(100),
+            status VARCHAR(200),
+            PRIMARY KEY (id),
+            FOREIGN KEY(table_id) REFERENCES author_table (id)
+        )""",
+        """CREATE TABLE IF NOT EXISTS author_sheet_view (
+            id INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            position INTEGER NOT NULL,
+            name VARCHAR(100),
+            payload TEXT NOT NULL,
+            PRIMARY KEY (id)
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_author_sheet_view_version ON author_sheet_view (version)",
+    ):
+        conn.execute(db.text(statement))
+
+
+@migration(2, "author_position.amount_value")
+def add_amount_value(conn):
+    if "amount_value" in column_names(conn, "author_position"):
+        return
+    conn.execute(db.text("ALTER TABLE author_position ADD COLUMN amount_value FLOAT"))
+    conn.execute(db.text(
+        "CREATE INDEX IF NOT EXISTS ix_author_position_amount_value ON author_position (amount_value)"
+    ))
+    rows = conn.execute(db.text("SELECT id, amount FROM author_position")).fetchall()
+    backfill(conn, "author_position", "amount_value", [(pid, price_value(amount)) for pid, amount in rows])
+
+
+@migration(3, "author_position.status_code")
+def add_status_code(conn):
+    if "status_code" not in column_names(conn, "author_position"):
+        conn.execute(db.text(
+            "ALTER TABLE author_position ADD COLUMN status_code VARCHAR(16) "
+            f"NOT NULL DEFAULT '{PositionStatus.UNKNOWN.value}'"
+        ))
+    rows = conn.execute(db.text("SELECT id, status FROM author_position")).fetchall()
+    backfill(conn, "author_position", "status_code",
+             [(pid, PositionStatus.from_text(status).value) for pid, status in rows])
+
+
+@migration(4, "author foreign key indexes")
+def add_author_foreign_key_indexes(conn):
+    conn.execute(db.text(
+        "CREATE INDEX IF NOT EXISTS ix_author_table_sheet_id ON author_table (sheet_id)"
+    ))
+    conn.execute(db.text(
+        "CREATE INDEX IF NOT EXISTS ix_author_position_table_id_status_code "
+        "ON author_position (table_id, status_code)"
+    ))
+
+
+@migration(5, "author read model backfill")
+def backfill_author_read_model(conn):
+    # databases migrated from the workbook before the read model existed
+    # have no author_sheet_view rows, so every /authors request took the
+    # slower sheets_from_tables() fallback
+    if conn.execute(db.text("SELECT 1 FROM author_sheet_view LIMIT 1")).first():
+        return
+    positions = {}
+    for table_id, level, amount, amount_value, status in conn.execute(db.text(
+        "SELECT table_id, level, amount, amount_value, status FROM author_position ORDER BY id"
+    )):
+        positions.setdefault(table_id, []).append(
+            {"level": level, "amount": amount, "amount_value": amount_value, "status": status}
+        )
+    tables = {}
+    for table_id, sheet_id, title in conn.execute(db.text(
+        "SELECT id, sheet_id, title FROM author_table ORDER BY id"
+    )):
+        tables.setdefault(sheet_id, []).append({"title": title, "positions": positions.get(table_id, [])})
+    rows = [
+        {"position": i, "name": name,
+         "payload": json.dumps({"name": name, "info": info, "tables": tables.get(sheet_id, [])})}
+        for i, (sheet_id, name, info) in enumerate(conn.execute(db.text(
+            "SELECT id, name, info FROM author_sheet ORDER BY id"
+        )))
+    ]
+    if rows:
+        conn.execute(db.text(
+            "INSERT INTO author_sheet_view (version, position, name, payload) "
+            "VALUES (1, :position, :name, :payload)"
+        ), rows)
+
+
+# --------------------------------------------------------
+# RUNNER
+# --------------------------------------------------------
+
+def applied_versions(engine=None):
+    engine = engine or db.engine
+    with engine.begin() as conn:
+        conn.execute(db.text(VERSION_TABLE))
+        return {row[0] for row in conn.execute(db.text("SELECT version FROM schema_version"))}
+
+
+def migrate_schema(engine=None):
+    """Apply every migration not recorded in schema_version; returns the versions applied."""
+    engine = engine or db.engine
+    done = applied_versions(engine)
+    applied = []
+    for version, name, fn in sorted(MIGRATIONS, key=lambda m: m[0]):
+        if version in done:
+            continue
+        try:
+            with engine.begin() as conn:
+                # claim the version first: another worker migrating at the same
+                # time waits on this row and then fails on the primary key
+                conn.execute(
+                    db.text("INSERT INTO schema_version (version, name, applied_at) VALUES (:v, :n, :t)"),
+                    {"v": version, "n": name, "t": datetime.now().isoformat(timespec="seconds")},
+                )
+                fn(conn)
+        except IntegrityError:
+            continue
+        print(f"Schema migration {version} ({name}) applied")
+        applied.append(version)
+    return applied
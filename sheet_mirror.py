@@ -0,0 +1,183 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from metrics import REGISTRY
+
+
+# an admin page older than this kicks off a background sync
+MAX_AGE = 60
+
+DEFAULT_PER_PAGE = 50
+MAX_PER_PAGE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheet_row (
+    row_number INTEGER PRIMARY KEY,
+    cells TEXT NOT NULL,
+    search TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+# substring search index; the trigram tokenizer needs SQLite 3.34+
+SEARCH_SCHEMA = "CREATE VIRTUAL TABLE IF NOT EXISTS sheet_search USING fts5(search, tokenize='trigram')"
+
+
+def column_letters(n):
+    from gspread.utils import rowcol_to_a1
+
+    return re.sub(r"\d+", "", rowcol_to_a1(1, max(1, n)))
+
+
+class SheetMirror:
+    """
+    Local SQLite copy of the Google Sheet for the admin pages.
+
+    A sync fetches only the rows below the last one mirrored (the sheet is
+    append-only in normal use); edits made by hand in the sheet need a full
+    resync. Pages are answered from SQLite with LIMIT/OFFSET, an expression
+    index per column for sorting and an FTS5 trigram index for substring
+    search (a LIKE scan on older SQLite builds).
+    """
+
+    def __init__(self, db_path, sheets, max_age=MAX_AGE):
+        self.db_path = db_path
+        self.sheets = sheets
+        self.max_age = max_age
+        self._local = threading.local()
+        self._syncing = threading.Lock()
+        self.fts = True
+
+    def connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(SCHEMA)
+            try:
+                conn.execute(SEARCH_SCHEMA)
+            except sqlite3.OperationalError:
+                self.fts = False
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _meta(self):
+        return dict(self.connect().execute("SELECT key, value FROM meta").fetchall())
+
+    def header(self):
+        header = self._meta().get("header")
+        return json.loads(header) if header else []
+
+    def synced_at(self):
+        value = self._meta().get("synced_at")
+        return float(value) if value else None
+
+    def _store(self, conn, start, rows, header):
+        entries = [(start + i, json.dumps(row), " ".join(row).lower()) for i, row in enumerate(rows)]
+        conn.executemany("INSERT OR REPLACE INTO sheet_row (row_number, cells, search) VALUES (?, ?, ?)", entries)
+        if self.fts:
+            conn.executemany("DELETE FROM sheet_search WHERE rowid = ?", [(e[0],) for e in entries])
+            conn.executemany("INSERT INTO sheet_search (rowid, search) VALUES (?, ?)", [(e[0], e[2]) for e in entries])
+        conn.executemany("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", [
+            ("header", json.dumps(header)),
+            ("last_row", str(start + len(rows) - 1)),
+            ("synced_at", str(time.time())),
+        ])
+        for i in range(len(header)):
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_sheet_row_col{i} ON sheet_row (json_extract(cells, '$[{i}]'))"
+            )
+
+    def sync(self, full=False):
+        """Pull new rows (or the whole sheet with full=True); returns the number of rows fetched."""
+        worksheet = self.sheets.worksheet()
+        meta = self._meta()
+        header = json.loads(meta["header"]) if "header" in meta else None
+
+        if full or header is None:
+            with REGISTRY.timed("external_call_duration_seconds", service="sheets", operation="get_all_values"):
+                values = worksheet.get_all_values()
+            header, rows = (values[0], values[1:]) if values else ([], [])
+            conn = self.connect()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DELETE FROM sheet_row")
+                if self.fts:
+                    conn.execute("DELETE FROM sheet_search")
+                self._store(conn, 2, rows, header)
+            return len(rows)
+
+        start = int(meta.get("last_row", 1)) + 1
+        with REGISTRY.timed("external_call_duration_seconds", service="sheets", operation="get_values"):
+            rows = worksheet.get_values(f"A{start}:{column_letters(len(header))}")
+        while rows and not any(rows[-1]):
+            rows.pop()
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._store(conn, start, rows, header)
+        return len(rows)
+
+    def sync_async(self):
+        if not self._syncing.acquire(blocking=False):
+            return False
+
+        def run():
+            try:
+                self.sync()
+            except Exception as e:
+                print("Sheet mirror sync failed:", e)
+            finally:
+                self._syncing.release()
+
+        threading.Thread(target=run, name="sheet-mirror", daemon=True).start()
+        return True
+
+    def ensure_fresh(self):
+        """Sync inline the very first time, afterwards only in the background."""
+        synced_at = self.synced_at()
+        if synced_at is None:
+            self.sync()
+        elif time.time() - synced_at > self.max_age:
+            self.sync_async()
+
+    def page(self, page=1, per_page=DEFAULT_PER_PAGE, sort=None, descending=False, query=None):
+        """Return (records, total) with records as {header: value} dicts, like get_all_records()."""
+        header = self.header()
+        per_page = max(1, min(int(per_page), MAX_PER_PAGE))
+        page = max(1, int(page))
+
+        conn = self.connect()
+        where, params = "", []
+        if query and self.fts and len(query) >= 3:
+            # a quoted trigram phrase matches any substring of the row text
+            where = "WHERE row_number IN (SELECT rowid FROM sheet_search WHERE sheet_search MATCH ?)"
+            params.append('"' + query.lower().replace('"', '""') + '"')
+        elif query:
+            where = "WHERE search LIKE ? ESCAPE '\\'"
+            escaped = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+
+        direction = "DESC" if descending else "ASC"
+        order = f"row_number {direction}"
+        if sort in header:
+            order = f"json_extract(cells, '$[{header.index(sort)}]') {direction}, row_number"
+
+        (total,) = conn.execute(f"SELECT COUNT(*) FROM sheet_row {where}", params).fetchone()
+        rows = conn.execute(
+            f"SELECT cells FROM sheet_row {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            [*params, per_page, (page - 1) * per_page],
+        ).fetchall()
+
+        records = []
+        for (cells,) in rows:
+            cells = json.loads(cells)
+            cells += [""] * (len(header) - len(cells))
+            records.append(dict(zip(header, cells)))
+        return records, total
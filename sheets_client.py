@@ -0,0 +1,167 @@
+import json
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from metrics import REGISTRY
+
+
+SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# refresh the access token in the background once it is this close to expiry
+# (google-auth itself only refreshes, inline, inside the last 3m45s)
+REFRESH_MARGIN = timedelta(minutes=10)
+
+# seconds before a Sheets API call gives up
+REQUEST_TIMEOUT = 15
+
+BOOKING_HEADER = ["name", "email", "service", "details", "timestamp"]
+
+# "A5:E", "A5:E20" — the rows part of an A1 range
+A1_ROWS_RE = re.compile(r"^[A-Z]+(\d+)(?::[A-Z]+(\d+)?)?$")
+
+
+def service_account_credentials(info_json=None, path=None):
+    # google-auth / gspread are imported on first use, not at app import
+    from google.oauth2.service_account import Credentials
+
+    if info_json:
+        return Credentials.from_service_account_info(json.loads(info_json), scopes=SCOPES)
+    return Credentials.from_service_account_file(path, scopes=SCOPES)
+
+
+def utcnow():
+    # google-auth keeps expiry as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class SheetsClient:
+    """
+    Process-wide gspread client and worksheet handle.
+
+    The service account is authorized once; the client's AuthorizedSession
+    (and with it the HTTP connection pool) and the opened worksheet are
+    reused by every request. The access token is refreshed on a background
+    thread shortly before it expires, so no request pays for the refresh.
+    """
+
+    def __init__(self, credentials_factory, sheet_id):
+        self.credentials_factory = credentials_factory
+        self.sheet_id = sheet_id
+        self._client = None
+        self._worksheet = None
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def _connect(self):
+        import gspread
+
+        with REGISTRY.timed("external_call_duration_seconds", service="sheets", operation="authorize"):
+            creds = self.credentials_factory()
+            client = gspread.authorize(creds)
+            client.set_timeout(REQUEST_TIMEOUT)
+            client.http_client.login()
+        self._client = client
+        self._worksheet = None
+
+    def _refresh(self):
+        try:
+            client = self._client
+            client.http_client.login()
+        except Exception as e:
+            # the session still refreshes on its own when the token runs out
+            print("Google Sheets token refresh failed:", e)
+        finally:
+            self._refreshing.release()
+
+    def _check_token(self):
+        creds = self._client.http_client.auth
+        if creds.expiry is None or creds.expiry - utcnow() > REFRESH_MARGIN:
+            return
+        if self._refreshing.acquire(blocking=False):
+            threading.Thread(target=self._refresh, name="sheets-token", daemon=True).start()
+
+    def worksheet(self):
+        with self._lock:
+            if self._client is None:
+                self._connect()
+            if self._worksheet is None:
+                self._worksheet = self._client.open_by_key(self.sheet_id).sheet1
+        self._check_token()
+        return self._worksheet
+
+    def reset(self):
+        """Drop the cached client, e.g. after the sheet was replaced or shared anew."""
+        with self._lock:
+            self._client = None
+            self._worksheet = None
+
+
+class LocalWorksheet:
+    """
+    In-memory stand-in for a gspread worksheet, for running offline.
+
+    Implements the calls the app makes; `latency` (seconds) is slept on
+    every call to mimic a round trip to the Sheets API.
+    """
+
+    def __init__(self, header=BOOKING_HEADER, latency=0.0):
+        self.latency = latency
+        self.calls = 0
+        self._rows = [list(header)]
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    @property
+    def row_count(self):
+        return len(self._rows)
+
+    def append_row(self, values, **kwargs):
+        self._round_trip()
+        with self._lock:
+            self._rows.append([str(v) if v is not None else "" for v in values])
+
+    def append_rows(self, values, **kwargs):
+        self._round_trip()
+        with self._lock:
+            self._rows.extend([str(v) if v is not None else "" for v in row] for row in values)
+
+    def get_all_values(self, **kwargs):
+        self._round_trip()
+        with self._lock:
+            return [list(row) for row in self._rows]
+
+    def get_values(self, range_name=None, **kwargs):
+        """Rows of an A1 range; columns are not clipped."""
+        if range_name is None:
+            return self.get_all_values()
+        m = A1_ROWS_RE.match(range_name)
+        if not m:
+            raise ValueError(f"unsupported range {range_name!r}")
+        self._round_trip()
+        start = int(m.group(1))
+        with self._lock:
+            end = int(m.group(2)) if m.group(2) else len(self._rows)
+            return [list(row) for row in self._rows[start - 1:end]]
+
+    def get_all_records(self, **kwargs):
+        header, *rows = self.get_all_values()
+        return [dict(zip(header, row + [""] * (len(header) - len(row)))) for row in rows]
+
+
+class LocalSheetsClient:
+    """SheetsClient look-alike handing out a single LocalWorksheet."""
+
+    def __init__(self, worksheet=None):
+        self._worksheet = worksheet or LocalWorksheet()
+
+    def worksheet(self):
+        return self._worksheet
+
+    def reset(self):
+        pass
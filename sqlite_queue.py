@@ -0,0 +1,154 @@
+import os
+import random
+import sqlite3
+import threading
+import time
+
+
+class SqliteQueue:
+    """
+    A table of work rows in its own SQLite file, shared by every worker
+    process: status goes pending -> sending -> done_status, or back to
+    pending with an exponential, jittered retry delay.
+
+    A batch is claimed in one write transaction, so two processes never
+    take the same rows; a batch claimed by a worker that then died is
+    claimed again after claim_timeout. Subclasses set the table, its
+    schema and the retry settings.
+    """
+
+    table = None
+    schema = None
+    # rows per claim()
+    batch_size = 100
+    # retry delay after a failure: backoff_base * 2**attempts, capped
+    backoff_base = 2.0
+    max_backoff = 15 * 60
+    # after this many counted failures a row is parked as 'failed' (None: retry forever)
+    max_attempts = None
+    claim_timeout = 5 * 60
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+    def connect(self):
+        """This thread's connection (autocommit; explicit BEGIN where needed)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # a row we acknowledged must survive a power cut
+            conn.execute("PRAGMA synchronous=FULL")
+            conn.executescript(self.schema)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def claim_rows(self, columns, limit=None):
+        """Mark up to `limit` due rows as sending and return them (id first, then `columns`)."""
+        now = time.time()
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                f"SELECT id, {', '.join(columns)} FROM {self.table} "
+                "WHERE (status = 'pending' AND next_attempt_at <= ?) "
+                "OR (status = 'sending' AND claimed_at < ?) "
+                "ORDER BY id LIMIT ?",
+                (now, now - self.claim_timeout, limit or self.batch_size),
+            ).fetchall()
+            conn.executemany(
+                f"UPDATE {self.table} SET status = 'sending', claimed_at = ? WHERE id = ?",
+                [(now, row[0]) for row in rows],
+            )
+        return rows
+
+    def mark_failed(self, ids, error, count_attempt=True):
+        """
+        Put rows back to pending with a retry delay, or park them as failed
+        after max_attempts. count_attempt=False reschedules without counting
+        the failure against the row (its batch failed, not the row itself).
+        """
+        now = time.time()
+        conn = self.connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for row_id in ids:
+                (attempts,) = conn.execute(f"SELECT attempts FROM {self.table} WHERE id = ?", (row_id,)).fetchone()
+                delay = min(self.max_backoff, self.backoff_base * 2 ** attempts) * random.uniform(0.8, 1.2)
+                if count_attempt:
+                    attempts += 1
+                failed = self.max_attempts is not None and attempts >= self.max_attempts
+                conn.execute(
+                    f"UPDATE {self.table} SET status = ?, attempts = ?, next_attempt_at = ?, "
+                    "claimed_at = NULL, last_error = ? WHERE id = ?",
+                    ("failed" if failed else "pending", attempts, now + delay, error, row_id),
+                )
+
+    def next_due_in(self):
+        """Seconds until the next pending or stuck row is due, or None when nothing waits."""
+        (due,) = self.connect().execute(
+            f"SELECT MIN(CASE status WHEN 'pending' THEN next_attempt_at ELSE claimed_at + ? END) "
+            f"FROM {self.table} WHERE status IN ('pending', 'sending')",
+            (self.claim_timeout,),
+        ).fetchone()
+        return None if due is None else max(0.0, due - time.time())
+
+    def counts(self):
+        return dict(self.connect().execute(f"SELECT status, COUNT(*) FROM {self.table} GROUP BY status").fetchall())
+
+
+class QueueWorker:
+    """
+    Background thread draining a SqliteQueue: it runs drain() when woken,
+    when the earliest retry is due, and every poll_interval seconds.
+
+    start() is called from a before_request hook, so every worker process
+    (including one that just replaced a crashed or redeployed worker) picks
+    up rows left pending, backed off or stuck in 'sending' without waiting
+    for new work to arrive. The thread is created after gunicorn forks.
+    """
+
+    name = "queue-worker"
+    poll_interval = 30
+
+    def __init__(self, queue):
+        self.queue = queue
+        self._event = threading.Event()
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start this process's thread if it is not running; it drains once straight away."""
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._event.set()
+
+    def _run(self):
+        timeout = 0
+        while True:
+            self._event.wait(timeout)
+            self._event.clear()
+            timeout = self.poll_interval
+            try:
+                self.drain()
+                # sleep until the earliest retry is due, not the full poll interval
+                due = self.queue.next_due_in()
+                if due is not None:
+                    timeout = min(self.poll_interval, due)
+            except Exception as e:
+                print(f"{self.name} error:", e)
+
+    def drain(self):
+        raise NotImplementedError
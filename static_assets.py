@@ -0,0 +1,183 @@
+"""
+Content-hashed copies of the files under static/ with precompressed
+gzip / brotli variants, plus the manifest the static view reads.
+
+    flask build-assets          (or: python static_assets.py)
+
+With static/dist/manifest.json present, url_for('static', filename=...)
+points at static/dist/<path>.<hash>.<ext>, which is served with a one-year
+immutable Cache-Control and the .br / .gz variant the browser accepts.
+"""
+import gzip
+import hashlib
+import json
+import os
+
+try:
+    import brotli
+except ImportError:  # gzip variants only
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+OUTPUT_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, "manifest.json")
+
+# uploads change without a build; derived/ names are content-hashed already
+SKIP_DIRS = ("dist", "uploads", "derived")
+
+COMPRESSIBLE = (".css", ".js", ".json", ".svg", ".txt", ".xml", ".map")
+# files that can mention other assets as "/static/<path>"
+REWRITABLE = (".css", ".js")
+MIN_COMPRESS_BYTES = 1024
+
+# (Content-Encoding, file suffix), in order of preference
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def static_files(static_dir=STATIC_DIR):
+    for root, dirs, files in os.walk(static_dir):
+        if root == static_dir:
+            dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in sorted(files):
+            if not name.startswith("."):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, static_dir).replace(os.sep, "/"), path
+
+
+def rewrite_references(data, manifest):
+    """Point "/static/<path>" strings in CSS/JS at the hashed files."""
+    text = data.decode("utf-8")
+    # longest first so "/static/js/a.json" is not cut short by "/static/js/a.js"
+    for rel in sorted(manifest, key=len, reverse=True):
+        text = text.replace(f"/static/{rel}", f"/static/{manifest[rel]['file']}")
+    return text.encode("utf-8")
+
+
+def compress(data, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, 9, mtime=0)
+
+
+def write_asset(rel, path, manifest, static_dir, output_dir):
+    """Write the hashed copy (and variants) of one file; returns its manifest entry."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if rel.endswith(REWRITABLE):
+        data = rewrite_references(data, manifest)
+
+    stem, ext = os.path.splitext(rel)
+    out_path = os.path.join(output_dir, f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}")
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    if not os.path.exists(out_path):
+        if rel.endswith(REWRITABLE):
+            with open(out_path, "wb") as f:
+                f.write(data)
+        else:
+            # unchanged bytes: don't store the images twice
+            try:
+                os.link(path, out_path)
+            except OSError:
+                with open(out_path, "wb") as f:
+                    f.write(data)
+
+    encodings = {}
+    if rel.endswith(COMPRESSIBLE) and len(data) >= MIN_COMPRESS_BYTES:
+        for encoding, suffix in ENCODINGS:
+            if encoding == "br" and brotli is None:
+                continue
+            if not os.path.exists(out_path + suffix):
+                packed = compress(data, encoding)
+                # not worth a second lookup for a few percent
+                if len(packed) > len(data) * 0.9:
+                    continue
+                with open(out_path + suffix, "wb") as f:
+                    f.write(packed)
+            encodings[encoding] = os.path.getsize(out_path + suffix)
+
+    return {
+        "file": os.path.relpath(out_path, static_dir).replace(os.sep, "/"),
+        "bytes": len(data),
+        "encodings": encodings,
+    }
+
+
+def build_assets(static_dir=STATIC_DIR, output_dir=OUTPUT_DIR, log=print):
+    """
+    Bring static/dist in line with static/. CSS/JS are written last so the
+    files they reference already have their hashed names. Hashed files no
+    longer in the manifest are removed. Returns (manifest, stats).
+    """
+    files = sorted(static_files(static_dir), key=lambda item: (item[0].endswith(REWRITABLE), item[0]))
+    manifest = {}
+    for rel, path in files:
+        try:
+            manifest[rel] = write_asset(rel, path, manifest, static_dir, output_dir)
+        except Exception as e:
+            print(f"Skipping {rel}:", e)
+
+    keep = {os.path.join(static_dir, e["file"]) for e in manifest.values()}
+    keep |= {f"{path}{suffix}" for path in set(keep) for _, suffix in ENCODINGS}
+    for root, _, names in os.walk(output_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            if name != "manifest.json" and path not in keep:
+                os.remove(path)
+
+    manifest_path = os.path.join(output_dir, "manifest.json")
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+
+    compressible = [e for e in manifest.values() if e["encodings"]]
+    stats = {
+        "files": len(manifest),
+        "compressible_bytes": sum(e["bytes"] for e in compressible),
+        "gzip_bytes": sum(e["encodings"].get("gzip", e["bytes"]) for e in compressible),
+        "br_bytes": sum(e["encodings"].get("br", e["bytes"]) for e in compressible),
+    }
+    log(f"{len(manifest)} assets hashed into {os.path.relpath(output_dir, static_dir)}/")
+    return manifest, stats
+
+
+def index_manifest(manifest):
+    """Lookups for the app: logical path -> hashed path, hashed path -> entry."""
+    return {
+        "urls": {rel: e["file"] for rel, e in manifest.items()},
+        "files": {e["file"]: e for e in manifest.values()},
+    }
+
+
+def choose_encoding(entry, accept_encoding):
+    """(Content-Encoding, suffix) of the best variant the client accepts, or (None, "")."""
+    accepted = set()
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(coding.strip())
+    for encoding, suffix in ENCODINGS:
+        if encoding in entry["encodings"] and encoding in accepted:
+            return encoding, suffix
+    return None, ""
+
+
+def stats_text(stats):
+    total = stats["compressible_bytes"] or 1
+    return (f"{stats['files']} assets; CSS/JS/JSON {stats['compressible_bytes'] / 1e3:.1f} kB -> "
+            f"gzip {stats['gzip_bytes'] / 1e3:.1f} kB ({stats['gzip_bytes'] / total:.0%}), "
+            + (f"brotli {stats['br_bytes'] / 1e3:.1f} kB ({stats['br_bytes'] / total:.0%})"
+               if brotli else "brotli skipped (module not installed)"))
+
+
+if __name__ == "__main__":
+    print(stats_text(build_assets()[1]))
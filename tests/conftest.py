@@ -0,0 +1,54 @@
+"""
+The app reads its database and side-store paths from the environment when
+it is imported, so point them all at a throwaway directory first.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+TMP = tempfile.mkdtemp()
+os.environ.update({
+    "DATABASE_URL": "sqlite:///" + os.path.join(TMP, "users.db"),
+    "SHEETS_BACKEND": "local",
+    "METRICS_DB": os.path.join(TMP, "metrics.db"),
+    "PROFILE_DIR": os.path.join(TMP, "profiles"),
+    "BOOKINGS_DB": os.path.join(TMP, "bookings.db"),
+    "MAIL_OUTBOX_DB": os.path.join(TMP, "outbox.db"),
+    "SHEET_MIRROR_DB": os.path.join(TMP, "sheet_mirror.db"),
+})
+
+
+def synthetic_sheets(tables, sheets=5, authors_per_table=6):
+    """Parsed author workbook (load_author_positions_from_excel shape) with `tables` tables."""
+    return [
+        {
+            "sheet": f"Sheet {s + 1}",
+            "info": "Synthetic author positions",
+            "tables": [
+                {
+                    "title": f"{t + 1}) Synthetic Article {s + 1}.{t + 1}",
+                    "authors": [
+                        {"level": f"Author {a + 1}", "price": f"{10 - a}K", "price_value": (10 - a) * 1000.0,
+                         "status": "Booked" if (t + a) % 3 == 0 else "Available"}
+                        for a in range(authors_per_table)
+                    ],
+                }
+                for t in range(tables // sheets)
+            ],
+        }
+        for s in range(sheets)
+    ]
+
+
+@pytest.fixture(scope="session")
+def app():
+    from app import app
+    from schema_migrations import migrate_schema
+    with app.app_context():
+        migrate_schema()
+    return app
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import event
+
+from tests.conftest import synthetic_sheets
+
+# /authors renders from the read model: at most the version check and the
+# payload rows, whatever the number of tables
+MAX_AUTHORS_QUERIES = 2
+
+
+def count_queries(app, path):
+    from extensions import db
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            response = app.test_client().get(path)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+    assert response.status_code == 200
+    return statements, response.get_data(as_text=True)
+
+
+@pytest.mark.parametrize("tables", [10, 100, 500])
+def test_authors_query_count_is_constant(app, tables):
+    from author_migrate_from_excel import migrate_excel_to_db
+    migrate_excel_to_db(synthetic_sheets(tables))
+
+    cold, html = count_queries(app, "/authors")
+    warm, _ = count_queries(app, "/authors")
+    assert html.count("Synthetic Article") == tables
+    assert len(cold) <= MAX_AUTHORS_QUERIES, cold
+    assert len(warm) <= MAX_AUTHORS_QUERIES, warm
@@ -0,0 +1,41 @@
+import os
+import time
+
+from blog_store import build_index, directory_key
+from catalog import CatalogManager
+
+POST = """---
+title: {title}
+date: Dec 14, 2024
+---
+<p>Body</p>
+"""
+
+
+def write_post(directory, slug, title, mtime_ns=None):
+    path = os.path.join(directory, f"{slug}.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(POST.format(title=title))
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+    return path
+
+
+def test_editing_a_post_reloads_the_index(tmp_path):
+    directory = str(tmp_path)
+    write_post(directory, "abstract", "Old title", mtime_ns=1_000_000_000)
+    dir_mtime = os.stat(directory).st_mtime_ns
+    blog = CatalogManager("blog", directory, build_index, check_interval=0, stat_key=directory_key)
+    assert blog.current().get("abstract")["title"] == "Old title"
+    version = blog.version
+
+    # same size, same directory entry: only the file's own mtime moves
+    write_post(directory, "abstract", "New title")
+    assert os.stat(directory).st_mtime_ns == dir_mtime
+
+    blog.current()
+    deadline = time.monotonic() + 5
+    while blog.version == version and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert blog.version == version + 1
+    assert blog.current().get("abstract")["title"] == "New title"
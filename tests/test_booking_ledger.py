@@ -0,0 +1,52 @@
+import time
+
+from booking_ledger import BookingLedger, Replicator
+from sheets_client import LocalWorksheet
+
+
+class StubSheets:
+    def __init__(self):
+        self.sheet = LocalWorksheet()
+
+    def worksheet(self):
+        return self.sheet
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_start_resumes_rows_left_by_a_dead_worker(tmp_path):
+    ledger = BookingLedger(str(tmp_path / "bookings.db"))
+    ledger.add("Pending", "pending@example.com", "Editing")
+    ledger.add("Stuck", "stuck@example.com", "Editing")
+    # the previous worker claimed the second row and died mid-push
+    ledger.connect().execute(
+        "UPDATE booking SET status = 'sending', claimed_at = ? WHERE email = 'stuck@example.com'",
+        (time.time() - ledger.claim_timeout - 1,),
+    )
+
+    sheets = StubSheets()
+    Replicator(ledger, sheets).start()  # no new booking, no wake()
+
+    assert wait_for(lambda: ledger.counts() == {"synced": 2})
+    assert sorted(r["email"] for r in sheets.sheet.get_all_records()) == ["pending@example.com", "stuck@example.com"]
+
+
+def test_mark_failed_backs_off(tmp_path):
+    ledger = BookingLedger(str(tmp_path / "bookings.db"))
+    booking_id = ledger.add("A", "a@example.com", "Editing")
+    [(claimed, _)] = ledger.claim()
+    ledger.mark_failed([claimed], "ConnectionError: down")
+
+    assert ledger.claim() == []
+    assert ledger.counts() == {"pending": 1}
+    due = ledger.next_due_in()
+    assert 0.8 * ledger.backoff_base <= due <= 1.2 * ledger.backoff_base
+    (attempts,) = ledger.connect().execute("SELECT attempts FROM booking WHERE id = ?", (booking_id,)).fetchone()
+    assert attempts == 1
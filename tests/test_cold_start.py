@@ -0,0 +1,26 @@
+import os
+import shutil
+import statistics
+import sys
+
+from tests.conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from bench_cold_start import run_once  # noqa: E402
+
+# import app + first GET /, median of a few fresh interpreters
+COLD_START_BUDGET_MS = 1000
+RUNS = 3
+
+
+def test_cold_start_budget(tmp_path):
+    db_path = tmp_path / "users.db"
+    shutil.copy(os.path.join(ROOT, "instance", "users.db"), db_path)
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}", SHEETS_BACKEND="local")
+
+    run_once(env)  # warm the OS file cache and __pycache__
+    results = [run_once(env)[0] for _ in range(RUNS)]
+
+    assert not {m for r in results for m in r["loaded"]}, "imported before the first request needed them"
+    total = statistics.median(r["total_ms"] for r in results)
+    assert total <= COLD_START_BUDGET_MS, f"cold start {total:.0f}ms"
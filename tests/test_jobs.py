@@ -0,0 +1,47 @@
+import threading
+import time
+
+import jobs
+from jobs import JobRunner, JobStore
+
+
+def test_store_creates_its_directory(tmp_path):
+    store = JobStore(str(tmp_path / "missing" / "jobs.db"))
+    job, created = store.create("migration")
+    assert created and job["status"] == "queued"
+
+
+def test_heartbeat_keeps_a_long_job_active(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "HEARTBEAT_INTERVAL", 0.05)
+    monkeypatch.setattr(jobs, "STALE_AFTER", 0.2)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    runner = JobRunner(store)
+    release = threading.Event()
+
+    def slow(progress):
+        release.wait(5)
+        return "ok"
+
+    job, created = runner.submit("migration", slow)
+    assert created
+    time.sleep(0.5)
+    # still heartbeating: a second submit gets the running job back
+    again, created = runner.submit("migration", slow)
+    assert not created and again["id"] == job["id"]
+
+    release.set()
+    runner.executor.shutdown(wait=True)
+    assert store.get(job["id"])["status"] == "done"
+
+
+def test_dead_worker_stops_blocking(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "STALE_AFTER", 0.1)
+    store = JobStore(str(tmp_path / "jobs.db"))
+    # a job row nobody runs or heartbeats, as a killed worker leaves it
+    job, _ = store.create("migration")
+    store.start(job["id"])
+    time.sleep(0.2)
+
+    second, created = store.create("migration")
+    assert created and second["id"] != job["id"]
+    assert store.get(job["id"])["status"] == "failed"
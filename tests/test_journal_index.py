@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from journal_index import JournalIndex, tokenize
+
+SUBJECTS = ["science", "medicine", "engineering", "management"]
+
+
+def catalog(n, seed=1):
+    rng = random.Random(seed)
+    sheets = {}
+    for i in range(n):
+        price = rng.choice([None, "40k", "60k", "90k", "1.2L"]) if i % 500 else "7k"
+        sheets.setdefault(f"Sheet {i % 3}", []).append({
+            "link": f"https://journals.example.org/j{i}",
+            "details": [f"Journal of {SUBJECTS[i % 4]} {i}", f"Q{i % 4 + 1} JOURNAL"],
+            "price": price or "",
+        })
+    return sheets
+
+
+def brute_force(index, sheet, query, min_price, max_price):
+    tokens = tokenize(query or "")
+    out = []
+    for e in index.entries:
+        if sheet is not None and e["sheet"] != sheet:
+            continue
+        text = tokenize(" ".join([e["link"], *e["details"]]))
+        if not all(any(t.startswith(q) for t in text) for q in tokens):
+            continue
+        value = e["price_value"]
+        if (min_price is not None or max_price is not None) and value is None:
+            continue
+        if min_price is not None and value < min_price or max_price is not None and value > max_price:
+            continue
+        out.append(e["id"])
+    return out
+
+
+def all_pages(index, **kwargs):
+    ids, cursor = [], None
+    while True:
+        items, cursor = index.page(cursor=cursor, limit=7, **kwargs)
+        ids += [e["id"] for e in items]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("sheet", [None, "Sheet 1"])
+@pytest.mark.parametrize("query", [None, "science", "q2 med"])
+@pytest.mark.parametrize("min_price, max_price", [(None, None), (None, 10_000), (50_000, 100_000), (1, 2)])
+def test_pages_match_a_full_scan(sheet, query, min_price, max_price):
+    index = JournalIndex(catalog(3000))
+    expected = brute_force(index, sheet, query, min_price, max_price)
+    assert all_pages(index, sheet=sheet, query=query, min_price=min_price, max_price=max_price) == expected
+
+
+class CountingList(list):
+    reads = 0
+
+    def __getitem__(self, i):
+        CountingList.reads += 1
+        return super().__getitem__(i)
+
+
+def test_narrow_price_range_does_not_walk_the_catalog():
+    index = JournalIndex(catalog(50_000))
+    index.entries = CountingList(index.entries)
+
+    items, _ = index.page(max_price=10_000, limit=50)
+    assert len(items) == 50 and all(e["price_value"] == 7000 for e in items)
+    assert CountingList.reads <= 51
+
+    CountingList.reads = 0
+    assert index.page(min_price=1, max_price=2) == ([], None)
+    assert CountingList.reads == 0
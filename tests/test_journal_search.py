@@ -0,0 +1,55 @@
+import os
+import random
+import statistics
+import sys
+import time
+
+import pytest
+
+from journal_search import JournalSearchIndex
+from tests.conftest import ROOT
+
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+from workbooks import journal_block  # noqa: E402
+
+JOURNALS = 100_000
+# median of a few searches; ranking every hit took ~250ms for "journal"
+SEARCH_BUDGET_MS = 10
+RUNS = 7
+QUERIES = ["journal", "international journal", "press", "q2", "medicine", "synthetic research 4242", "1234-*"]
+
+
+@pytest.fixture(scope="module")
+def index(tmp_path_factory):
+    tmp = tmp_path_factory.mktemp("journal_search")
+    rng = random.Random(1)
+    journals = {}
+    for i in range(JOURNALS):
+        lines = journal_block(i, rng)
+        journals.setdefault(f"Sheet {i % 7}", []).append(
+            {"link": lines[0], "details": lines[1:-1], "price": lines[-1]}
+        )
+    workbook = tmp / "journals.xlsx"
+    workbook.write_bytes(b"x")
+    index = JournalSearchIndex(str(tmp / "search.db"))
+    index.build(journals, str(workbook))
+    return index
+
+
+@pytest.mark.parametrize("query", QUERIES)
+def test_search_budget(index, query):
+    index.search(query)
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        results = index.search(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    assert results
+    median = statistics.median(timings)
+    assert median <= SEARCH_BUDGET_MS, f"{query!r} took {median:.1f}ms"
+
+
+def test_rare_word_outranks_common_ones(index):
+    # "4242" only decides the order; the common words only filter
+    results = index.search("synthetic research 4242")
+    assert results[0]["name"].striptags() == "International Journal of Synthetic Research 4242"
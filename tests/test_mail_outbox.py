@@ -0,0 +1,41 @@
+from flask import Flask
+
+from mail_outbox import MAX_ATTEMPTS, MailOutbox, MailSender
+
+
+def failed_attempts(outbox, msg_id, times):
+    for _ in range(times):
+        outbox.connect().execute("UPDATE outbox SET next_attempt_at = 0 WHERE id = ?", (msg_id,))
+        [(claimed, _)] = outbox.claim()
+        outbox.mark_failed([claimed], "SMTPDataError: rejected")
+
+
+def test_message_is_parked_after_max_attempts(tmp_path):
+    outbox = MailOutbox(str(tmp_path / "outbox.db"))
+    msg_id = outbox.add("Subject", ["info@example.com"], "Body", sender="site@example.com")
+
+    failed_attempts(outbox, msg_id, MAX_ATTEMPTS - 1)
+    assert outbox.counts() == {"pending": 1}
+    failed_attempts(outbox, msg_id, 1)
+    assert outbox.counts() == {"failed": 1}
+    assert outbox.next_due_in() is None
+
+
+class DownMail:
+    """Flask-Mail stand-in for an SMTP server that refuses connections."""
+
+    def connect(self):
+        raise ConnectionRefusedError("[Errno 111] Connection refused")
+
+
+def test_connection_failures_do_not_count(tmp_path):
+    outbox = MailOutbox(str(tmp_path / "outbox.db"))
+    msg_id = outbox.add("Subject", ["info@example.com"], "Body", sender="site@example.com")
+    sender = MailSender(Flask(__name__), DownMail(), outbox)
+
+    for _ in range(MAX_ATTEMPTS + 1):
+        outbox.connect().execute("UPDATE outbox SET next_attempt_at = 0 WHERE id = ?", (msg_id,))
+        assert sender.drain() == 0
+
+    assert outbox.counts() == {"pending": 1}
+    assert outbox.connect().execute("SELECT attempts FROM outbox WHERE id = ?", (msg_id,)).fetchone() == (0,)
@@ -0,0 +1,46 @@
+import pytest
+
+from prices import PriceIndex, parse_price, price_value
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("3.5k", 3500),
+    ("1.0L", 100_000),
+    ("2 lakh", 200_000),
+    ("1 lakh 20k", 120_000),
+    ("₹25,000", 25_000),
+    ("INR. 40k", 40_000),
+    ("Rs.500", 500),
+    ("Price: 30k", 30_000),
+    ("Price: 5000", 5000),
+    ("-             8K", 8000),
+    ("20% off 10k", 10_000),
+    # digits inside labels are not prices
+    ("Q1 15k", 15_000),
+    ("Author 1 7k", 7000),
+    ("v2.5 10k", 10_000),
+])
+def test_price_value(text, expected):
+    assert price_value(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", None, "N/A", "Q2 JOURNAL", "Scopus Q1"])
+def test_no_price(text):
+    assert price_value(text) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("10-15k", (10_000, 15_000)),
+    ("10k to 15k", (10_000, 15_000)),
+    ("₹10,000 – ₹15,000", (10_000, 15_000)),
+    ("Q1 10k - 12k", (10_000, 12_000)),
+])
+def test_ranges(text, expected):
+    assert parse_price(text) == expected
+
+
+def test_price_index_bounds():
+    index = PriceIndex([(5000, "a"), (None, "b"), (20_000, "c"), (10_000, "d")])
+    assert index.keys == ["a", "d", "c"]
+    assert index.between(max_price=10_000) == ["a", "d"]
+    assert index.between(min_price=6000) == ["d", "c"]
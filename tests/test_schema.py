@@ -0,0 +1,89 @@
+import json
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+from sqlalchemy import create_engine
+
+from tests.conftest import ROOT, synthetic_sheets
+
+INDEXES = ("ix_author_table_sheet_id", "ix_author_position_table_id_status_code")
+
+
+def query_plan(db, query):
+    compiled = query.statement.compile(db.engine)
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    rows = db.session.connection().exec_driver_sql("EXPLAIN QUERY PLAN " + str(compiled), params)
+    return [row[3] for row in rows]
+
+
+@pytest.mark.parametrize("status", [None, "available", "booked"])
+def test_positions_by_sheet_and_status_use_the_indexes(app, status):
+    from author_migrate_from_excel import migrate_excel_to_db
+    from extensions import db
+    from models import positions_query
+
+    migrate_excel_to_db(synthetic_sheets(200))
+    with app.app_context():
+        plan = query_plan(db, positions_query(1, status))
+
+    assert not [line for line in plan if line.startswith("SCAN")], plan
+    assert any(INDEXES[0] in line for line in plan), plan
+    if status is not None:
+        assert any(INDEXES[1] in line for line in plan), plan
+
+
+def test_migrations_upgrade_a_database_from_before_them(tmp_path):
+    from schema_migrations import MIGRATIONS, migrate_schema
+
+    path = tmp_path / "old.db"
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE author_sheet (id INTEGER NOT NULL, name VARCHAR(100), info TEXT, PRIMARY KEY (id));
+        CREATE TABLE author_table (id INTEGER NOT NULL, sheet_id INTEGER NOT NULL, title VARCHAR(255),
+            PRIMARY KEY (id), FOREIGN KEY(sheet_id) REFERENCES author_sheet (id));
+        CREATE TABLE author_position (id INTEGER NOT NULL, table_id INTEGER NOT NULL, level VARCHAR(100),
+            amount VARCHAR(100), status VARCHAR(200), PRIMARY KEY (id),
+            FOREIGN KEY(table_id) REFERENCES author_table (id));
+        INSERT INTO author_sheet VALUES (1, 'Sheet 1', '');
+        INSERT INTO author_table VALUES (1, 1, 'Article');
+        INSERT INTO author_position VALUES (1, 1, 'Author 1', '- 9K', 'BOOKED '), (2, 1, 'Author 2', '8k', 'Available');
+    """)
+    conn.commit()
+
+    engine = create_engine(f"sqlite:///{path}")
+    assert migrate_schema(engine) == sorted(version for version, _, _ in MIGRATIONS)
+    assert migrate_schema(engine) == []
+
+    rows = conn.execute("SELECT amount_value, status_code FROM author_position ORDER BY id").fetchall()
+    assert rows == [(9000.0, "booked"), (8000.0, "available")]
+    indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert set(INDEXES) <= indexes
+
+    views = conn.execute("SELECT version, position, name, payload FROM author_sheet_view").fetchall()
+    assert [row[:3] for row in views] == [(1, 0, "Sheet 1")]
+    assert json.loads(views[0][3]) == {"name": "Sheet 1", "info": "", "tables": [{"title": "Article", "positions": [
+        {"level": "Author 1", "amount": "- 9K", "amount_value": 9000.0, "status": "BOOKED "},
+        {"level": "Author 2", "amount": "8k", "amount_value": 8000.0, "status": "Available"},
+    ]}]}
+
+
+def test_shipped_database_has_the_read_model():
+    conn = sqlite3.connect(os.path.join(ROOT, "instance", "users.db"))
+    (sheets,) = conn.execute("SELECT COUNT(*) FROM author_sheet").fetchone()
+    (views,) = conn.execute(
+        "SELECT COUNT(*) FROM author_sheet_view WHERE version = (SELECT MAX(version) FROM author_sheet_view)"
+    ).fetchone()
+    assert views == sheets > 0
+
+
+def test_importing_the_app_runs_no_ddl(tmp_path):
+    path = tmp_path / "untouched.db"
+    code = "import app; app.app.test_client().get('/')"
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{path}")
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+    tables = sqlite3.connect(path).execute("SELECT name FROM sqlite_master").fetchall() if path.exists() else []
+    assert tables == []